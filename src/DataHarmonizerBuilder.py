@@ -14,11 +14,66 @@ import DataHarmonizerDownloader.DataHarmonizerDownloader as DataHarmonizerDownlo
 import errno
 import os
 import ontoHandler.ontoHandler as ontoHandler
-import sys
+import ontoHandler.ontoDownloader as ontoDownloader
+import ontoHandler.schemeVariants as schemeVariants
+import ontoHandler.schemeWatcher as schemeWatcher
+import buildManifest.buildManifest as buildManifest
+from profiler.profiler import getProfiler, addProfilingArguments, startProfiling, finishProfiling
 import shutil
 import subprocess
 
-def main(nameOfRepository):
+def runCommand(command, incremental: bool) -> bool:
+    '''
+    Runs a build command, in the incremental mode a failing command stops the
+    build so its stage is not recorded as finished.
+    '''
+    result = subprocess.run(command)
+    if incremental and result.returncode != 0:
+        raise subprocess.CalledProcessError(result.returncode, command)
+    return result.returncode == 0
+
+def getOntologyFiles(configYAML: dict, pathToOntologies: str) -> list:
+    return [pathToOntologies + os.sep + ontology["URL"].split("/")[-1] for ontology in configYAML["config"]["ontologies"].values()]
+
+def insertControlledVocabularies(nameOfRepository, streaming, useCache, resetCache, jobs, diff, variants, ontologyConfig=None):
+    if variants:
+        ontoHandler.buildVariants(nameOfRepository, variants, streaming=streaming, useCache=useCache, resetCache=resetCache, jobs=jobs, configYAML=ontologyConfig)
+    else:
+        ontoHandler.main(nameOfRepository, streaming=streaming, useCache=useCache, resetCache=resetCache, jobs=jobs, diff=diff, configYAML=ontologyConfig)
+
+def copySchemeToTemplate(pathToDataHarmonizer: str, pathToScheme: str) -> str:
+    '''
+    Copies the final scheme into its template of the DataHarmonizer, every
+    scheme gets its own template named like the scheme. Changes into the
+    folder of the template and returns its path.
+    '''
+    nameOfSchemesFile = os.path.basename(pathToScheme)
+    pathToTemplate = pathToDataHarmonizer + os.sep + "web" + os.sep + "templates" + os.sep + os.path.splitext(nameOfSchemesFile)[0]
+    if os.path.exists(pathToTemplate) == False:
+        os.mkdir(pathToTemplate)
+    pathToTemplateFile = pathToTemplate + os.sep + nameOfSchemesFile
+    shutil.copy(pathToScheme,pathToTemplateFile)
+    os.chdir(pathToTemplate)
+    with open("export.js", "w") as outfile:
+        outfile.write("// A dictionary of possible export formats\nexport default {};\n")
+    return pathToTemplate
+
+def generateTemplate(nameOfSchemesFile: str, incremental: bool) -> bool:
+    # run from the folder of the template
+    runPath = ".." + os.sep + ".." + os.sep + ".." + os.sep + "script" + os.sep + "linkml.py"
+    flags = ["-i", nameOfSchemesFile]
+    command = ["python3", runPath] + flags
+    return runCommand(command, incremental)
+
+def main(nameOfRepository, streaming=False, useCache=True, resetCache=False, jobs=1, incremental=False, diff=False, variants=None):
+    '''
+    Builds the DZIF DataHarmonizer. In the incremental mode the fingerprints of
+    the inputs of every stage are recorded in the build manifest and only the
+    stages with changed inputs are run again. The downloads, the ontologies and
+    the node_modules of the DataHarmonizer are kept between the builds. With
+    variants (scheme templates or config profiles) all of them are built from
+    one extraction of the ontologies and each gets its own template.
+    '''
     print("Building of the DZIF DataHarmonizer has started.\n\n")
     getCurrentWorkingDirectory = os.getcwd()
     if not nameOfRepository in getCurrentWorkingDirectory:
@@ -28,44 +83,156 @@ def main(nameOfRepository):
         pathToWorkingDirectory = pathToParent + nameOfRepository + os.sep
         os.chdir(pathToWorkingDirectory)
     print("Started to download and unpack the DataHarmonizer from github.\n")
-    configYAML = DataHarmonizerDownloader.main(nameOfRepository)
+    profiler = getProfiler()
+    with profiler.stage("DataHarmonizer", "build"):
+        configYAML = DataHarmonizerDownloader.main(nameOfRepository, extractArchive=not incremental)
+    environment = configYAML["config"]["environment"]
+    pathToDataHarmonizer = pathToWorkingDirectory + environment["path_for_DataHarmonizer"]
+    pathToManifest = pathToWorkingDirectory + environment["name_of_build_manifest"]
+    manifest = buildManifest.loadManifest(pathToManifest) if incremental else None
+    pathToConfig = pathToWorkingDirectory + "config" + os.sep + "config.yaml"
+    if variants:
+        variantConfigs = schemeVariants.loadVariants(configYAML, variants, pathToWorkingDirectory)
+        namesOfSchemesFiles = [variantConfig["config"]["environment"]["name_of_schemes_file"] for variantConfig in variantConfigs]
+        # the config profiles are inputs of the controlled vocabularies as well
+        variantFiles = [variant if os.path.isabs(variant) else pathToWorkingDirectory + variant for variant in variants if variant not in namesOfSchemesFiles]
+    else:
+        namesOfSchemesFiles = [environment["name_of_schemes_file"]]
+        variantFiles = []
+    pathToSchemeTemplates = [pathToWorkingDirectory + environment["path_for_schemes"] + os.sep + nameOfSchemesFile for nameOfSchemesFile in namesOfSchemesFiles]
+    pathToSchemes = [pathToWorkingDirectory + environment["path_for_final_schemes"] + os.sep + nameOfSchemesFile for nameOfSchemesFile in namesOfSchemesFiles]
+    pathToBuiltDataHarmonizerOld = pathToDataHarmonizer + os.sep + "web" + os.sep + "dist"
+    pathToBuiltDataHarmonizerNew = pathToWorkingDirectory + "DZIFDataHarmonizer"
+
+    if incremental:
+        pathToArchive = DataHarmonizerDownloader.getPathToArchive(pathToDataHarmonizer, configYAML["config"]["DataHarmonizerBuild"]["url_of_DataHarmonizer"])
+        archiveHash = buildManifest.hashFile(pathToArchive)
+        fingerprint = buildManifest.getFingerprint({"archive": archiveHash})
+        if buildManifest.stageIsUpToDate(manifest, "extract DataHarmonizer", fingerprint, [pathToDataHarmonizer + os.sep + "package.json"]):
+            print("DataHarmonizer archive is unchanged, skipping the extraction.\n")
+        else:
+            DataHarmonizerDownloader.extractDataHarmonizer(pathToArchive, pathToDataHarmonizer, configYAML["config"]["DataHarmonizerBuild"].get("members"), environment["max_parallel_extractions"])
+            buildManifest.recordStage(manifest, "extract DataHarmonizer", fingerprint, pathToManifest)
     print("Finished.\n\n")
-    ontoHandler.main(nameOfRepository)
-    shutil.rmtree(pathToWorkingDirectory + os.sep + configYAML["config"]["environment"]["path_for_ontologies"])
+
+    with profiler.stage("controlled vocabularies", "build"):
+        if incremental:
+            ontologyConfig = ontoDownloader.main(nameOfRepository)
+            ontologyFiles = getOntologyFiles(configYAML, pathToWorkingDirectory + environment["path_for_ontologies"])
+            fingerprint = buildManifest.getFingerprint({
+                "config": buildManifest.hashFile(pathToConfig),
+                "scheme template": buildManifest.hashFile(pathToSchemeTemplates[0]) if not variants else {os.path.basename(filePath): buildManifest.hashFile(filePath) for filePath in pathToSchemeTemplates + variantFiles},
+                "ontologies": {os.path.basename(filePath): buildManifest.hashFile(filePath) for filePath in ontologyFiles},
+                "ontoHandler": {fileName: buildManifest.hashFile(pathToWorkingDirectory + "src" + os.sep + "ontoHandler" + os.sep + fileName) for fileName in sorted(os.listdir(pathToWorkingDirectory + "src" + os.sep + "ontoHandler")) if fileName.endswith(".py")}
+            })
+            if buildManifest.stageIsUpToDate(manifest, "controlled vocabularies", fingerprint, pathToSchemes):
+                print("Config, scheme template and ontologies are unchanged, skipping the insertion of the controlled vocabularies.\n\n")
+            else:
+                # the ontologies were just downloaded and revalidated, they are not checked again
+                insertControlledVocabularies(nameOfRepository, streaming, useCache, resetCache, jobs, diff, variants, ontologyConfig)
+                buildManifest.recordStage(manifest, "controlled vocabularies", fingerprint, pathToManifest)
+        else:
+            insertControlledVocabularies(nameOfRepository, streaming, useCache, resetCache, jobs, diff, variants)
+            shutil.rmtree(pathToWorkingDirectory + environment["path_for_ontologies"])
+
     print("Started to build DZIF DataHarmonizer.\n")
-    pathToScheme = pathToWorkingDirectory + os.sep + configYAML["config"]["environment"]["path_for_final_schemes"] + os.sep + "metaDZIF.yaml"
-    pathToTemplate = pathToWorkingDirectory + os.sep + configYAML["config"]["environment"]["path_for_DataHarmonizer"] + os.sep + "web" + os.sep + "templates" + os.sep + "metaDZIF"
-    if os.path.exists(pathToTemplate) == False:
-        os.mkdir(pathToTemplate)
-    pathToTemplateFile = pathToTemplate + os.sep + "metaDZIF.yaml"
-    shutil.copy(pathToScheme,pathToTemplateFile)
-    os.chdir(pathToTemplate)
-    with open("export.js", "w") as outfile:
-        outfile.write("// A dictionary of possible export formats\nexport default {};\n")
-    runPath = ".." + os.sep + ".." + os.sep + ".." + os.sep + "script" + os.sep + "linkml.py"
-    flags = ["-i", "metaDZIF.yaml"]
-    command = ["python3", runPath] + flags
-    subprocess.run(command)
-    command = ["corepack","enable"]
-    subprocess.run(command)
-    command = "yarn"
-    subprocess.run(command)
-    command = ["yarn","build:web"]
-    subprocess.run(command)
-    pathToBuiltDataHarmonizerOld = pathToWorkingDirectory + os.sep + configYAML["config"]["environment"]["path_for_DataHarmonizer"] + os.sep + "web" + os.sep + "dist"
-    pathToBuiltDataHarmonizerNew = pathToWorkingDirectory + os.sep + "DZIFDataHarmonizer"
-    if os.path.exists(pathToBuiltDataHarmonizerNew):
-        shutil.rmtree(pathToBuiltDataHarmonizerNew)
-    shutil.move(pathToBuiltDataHarmonizerOld,pathToBuiltDataHarmonizerNew)
-    pathToDataHarmonizer = pathToWorkingDirectory + os.sep + configYAML["config"]["environment"]["path_for_DataHarmonizer"]
-    shutil.rmtree(pathToDataHarmonizer)
+    schemeFingerprints = {}
+    for nameOfSchemesFile, pathToScheme in zip(namesOfSchemesFiles, pathToSchemes):
+        nameOfTemplate = os.path.splitext(nameOfSchemesFile)[0]
+        pathToTemplate = copySchemeToTemplate(pathToDataHarmonizer, pathToScheme)
+
+        nameOfStage = "template" if nameOfSchemesFile == environment["name_of_schemes_file"] else "template " + nameOfTemplate
+        schemeFingerprint = buildManifest.getFingerprint({"scheme": buildManifest.hashFile(pathToScheme), "DataHarmonizer": manifest["stages"].get("extract DataHarmonizer") if incremental else None})
+        schemeFingerprints[nameOfSchemesFile] = schemeFingerprint
+        with profiler.stage(nameOfStage, "build"):
+            if incremental and buildManifest.stageIsUpToDate(manifest, nameOfStage, schemeFingerprint, [pathToTemplate + os.sep + "schema.json"]):
+                print(f"Scheme {nameOfSchemesFile} is unchanged, skipping the generation of its template.\n")
+            else:
+                generateTemplate(nameOfSchemesFile, incremental)
+                if incremental:
+                    buildManifest.recordStage(manifest, nameOfStage, schemeFingerprint, pathToManifest)
+
+    dependencyFingerprint = buildManifest.getFingerprint({fileName: buildManifest.hashFile(pathToDataHarmonizer + os.sep + fileName) for fileName in ["package.json", "yarn.lock"]})
+    with profiler.stage("dependencies", "build"):
+        if incremental and buildManifest.stageIsUpToDate(manifest, "dependencies", dependencyFingerprint, [pathToDataHarmonizer + os.sep + "node_modules"]):
+            print("Dependencies of the DataHarmonizer are unchanged, skipping their installation.\n")
+        else:
+            command = ["corepack","enable"]
+            runCommand(command, incremental)
+            command = "yarn"
+            runCommand(command, incremental)
+            if incremental:
+                buildManifest.recordStage(manifest, "dependencies", dependencyFingerprint, pathToManifest)
+
+    webFingerprint = buildManifest.getFingerprint({"template": schemeFingerprint if not variants else schemeFingerprints, "dependencies": dependencyFingerprint})
+    with profiler.stage("web build", "build"):
+        if incremental and buildManifest.stageIsUpToDate(manifest, "web build", webFingerprint, [pathToBuiltDataHarmonizerNew]):
+            print("Template and dependencies are unchanged, skipping the build of the web application.\n")
+        else:
+            command = ["yarn","build:web"]
+            runCommand(command, incremental)
+            if os.path.exists(pathToBuiltDataHarmonizerNew):
+                shutil.rmtree(pathToBuiltDataHarmonizerNew)
+            if incremental:
+                shutil.copytree(pathToBuiltDataHarmonizerOld,pathToBuiltDataHarmonizerNew)
+                buildManifest.recordStage(manifest, "web build", webFingerprint, pathToManifest)
+            else:
+                shutil.move(pathToBuiltDataHarmonizerOld,pathToBuiltDataHarmonizerNew)
+    if not incremental:
+        shutil.rmtree(pathToDataHarmonizer)
+    os.chdir(pathToWorkingDirectory)
     print("\nFinished to build DZIF DataHarmonizer.\n\n  It is located in the 'DZIFDataHarmonizer' folder\n\n  Goodbye!\n")
 
+def watch(nameOfRepository, streaming=False, useCache=True, resetCache=False, jobs=1, interval=0.1):
+    '''
+    Builds the DZIF DataHarmonizer incrementally once and then keeps the
+    parsed ontologies in memory. Whenever the scheme template, the config or
+    an ontology changes, the final scheme is rendered again and the template
+    of the DataHarmonizer is generated from it. The web application is not
+    built again, run the incremental build for that.
+    '''
+    main(nameOfRepository, streaming=streaming, useCache=useCache, resetCache=resetCache, jobs=jobs, incremental=True)
+    pathToWorkingDirectory = os.getcwd() + os.sep
+    configYAML = ontoDownloader.loadConfigYAML(pathToWorkingDirectory + "config" + os.sep + "config.yaml")
+    pathToDataHarmonizer = pathToWorkingDirectory + configYAML["config"]["environment"]["path_for_DataHarmonizer"]
+
+    def updateTemplate(pathToScheme: str):
+        try:
+            copySchemeToTemplate(pathToDataHarmonizer, pathToScheme)
+            if generateTemplate(os.path.basename(pathToScheme), False):
+                print(f"Generated the template of {os.path.basename(pathToScheme)}.\n")
+            else:
+                print(f"Generating the template of {os.path.basename(pathToScheme)} failed, waiting for the next change.\n")
+        finally:
+            os.chdir(pathToWorkingDirectory)
+
+    print("Watching the scheme template, the config and the ontologies.\n")
+    schemeWatcher.watch(nameOfRepository, streaming=streaming, useCache=useCache, interval=interval, onRender=[updateTemplate])
+
 if __name__ == "__main__":
     parser = arg.ArgumentParser(
         prog='DZIF microbial OMICs Database DataHarmonizer Downloader',
         description='This piece of software downloads the DataHarmonizer from the internet to be further used to build it with the schemes for the DZIF microbial OMICs Database.',
         epilog='Written by Jannik Seidel (jannik.seidel@qbic.uni-tuebingen.de) and released under MIT License.')
     parser.add_argument("--repo", required=True, help="name of the top-level folder of this software (in which the README.md is located)",type=str)
+    parser.add_argument("--streaming", action="store_true", help="read the owl files incrementally instead of parsing them with rdflib")
+    parser.add_argument("--no-cache", action="store_true", help="do not use the cache of already parsed ontologies")
+    parser.add_argument("--clear-cache", action="store_true", help="empty the cache of already parsed ontologies before the build")
+    parser.add_argument("--jobs", default=1, help="number of processes used to handle the ontologies in parallel", type=int)
+    parser.add_argument("--incremental", action="store_true", help="only run the build stages whose inputs changed since the last incremental build and keep the downloads and node_modules")
+    parser.add_argument("--diff", action="store_true", help="only extract the ontologies which changed since the last build and patch their changes into the existing final scheme")
+    parser.add_argument("--variants", nargs="+", metavar="VARIANT", help="build these variants of the scheme (scheme templates in the schemes folder or config profiles) from one extraction of the ontologies, each into its own template")
+    parser.add_argument("--watch", action="store_true", help="build incrementally once, then keep the parsed ontologies in memory and generate the template again whenever the scheme template, the config or an ontology file changes")
+    parser.add_argument("--interval", default=0.1, help="seconds between the checks for changes in the watch mode (without watchdog)", type=float)
+    addProfilingArguments(parser)
     args = parser.parse_args()
-    sys.exit(main(nameOfRepository=args.repo))
\ No newline at end of file
+    if args.watch and (args.variants or args.diff):
+        parser.error("--watch can not be combined with --variants or --diff")
+    if args.variants and args.diff:
+        parser.error("--variants can not be combined with --diff")
+    startProfiling(args, parser)
+    if args.watch:
+        watch(nameOfRepository=args.repo, streaming=args.streaming, useCache=not args.no_cache, resetCache=args.clear_cache, jobs=args.jobs, interval=args.interval)
+    else:
+        main(nameOfRepository=args.repo, streaming=args.streaming, useCache=not args.no_cache, resetCache=args.clear_cache, jobs=args.jobs, incremental=args.incremental, diff=args.diff, variants=args.variants)
+    finishProfiling(args, "DataHarmonizerBuilder")
\ No newline at end of file
@@ -12,23 +12,22 @@
 import yaml
 import sys
 import os
-import requests
 import argparse as arg
 import errno
-import zipfile
-import re
+# the shared download engine is located next to this package in src/
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fileHandler.downloadEngine import downloadFile, evictDownloadCache
+import fileHandler.archiveExtractor as archiveExtractor
+from profiler.profiler import getProfiler, addProfilingArguments, startProfiling, finishProfiling
 
-def downloadDataHarmonizer(pathToDataHarmonizerFolder: str, dataHarmonizerURL: str) -> str:
-    fileName = dataHarmonizerURL.split("/")[-1]
-    filePath = pathToDataHarmonizerFolder + os.sep + fileName
-    if not os.path.isfile(filePath):
-        with requests.get(dataHarmonizerURL,stream=True) as streamOfOntology:
-            streamOfOntology.raise_for_status()
-            with open(filePath, "wb") as file:
-                for chunk in streamOfOntology.iter_content():
-                    if chunk:
-                        file.write(chunk)
+def getPathToArchive(pathToDataHarmonizerFolder: str, dataHarmonizerURL: str) -> str:
+    return pathToDataHarmonizerFolder + os.sep + dataHarmonizerURL.split("/")[-1]
 
+def downloadDataHarmonizer(pathToDataHarmonizerFolder: str, dataHarmonizerURL: str, checksum: str = None, size: int = None, pathToCache: str = None, cacheSizeLimit: int = None) -> str:
+    filePath = getPathToArchive(pathToDataHarmonizerFolder, dataHarmonizerURL)
+    downloadFile(dataHarmonizerURL, filePath, checksum, size, pathToCache)
+    if pathToCache is not None and cacheSizeLimit is not None:
+        evictDownloadCache(pathToCache, cacheSizeLimit, keep=[filePath])
     return filePath
 
 def loadConfigYAML(pathToYAML: str) -> dict:
@@ -36,7 +35,22 @@ def loadConfigYAML(pathToYAML: str) -> dict:
         yamlDict = yaml.safe_load(file)
     return yamlDict
 
-def main(nameOfRepository: str) -> dict:
+def extractDataHarmonizer(filePath: str, pathToDataHarmonizerFolder: str, patterns: list = None, maxWorkers: int = 4):
+    '''
+    Extracts the DataHarmonizer archive into pathToDataHarmonizerFolder without
+    the top-level folder of the archive. Only the files matching the glob
+    patterns are extracted (all if none are given), files which are already
+    extracted are kept.
+    '''
+    with getProfiler().stage("extract DataHarmonizer", "extraction"):
+        counters = archiveExtractor.extractArchive(filePath, pathToDataHarmonizerFolder, patterns, stripTopLevel=True, maxWorkers=maxWorkers)
+    print(f"Extracted {counters['extracted_files']} files of the DataHarmonizer, {counters['skipped_files']} were already up to date.\n")
+
+def main(nameOfRepository: str, extractArchive: bool = True) -> dict:
+    '''
+    Downloads the DataHarmonizer archive and extracts it, unless extractArchive
+    is disabled.
+    '''
     getCurrentWorkingDirectory = os.getcwd()
     if not nameOfRepository in getCurrentWorkingDirectory:
         raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), nameOfRepository)
@@ -51,20 +65,11 @@ def main(nameOfRepository: str) -> dict:
     if os.path.exists(pathToWorkingDirectory + pathToDataHarmonizer) == False:
         os.mkdir(pathToWorkingDirectory + pathToDataHarmonizer)
     os.chdir(pathToWorkingDirectory + pathToDataHarmonizer)
-    filePath = downloadDataHarmonizer(pathToWorkingDirectory + pathToDataHarmonizer, configYAML["config"]["DataHarmonizerBuild"]["url_of_DataHarmonizer"])
-    with zipfile.ZipFile(filePath, "r") as zippedDataHarmonizer:
-        for file in zippedDataHarmonizer.infolist():
-            pattern = ".+" + os.sep +".+"
-            if bool(re.match(pattern, file.filename)):
-                source = zippedDataHarmonizer.open(file.filename)
-                target = os.path.join(os.getcwd(),file.filename.replace(patternToRemove, ""))
-                if target.endswith(os.sep):
-                    continue
-                os.makedirs(os.path.dirname(target), exist_ok=True)
-                with open(target, "wb") as outfile:
-                    outfile.write(source.read())
-            else:
-                patternToRemove = file.filename
+    dataHarmonizerBuild = configYAML["config"]["DataHarmonizerBuild"]
+    environment = configYAML["config"]["environment"]
+    filePath = downloadDataHarmonizer(pathToWorkingDirectory + pathToDataHarmonizer, dataHarmonizerBuild["url_of_DataHarmonizer"], dataHarmonizerBuild.get("checksum"), dataHarmonizerBuild.get("size"), environment["path_for_download_cache"], environment["download_cache_size_limit_MB"] * 1024 * 1024)
+    if extractArchive:
+        extractDataHarmonizer(filePath, pathToWorkingDirectory + pathToDataHarmonizer, dataHarmonizerBuild.get("members"), configYAML["config"]["environment"]["max_parallel_extractions"])
     return configYAML
 
 if __name__ == "__main__":
@@ -73,5 +78,8 @@ if __name__ == "__main__":
         description='This piece of software downloads the DataHarmonizer from the internet to be further used to build it with the schemes for the DZIF microbial OMICs Database.',
         epilog='Written by Jannik Seidel (jannik.seidel@qbic.uni-tuebingen.de) and released under MIT License.')
     parser.add_argument("--repo", required=True, help="name of the top-level folder of this software (in which the README.md is located)",type=str)
+    addProfilingArguments(parser)
     args = parser.parse_args()
-    sys.exit(main(nameOfRepository=args.repo))
\ No newline at end of file
+    startProfiling(args, parser)
+    main(nameOfRepository=args.repo)
+    finishProfiling(args, "DataHarmonizerDownloader")
\ No newline at end of file
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+#
+#   Date:   18.10.2026
+#
+#   Offline benchmark of the extraction of the
+#   controlled vocabularies on synthetic (or given)
+#   ontologies. Times every stage separately and
+#   checks the results against regression thresholds.
+#
+##################################################
+import argparse as arg
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import yaml
+# the modules of the pipeline are located next to this package in src/
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import ontoHandler.ontoHandler as ontoHandler
+from ontoHandler.hierarchyIndex import HierarchyIndex
+from ontoHandler.schemeAssembler import getTermsToReplace, loadSchemeTemplate, indexPlaceholders, assembleScheme, writeScheme
+from benchmark.syntheticData import writeSyntheticOwl, writeSyntheticRorCsv
+
+NAME_OF_BENCHMARK_REPOSITORY = "MicrobialOMICsBenchmark"
+PATH_TO_REPOSITORY = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@contextlib.contextmanager
+def timeStage(stages: dict, name: str):
+    start = time.perf_counter()
+    yield
+    stages[name] = {"seconds": round(time.perf_counter() - start, 4)}
+
+def getFileSuffix(pathToOntology: str) -> str:
+    # owl, obo, json (OBO Graphs) or tsv (term table)
+    return pathToOntology.rsplit(".", 1)[-1]
+
+def createBenchmarkRepository(pathToRepository: str, pathToOwl: str, roots: list, pathToCsv: str) -> dict:
+    '''
+    Creates a minimal copy of this repository with a config pointing to the
+    benchmark ontologies, so ontoHandler.main runs without any download. The
+    enums are inserted into placeholders of the real scheme template.
+    '''
+    fileSuffix = getFileSuffix(pathToOwl)
+    for folder in ["config", "schemes", "ontologies"]:
+        os.makedirs(pathToRepository + os.sep + folder, exist_ok=True)
+    shutil.copy(PATH_TO_REPOSITORY + os.sep + "schemes" + os.sep + "metaDZIF.yaml", pathToRepository + os.sep + "schemes" + os.sep + "metaDZIF.yaml")
+    placeholders = ["#<disorder enum>\n", "#<sample site enum uberon>\n", "#<sample material enum envo>\n", "#<instrument enum>\n"]
+    config = {"config": {
+        "ontologies": {
+            "ROR": {
+                "URL": "file:///" + os.path.basename(pathToCsv),
+                # with the size the copied files are used instead of being downloaded
+                "size": os.path.getsize(pathToCsv),
+                "format": {"zipped": False, "file_suffix": "csv"},
+                "enum": {"coll_by_enum": {"term_to_replace": "#<collected by enum>\n", "filtering_column": "country.country_code", "filtering_term": "DE", "terms_to_include": ["name", "id"]}}
+            },
+            "SYN": {
+                "URL": "file:///syn." + fileSuffix,
+                "size": os.path.getsize(pathToOwl),
+                "format": {"zipped": False, "file_suffix": fileSuffix},
+                "enum": {"enum_" + str(index): {"term_to_replace": placeholders[index % len(placeholders)], "descending_from": root} for index, root in enumerate(roots)}
+            }
+        },
+        "environment": {
+            "path_for_ontologies": "ontologies",
+            "path_for_schemes": "schemes",
+            "path_for_final_schemes": "final",
+            "name_of_schemes_file": "metaDZIF.yaml",
+            "path_for_DataHarmonizer": "DataHarmonizer",
+            "path_for_cache": "cache",
+            "cache_size_limit_MB": 0,
+            "path_for_download_cache": pathToRepository + os.sep + "downloads",
+            "download_cache_size_limit_MB": 0,
+            "max_parallel_downloads": 1,
+            "max_parallel_extractions": 1,
+            "name_of_build_manifest": ".buildManifest.json",
+            "name_of_vocabulary_index": "vocabularyIndex.json",
+            "name_of_vocabulary_snapshot": ".vocabularySnapshot.json",
+            "name_of_change_report": "vocabularyChanges.json"
+        },
+        "prefixes_controlled_vocabularies": {"term_to_replace": "#<prefixes controlled vocabularies>\n"}
+    }}
+    with open(pathToRepository + os.sep + "config" + os.sep + "config.yaml", "w") as file:
+        yaml.safe_dump(config, file)
+    shutil.copy(pathToOwl, pathToRepository + os.sep + "ontologies" + os.sep + "syn." + fileSuffix)
+    shutil.copy(pathToCsv, pathToRepository + os.sep + "ontologies" + os.sep + os.path.basename(pathToCsv))
+    return config
+
+def benchmarkSize(pathToOwl: str, roots: list, pathToCsv: str, streaming: bool, jobs: int, pathToWorkingFolder: str) -> dict:
+    '''
+    Runs all stages of the extraction for one ontology and returns their times.
+    '''
+    stages = {}
+    with timeStage(stages, "parse"):
+        triples = ontoHandler.extractTriples(pathToOwl, getFileSuffix(pathToOwl), streaming)
+    stages["parse"]["triples"] = len(triples)
+    with timeStage(stages, "graph_build"):
+        hierarchy = HierarchyIndex.fromTriples(triples)
+    stages["graph_build"]["terms"] = len(hierarchy.terms)
+    del triples
+    with timeStage(stages, "descendant_extraction"):
+        rootIds = [hierarchy.getTermId(root) for root in roots]
+        enumTerms = [hierarchy.getEnumTerms(rootId, descendantIds) for rootId, descendantIds in zip(rootIds, hierarchy.descendantsOf(rootIds))]
+    stages["descendant_extraction"]["terms"] = sum(len(terms) for terms in enumTerms)
+    with timeStage(stages, "csv_filtering"):
+        dataFrame = ontoHandler.readFilteredCsv(pathToCsv, ["name", "id"], "country.country_code", "DE")
+    stages["csv_filtering"]["rows"] = len(dataFrame)
+    with timeStage(stages, "yaml_generation"):
+        yamlBlocks = [ontoHandler.handleOntologyDictToYAMLList(terms) for terms in enumTerms]
+        prefixes = [ontoHandler.getPrefixesOwl(terms) for terms in enumTerms]
+        yamlBlocks.append(ontoHandler.handlePandasDfRor(dataFrame, ["name", "id"]))
+    stages["yaml_generation"]["lines"] = sum(len(block) for block in yamlBlocks)
+
+    pathToRepository = pathToWorkingFolder + os.sep + NAME_OF_BENCHMARK_REPOSITORY
+    config = createBenchmarkRepository(pathToRepository, pathToOwl, roots, pathToCsv)
+    termsToReplace = getTermsToReplace(config)
+    with timeStage(stages, "scheme_insertion"):
+        schemeLines = loadSchemeTemplate(pathToRepository + os.sep + "schemes" + os.sep + "metaDZIF.yaml")
+        with contextlib.redirect_stdout(io.StringIO()):
+            placeholderIndex = indexPlaceholders(schemeLines, termsToReplace)
+        blocks = {}
+        for term, block in zip(termsToReplace[1:], yamlBlocks[:-1]):
+            blocks.setdefault(term, block)
+        blocks[termsToReplace[0]] = yamlBlocks[-1]
+        blocks[termsToReplace[-1]] = ontoHandler.prefixDictToYamlList({key: value for prefix in prefixes for key, value in prefix.items()})
+        writeScheme(pathToWorkingFolder + os.sep + "schemes", "metaDZIF.yaml", assembleScheme(schemeLines, placeholderIndex, blocks))
+
+    workingDirectory = os.getcwd()
+    os.chdir(pathToRepository)
+    try:
+        with timeStage(stages, "end_to_end"):
+            with contextlib.redirect_stdout(io.StringIO()):
+                ontoHandler.main(NAME_OF_BENCHMARK_REPOSITORY, streaming=streaming, useCache=False, jobs=jobs)
+    finally:
+        os.chdir(workingDirectory)
+    return stages
+
+def findRegressions(results: list, benchmarkConfig: dict, baseline: dict = None) -> list:
+    '''
+    Compares the stage times with the absolute thresholds of the benchmark
+    config and, if given, with the times of a baseline report.
+    '''
+    regressions = []
+    thresholds = benchmarkConfig.get("thresholds") or {}
+    tolerance = benchmarkConfig.get("tolerance", 1.25)
+    minimalSlowdown = benchmarkConfig.get("minimal_slowdown_seconds", 0.05)
+    baselineResults = {}
+    if baseline is not None:
+        baselineResults = {result["size"]: result["stages"] for result in baseline["results"]}
+    for result in results:
+        for stage, measurement in result["stages"].items():
+            limit = (thresholds.get(result["size"]) or {}).get(stage)
+            if limit is not None and measurement["seconds"] > limit:
+                regressions.append({"size": result["size"], "stage": stage, "seconds": measurement["seconds"], "threshold": limit})
+            baselineStage = baselineResults.get(result["size"], {}).get(stage)
+            if baselineStage is not None:
+                allowed = baselineStage["seconds"] * tolerance
+                if measurement["seconds"] > allowed and measurement["seconds"] - baselineStage["seconds"] > minimalSlowdown:
+                    regressions.append({"size": result["size"], "stage": stage, "seconds": measurement["seconds"], "baseline": baselineStage["seconds"], "tolerance": tolerance})
+    return regressions
+
+def main(sizes: list = None, rorRows: int = None, seed: int = None, streaming: bool = True, jobs: int = 1, pathToReport: str = "benchmark_report.json", pathToBaseline: str = None, pathToConfig: str = None, pathToOntology: str = None, roots: list = None) -> int:
+    '''
+    Benchmarks the stages of the vocabulary pipeline on synthetic ontologies of
+    the given sizes (or on the ontology file pathToOntology with the given
+    roots) and writes a JSON report. Returns 1 if a regression was found.
+    '''
+    if pathToConfig is None:
+        pathToConfig = PATH_TO_REPOSITORY + os.sep + "config" + os.sep + "benchmark.yaml"
+    with open(pathToConfig, "r") as file:
+        benchmarkConfig = yaml.safe_load(file)["benchmark"]
+    sizes = sizes or benchmarkConfig["sizes"]
+    rorRows = rorRows or benchmarkConfig["ror_rows"]
+    seed = seed if seed is not None else benchmarkConfig["seed"]
+    results = []
+    with tempfile.TemporaryDirectory() as pathToWorkingFolder:
+        pathToCsv = pathToWorkingFolder + os.sep + "ror-benchmark.csv"
+        writeSyntheticRorCsv(pathToCsv, rorRows, seed)
+        if pathToOntology is not None:
+            sizes = [os.path.basename(pathToOntology)]
+        for size in sizes:
+            print(f"Started to benchmark {size}.\n")
+            generation = {}
+            if pathToOntology is not None:
+                pathToOwl = pathToOntology
+                ontologyRoots = roots
+            else:
+                pathToOwl = pathToWorkingFolder + os.sep + "synthetic.owl"
+                with timeStage(generation, "generation"):
+                    ontologyRoots = writeSyntheticOwl(pathToOwl, size, seed=seed)
+            stages = benchmarkSize(pathToOwl, ontologyRoots, pathToCsv, streaming, jobs, pathToWorkingFolder)
+            results.append({"size": size, "file_size_MB": round(os.path.getsize(pathToOwl) / 1024 / 1024, 2), "generation": generation.get("generation"), "stages": stages})
+            print(json.dumps(stages, indent=2) + "\n")
+    baseline = None
+    if pathToBaseline is not None:
+        with open(pathToBaseline, "r") as file:
+            baseline = json.load(file)
+    regressions = findRegressions(results, benchmarkConfig, baseline)
+    report = {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parser": "streaming" if streaming else "rdflib",
+        "jobs": jobs,
+        "ror_rows": rorRows,
+        "seed": seed,
+        "results": results,
+        "regressions": regressions
+    }
+    with open(pathToReport, "w") as file:
+        json.dump(report, file, indent=2)
+    for regression in regressions:
+        print("Regression: " + json.dumps(regression))
+    print(f"Finished the benchmark, the report is located at {pathToReport}.\n")
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    parser = arg.ArgumentParser(
+        prog='DZIF microbial OMICs Database Vocabulary Benchmark',
+        description='This piece of software benchmarks the extraction of the controlled vocabularies on synthetic ontologies without any download.',
+        epilog='Released under MIT License.')
+    parser.add_argument("--sizes", nargs="+", type=int, help="numbers of classes of the synthetic ontologies (default from config/benchmark.yaml)")
+    parser.add_argument("--ror-rows", type=int, help="number of rows of the synthetic ROR csv (default from config/benchmark.yaml)")
+    parser.add_argument("--seed", type=int, help="seed of the synthetic data")
+    parser.add_argument("--rdflib", action="store_true", help="parse the owl files with rdflib instead of the streaming reader")
+    parser.add_argument("--jobs", default=1, type=int, help="number of processes used by the end-to-end run")
+    parser.add_argument("--report", default="benchmark_report.json", help="path of the JSON report")
+    parser.add_argument("--baseline", help="JSON report of an earlier run to compare the stage times with")
+    parser.add_argument("--config", help="path of the benchmark config (default config/benchmark.yaml)")
+    parser.add_argument("--ontology", help="benchmark this ontology file (owl, obo, OBO Graphs json or term table) instead of synthetic ontologies, e.g. a new ontology release")
+    parser.add_argument("--roots", nargs="+", help="IRIs of the enum roots in the file given by --ontology")
+    args = parser.parse_args()
+    if args.ontology is not None and not args.roots:
+        parser.error("--ontology requires --roots")
+    sys.exit(main(sizes=args.sizes, rorRows=args.ror_rows, seed=args.seed, streaming=not args.rdflib, jobs=args.jobs, pathToReport=args.report, pathToBaseline=args.baseline, pathToConfig=args.config, pathToOntology=args.ontology, roots=args.roots))
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+#
+#   Date:   18.10.2026
+#
+#   Generators for synthetic ontologies (RDF/XML)
+#   and ROR-style csv files used to benchmark the
+#   extraction of the controlled vocabularies.
+#
+##################################################
+import random
+from xml.sax.saxutils import escape
+
+OBO_NAMESPACE = "http://purl.obolibrary.org/obo/"
+WORDS = ["acute", "tissue", "cell", "soil", "water", "chronic", "layer", "gland", "organ", "region",
+         "marine", "fluid", "bone", "nerve", "infection", "disease", "sample", "material", "surface", "zone"]
+
+OWL_HEADER = """<?xml version="1.0"?>
+<rdf:RDF xmlns="{base}#"
+     xml:base="{base}"
+     xmlns:obo="http://purl.obolibrary.org/obo/"
+     xmlns:owl="http://www.w3.org/2002/07/owl#"
+     xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+     xmlns:xml="http://www.w3.org/XML/1998/namespace"
+     xmlns:xsd="http://www.w3.org/2001/XMLSchema#"
+     xmlns:rdfs="http://www.w3.org/2000/01/rdf-schema#"
+     xmlns:oboInOwl="http://www.geneontology.org/formats/oboInOwl#">
+    <owl:Ontology rdf:about="{base}"/>
+    <owl:ObjectProperty rdf:about="http://purl.obolibrary.org/obo/BFO_0000050">
+        <rdfs:label>part of</rdfs:label>
+    </owl:ObjectProperty>
+"""
+
+
+def getClassIRI(prefix: str, index: int) -> str:
+    return OBO_NAMESPACE + prefix + "_" + str(index).zfill(7)
+
+def getLabel(rnd: random.Random, index: int) -> str:
+    # some labels are shared by several classes like in real ontologies
+    if rnd.random() < 0.02:
+        return " ".join(rnd.sample(WORDS, 2))
+    return " ".join(rnd.sample(WORDS, 3)) + " " + str(index)
+
+def writeSyntheticOwl(filePath: str, numberOfClasses: int, prefix: str = "SYN", seed: int = 1, multipleParentShare: float = 0.1, restrictionShare: float = 0.3, axiomShare: float = 0.1) -> list:
+    '''
+    Writes an OWL file in the RDF/XML layout of the OBO Foundry ontologies with
+    numberOfClasses classes. Every class has a label, an oboInOwl:id and one or
+    more subClassOf statements, parts of them also have owl:Restriction blank
+    nodes and annotated axioms. Parents are drawn uniformly from the classes
+    before, which gives a depth of the hierarchy growing with the logarithm of
+    its size. Returns the IRIs of two roots for controlled vocabularies.
+    '''
+    rnd = random.Random(seed)
+    with open(filePath, "w") as file:
+        file.write(OWL_HEADER.format(base=OBO_NAMESPACE + prefix.lower() + ".owl"))
+        for index in range(numberOfClasses):
+            iri = getClassIRI(prefix, index)
+            lines = ['    <owl:Class rdf:about="' + iri + '">\n']
+            if index > 0:
+                parents = {rnd.randrange(index)}
+                if index > 1 and rnd.random() < multipleParentShare:
+                    parents.add(rnd.randrange(index))
+                for parent in sorted(parents):
+                    lines.append('        <rdfs:subClassOf rdf:resource="' + getClassIRI(prefix, parent) + '"/>\n')
+            if index > 0 and rnd.random() < restrictionShare:
+                lines.append('        <rdfs:subClassOf>\n'
+                             '            <owl:Restriction>\n'
+                             '                <owl:onProperty rdf:resource="http://purl.obolibrary.org/obo/BFO_0000050"/>\n'
+                             '                <owl:someValuesFrom rdf:resource="' + getClassIRI(prefix, rnd.randrange(index)) + '"/>\n'
+                             '            </owl:Restriction>\n'
+                             '        </rdfs:subClassOf>\n')
+            label = escape(getLabel(rnd, index))
+            lines.append('        <oboInOwl:id rdf:datatype="http://www.w3.org/2001/XMLSchema#string">' + prefix + ":" + str(index).zfill(7) + '</oboInOwl:id>\n')
+            lines.append('        <rdfs:label rdf:datatype="http://www.w3.org/2001/XMLSchema#string">' + label + '</rdfs:label>\n')
+            lines.append('    </owl:Class>\n')
+            if rnd.random() < axiomShare:
+                lines.append('    <owl:Axiom>\n'
+                             '        <owl:annotatedSource rdf:resource="' + iri + '"/>\n'
+                             '        <owl:annotatedProperty rdf:resource="http://www.w3.org/2000/01/rdf-schema#label"/>\n'
+                             '        <owl:annotatedTarget>' + label + '</owl:annotatedTarget>\n'
+                             '        <oboInOwl:hasDbXref>PMID:' + str(rnd.randrange(10**8)) + '</oboInOwl:hasDbXref>\n'
+                             '    </owl:Axiom>\n')
+            file.writelines(lines)
+        file.write("</rdf:RDF>\n")
+    return [getClassIRI(prefix, 1), getClassIRI(prefix, min(2, numberOfClasses - 1))]
+
+def writeSyntheticRorCsv(filePath: str, numberOfRows: int, seed: int = 1, countries: list = ("DE", "FR", "US", "GB", "NA")) -> int:
+    '''
+    Writes a csv in the layout of the ROR data dump (with a subset of its
+    columns) with organization names containing quotes and backslashes.
+    Returns the number of rows of the first country.
+    '''
+    rnd = random.Random(seed)
+    numberOfFirstCountry = 0
+    with open(filePath, "w") as file:
+        file.write("id,name,types,status,links,aliases,labels,acronyms,wikipedia_url,established,addresses[0].city,country.country_name,country.country_code\n")
+        for index in range(numberOfRows):
+            name = rnd.choice(["University", "Institute", "Klinikum", "Hochschule", "Center"]) + " of " + rnd.choice(WORDS).capitalize()
+            special = rnd.random()
+            if special < 0.02:
+                name += " \"" + rnd.choice(WORDS) + "\""
+            elif special < 0.04:
+                name = rnd.choice(WORDS).capitalize() + "'s " + name
+            elif special < 0.05:
+                name += " \"" + rnd.choice(WORDS) + "\" 's"
+            elif special < 0.06:
+                name += " \\ " + rnd.choice(WORDS)
+            country = countries[0] if rnd.random() < 0.1 else rnd.choice(countries[1:])
+            numberOfFirstCountry += country == countries[0]
+            row = [
+                "https://ror.org/0" + str(index).zfill(8),
+                "\"" + name.replace("\"", "\"\"") + "\"",
+                "Education",
+                "active",
+                "https://example.org/" + str(index),
+                "",
+                "",
+                "",
+                "",
+                str(1800 + rnd.randrange(220)),
+                rnd.choice(WORDS).capitalize(),
+                "Country " + country,
+                country
+            ]
+            file.write(",".join(row) + "\n")
+    return numberOfFirstCountry
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+#
+#   Date:   18.10.2026
+#
+#   Build manifest for the incremental building of
+#   the DZIF DataHarmonizer. Records fingerprints of
+#   the inputs of every build stage, so stages with
+#   unchanged inputs can be skipped.
+#
+##################################################
+import hashlib
+import json
+import os
+
+
+def loadManifest(pathToManifest: str) -> dict:
+    if not os.path.isfile(pathToManifest):
+        return {"stages": {}}
+    with open(pathToManifest, "r") as file:
+        try:
+            manifest = json.load(file)
+        except json.JSONDecodeError:
+            # a broken manifest only means that every stage runs again
+            return {"stages": {}}
+    manifest.setdefault("stages", {})
+    return manifest
+
+def saveManifest(pathToManifest: str, manifest: dict):
+    with open(pathToManifest + ".tmp", "w") as file:
+        json.dump(manifest, file, indent=2, sort_keys=True)
+    os.replace(pathToManifest + ".tmp", pathToManifest)
+
+def hashFile(filePath: str) -> str:
+    if not os.path.isfile(filePath):
+        return None
+    with open(filePath, "rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+def getFingerprint(inputs: dict) -> str:
+    '''
+    Combines the fingerprints of the inputs of a stage (file hashes or any
+    other json serializable values) into a single fingerprint.
+    '''
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode("utf-8")).hexdigest()
+
+def stageIsUpToDate(manifest: dict, stage: str, fingerprint: str, outputs: list = ()) -> bool:
+    '''
+    A stage is up to date if it was recorded with the same fingerprint and all
+    of its outputs still exist.
+    '''
+    if manifest["stages"].get(stage) != fingerprint:
+        return False
+    return all(os.path.exists(output) for output in outputs)
+
+def recordStage(manifest: dict, stage: str, fingerprint: str, pathToManifest: str):
+    manifest["stages"][stage] = fingerprint
+    saveManifest(pathToManifest, manifest)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+#
+#   Date:   18.10.2026
+#
+#   Archive extraction shared by the ontology and
+#   the DataHarmonizer downloader. Streams only the
+#   needed members to disk and skips the files
+#   which are already extracted.
+#
+##################################################
+import fnmatch
+import os
+import shutil
+import threading
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from profiler.profiler import getProfiler
+
+BUFFER_SIZE = 1024 * 1024
+PARTIAL_SUFFIX = ".part"
+
+
+def getFileCRC(filePath: str, bufferSize: int = BUFFER_SIZE) -> int:
+    crc = 0
+    with open(filePath, "rb") as file:
+        while True:
+            chunk = file.read(bufferSize)
+            if not chunk:
+                return crc
+            crc = zlib.crc32(chunk, crc)
+
+def isExtracted(member: zipfile.ZipInfo, targetPath: str, bufferSize: int = BUFFER_SIZE) -> bool:
+    '''
+    A member is already extracted if the file on disk has its size and CRC,
+    the CRC is only computed if the size matches.
+    '''
+    if not os.path.isfile(targetPath) or os.path.getsize(targetPath) != member.file_size:
+        return False
+    return getFileCRC(targetPath, bufferSize) == member.CRC
+
+def selectMembers(archive: zipfile.ZipFile, pathToTarget: str, patterns: list = None, stripTopLevel: bool = False) -> list:
+    '''
+    Returns the files of the archive matching one of the glob patterns (all
+    files if no patterns are given) together with their target path. With
+    stripTopLevel the top-level folder of the archive is removed from the
+    paths. Members pointing outside of pathToTarget raise a ValueError.
+    '''
+    pathToTarget = os.path.abspath(pathToTarget)
+    selectedMembers = []
+    for member in archive.infolist():
+        if member.is_dir():
+            continue
+        name = member.filename
+        if stripTopLevel:
+            name = name.split("/", 1)[1] if "/" in name else ""
+            if not name:
+                continue
+        if patterns and not any(fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(os.path.basename(name), pattern) for pattern in patterns):
+            continue
+        targetPath = os.path.normpath(os.path.join(pathToTarget, *name.split("/")))
+        if os.path.commonpath([pathToTarget, targetPath]) != pathToTarget:
+            raise ValueError(member.filename + " would be extracted outside of " + pathToTarget)
+        selectedMembers.append((member, targetPath))
+    return selectedMembers
+
+def extractMember(archive: zipfile.ZipFile, member: zipfile.ZipInfo, targetPath: str, bufferSize: int = BUFFER_SIZE) -> int:
+    '''
+    Streams a member of the archive to targetPath in chunks of bufferSize.
+    The file is written next to the target first, so an interrupted extraction
+    never leaves a truncated file behind. Returns the number of bytes written.
+    '''
+    os.makedirs(os.path.dirname(targetPath), exist_ok=True)
+    with archive.open(member, "r") as source, open(targetPath + PARTIAL_SUFFIX, "wb") as target:
+        shutil.copyfileobj(source, target, bufferSize)
+    os.replace(targetPath + PARTIAL_SUFFIX, targetPath)
+    return member.file_size
+
+def extractArchive(pathToArchive: str, pathToTarget: str, patterns: list = None, stripTopLevel: bool = False, maxWorkers: int = 4, bufferSize: int = BUFFER_SIZE) -> dict:
+    '''
+    Extracts the members of the archive matching the glob patterns into
+    pathToTarget, see selectMembers. Members already extracted with the same
+    size and CRC are skipped, the others are extracted by up to maxWorkers
+    threads. Returns the number of extracted and skipped files and the bytes
+    written.
+    '''
+    with zipfile.ZipFile(pathToArchive, "r") as archive:
+        selectedMembers = selectMembers(archive, pathToTarget, patterns, stripTopLevel)
+    if patterns and not selectedMembers:
+        raise FileNotFoundError(os.path.basename(pathToArchive) + " has no member matching " + ", ".join(patterns))
+    counters = {"extracted_files": 0, "skipped_files": 0, "bytes_extracted": 0}
+    # every thread reads from its own handle of the archive
+    archives = []
+    localArchive = threading.local()
+
+    def extract(member: zipfile.ZipInfo, targetPath: str):
+        if isExtracted(member, targetPath, bufferSize):
+            return 0, 1, 0
+        if not hasattr(localArchive, "archive"):
+            localArchive.archive = zipfile.ZipFile(pathToArchive, "r")
+            archives.append(localArchive.archive)
+        return 1, 0, extractMember(localArchive.archive, member, targetPath, bufferSize)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(maxWorkers, len(selectedMembers)))) as executor:
+            for extracted, skipped, bytesWritten in executor.map(lambda selected: extract(*selected), selectedMembers):
+                counters["extracted_files"] += extracted
+                counters["skipped_files"] += skipped
+                counters["bytes_extracted"] += bytesWritten
+    finally:
+        for archive in archives:
+            archive.close()
+    getProfiler().count("files", counters["extracted_files"])
+    getProfiler().count("bytes_extracted", counters["bytes_extracted"])
+    return counters
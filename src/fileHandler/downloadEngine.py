@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+#
+#   Date:   18.10.2026
+#
+#   Download engine shared by the ontology and the
+#   DataHarmonizer downloader. Fetches files
+#   concurrently, resumes interrupted transfers and
+#   keeps a content-addressed cache of the files.
+#
+##################################################
+import hashlib
+import json
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+from profiler.profiler import getProfiler
+if TYPE_CHECKING:
+    # requests is imported when a file has to be downloaded
+    import requests
+try:
+    import fcntl
+except ImportError:
+    # no locking of the shared cache on systems without fcntl
+    fcntl = None
+
+CHUNK_SIZE = 1024 * 1024
+PARTIAL_SUFFIX = ".part"
+# response headers a cached file of a url is revalidated with
+VALIDATORS = {"ETag": "If-None-Match", "Last-Modified": "If-Modified-Since"}
+VALIDATORS_SUFFIX = ".json"
+
+
+def getHash(filePath: str, algorithm: str = "sha256") -> str:
+    with open(filePath, "rb") as file:
+        return hashlib.file_digest(file, algorithm).hexdigest()
+
+def verifyFile(filePath: str, checksum: str = None, size: int = None) -> bool:
+    '''
+    Checks a file against the optional expected size in bytes and checksum.
+    The checksum is given as "<algorithm>:<hex digest>", e.g. "sha256:ab12...".
+    '''
+    if size is not None and os.path.getsize(filePath) != int(size):
+        return False
+    if checksum is not None:
+        algorithm, expectedDigest = checksum.split(":", 1)
+        if getHash(filePath, algorithm).lower() != expectedDigest.strip().lower():
+            return False
+    return True
+
+def getBlobPath(pathToCache: str, contentHash: str) -> str:
+    return pathToCache + os.sep + "blobs" + os.sep + contentHash[:2] + os.sep + contentHash
+
+def getIndexPath(pathToCache: str, url: str) -> str:
+    return pathToCache + os.sep + "urls" + os.sep + hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+def lookupCache(pathToCache: str, url: str, checksum: str = None) -> str:
+    '''
+    Returns the path of the cached file for the url (or the sha256 checksum)
+    or None if it is not in the cache yet.
+    '''
+    if checksum is not None and checksum.lower().startswith("sha256:"):
+        pathToBlob = getBlobPath(pathToCache, checksum.split(":", 1)[1].strip().lower())
+        if os.path.isfile(pathToBlob):
+            return pathToBlob
+    pathToIndex = getIndexPath(pathToCache, url)
+    if os.path.isfile(pathToIndex):
+        with open(pathToIndex, "r") as file:
+            pathToBlob = getBlobPath(pathToCache, file.read().strip())
+        if os.path.isfile(pathToBlob):
+            return pathToBlob
+    return None
+
+def readValidators(pathToValidators: str) -> dict:
+    if not os.path.isfile(pathToValidators):
+        return {}
+    with open(pathToValidators, "r") as file:
+        return json.load(file)
+
+def writeValidators(pathToValidators: str, validators: dict):
+    with open(pathToValidators + ".tmp", "w") as file:
+        json.dump(validators or {}, file)
+    os.replace(pathToValidators + ".tmp", pathToValidators)
+
+def loadValidators(pathToCache: str, url: str) -> dict:
+    '''
+    Returns the ETag and Last-Modified headers the cached file of the url was
+    downloaded with, an empty dictionary if the server sent none.
+    '''
+    return readValidators(getIndexPath(pathToCache, url) + VALIDATORS_SUFFIX)
+
+def storeInCache(pathToCache: str, url: str, filePath: str, validators: dict = None) -> str:
+    '''
+    Moves a completely downloaded file into the cache and records the url
+    together with the validators of the response. Returns the path of the
+    file in the cache.
+    '''
+    contentHash = getHash(filePath)
+    pathToBlob = getBlobPath(pathToCache, contentHash)
+    os.makedirs(os.path.dirname(pathToBlob), exist_ok=True)
+    os.replace(filePath, pathToBlob)
+    pathToIndex = getIndexPath(pathToCache, url)
+    os.makedirs(os.path.dirname(pathToIndex), exist_ok=True)
+    writeValidators(pathToIndex + VALIDATORS_SUFFIX, validators)
+    with open(pathToIndex + ".tmp", "w") as file:
+        file.write(contentHash + "\n")
+    os.replace(pathToIndex + ".tmp", pathToIndex)
+    return pathToBlob
+
+def isCacheCurrent(url: str, validators: dict, session: "requests.Session") -> bool:
+    '''
+    Asks the server with a conditional request whether the cached file of the
+    url is still current. Without validators the file can not be revalidated.
+    If the server is unreachable the cached file is used.
+    '''
+    import requests
+    if not validators:
+        return False
+    headers = {VALIDATORS[header]: value for header, value in validators.items() if header in VALIDATORS}
+    try:
+        with session.head(url, headers=headers, allow_redirects=True, timeout=60) as response:
+            if response.status_code == 304:
+                return True
+            # some servers ignore the conditions of a HEAD request
+            return response.ok and "ETag" in validators and response.headers.get("ETag") == validators["ETag"]
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+        print("Could not revalidate " + url + ", using the cached file.\n")
+        return True
+
+def evictDownloadCache(pathToCache: str, cacheSizeLimit: int, keep: list = None):
+    '''
+    Removes the least recently used files of the cache together with the urls
+    pointing to them until the cache is smaller than cacheSizeLimit (in bytes).
+    A file is used when one of its urls is downloaded or found in the cache.
+    The files linked to the paths in keep are never removed.
+    '''
+    pathToCache = os.path.expanduser(pathToCache)
+    pathToBlobs = pathToCache + os.sep + "blobs"
+    pathToIndex = pathToCache + os.sep + "urls"
+    if not os.path.isdir(pathToBlobs):
+        return
+    keptFiles = set()
+    for filePath in keep or []:
+        if os.path.isfile(filePath):
+            stat = os.stat(filePath)
+            keptFiles.add((stat.st_dev, stat.st_ino))
+    # the blobs are hard linked into the working folders, so their last use is recorded by the url index
+    indexEntries = {}
+    lastUse = {}
+    for fileName in os.listdir(pathToIndex) if os.path.isdir(pathToIndex) else []:
+        if "." in fileName:
+            continue
+        try:
+            with open(pathToIndex + os.sep + fileName, "r") as file:
+                contentHash = file.read().strip()
+            modificationTime = os.path.getmtime(pathToIndex + os.sep + fileName)
+        except FileNotFoundError:
+            continue
+        indexEntries.setdefault(contentHash, []).append(pathToIndex + os.sep + fileName)
+        lastUse[contentHash] = max(lastUse.get(contentHash, 0), modificationTime)
+    blobs = []
+    for folder in os.listdir(pathToBlobs):
+        for contentHash in os.listdir(pathToBlobs + os.sep + folder):
+            try:
+                stat = os.stat(getBlobPath(pathToCache, contentHash))
+            except FileNotFoundError:
+                # removed by another process in the meantime
+                continue
+            blobs.append((lastUse.get(contentHash, stat.st_mtime), stat.st_size, contentHash, (stat.st_dev, stat.st_ino) in keptFiles))
+    cacheSize = sum(blob[1] for blob in blobs)
+    for _, size, contentHash, kept in sorted(blobs):
+        if cacheSize <= cacheSizeLimit:
+            break
+        if kept:
+            continue
+        for filePath in indexEntries.get(contentHash, []) + [getBlobPath(pathToCache, contentHash)]:
+            for pathToRemove in [filePath, filePath + VALIDATORS_SUFFIX]:
+                try:
+                    os.remove(pathToRemove)
+                except FileNotFoundError:
+                    pass
+        cacheSize -= size
+
+def linkFile(source: str, target: str):
+    if os.path.exists(target):
+        os.remove(target)
+    try:
+        os.link(source, target)
+    except OSError:
+        # different file systems or no support for hard links
+        shutil.copyfile(source, target)
+
+def getIfRange(validators: dict) -> str:
+    '''
+    Returns the validator a partial file can be resumed with, a weak ETag can
+    not be used for ranges. None if the version of the file is unknown.
+    '''
+    if validators.get("ETag") and not validators["ETag"].startswith("W/"):
+        return validators["ETag"]
+    return validators.get("Last-Modified")
+
+def fetchToFile(url: str, partialPath: str, session: "requests.Session", chunkSize: int = CHUNK_SIZE, retries: int = 3) -> dict:
+    '''
+    Downloads url into partialPath. An already existing partial file is resumed
+    with an HTTP Range request, which is conditional (If-Range) on the version
+    of the file the partial transfer started with, so a changed file is
+    downloaded completely again. Returns the validators (ETag, Last-Modified)
+    of the response.
+    '''
+    import requests
+    pathToValidators = partialPath + VALIDATORS_SUFFIX
+    validators = {}
+    for attempt in range(retries + 1):
+        partialValidators = readValidators(pathToValidators)
+        startByte = os.path.getsize(partialPath) if os.path.isfile(partialPath) else 0
+        if startByte > 0 and getIfRange(partialValidators) is None:
+            # a partial file of an unknown version can not be resumed safely
+            os.remove(partialPath)
+            startByte = 0
+        headers = {"Range": "bytes=" + str(startByte) + "-", "If-Range": getIfRange(partialValidators)} if startByte > 0 else {}
+        try:
+            with session.get(url, stream=True, headers=headers, timeout=60) as response:
+                if response.status_code == 416 and startByte > 0:
+                    # the partial file already holds the complete content
+                    return partialValidators
+                response.raise_for_status()
+                validators = {header: response.headers[header] for header in VALIDATORS if header in response.headers}
+                if response.status_code == 206 and "ETag" in validators and validators["ETag"] != partialValidators.get("ETag"):
+                    # the server ignored If-Range, the file changed since the partial transfer
+                    os.remove(partialPath)
+                    continue
+                if response.status_code != 206:
+                    writeValidators(pathToValidators, validators)
+                mode = "ab" if response.status_code == 206 else "wb"
+                with open(partialPath, mode) as file:
+                    for chunk in response.iter_content(chunk_size=chunkSize):
+                        if chunk:
+                            file.write(chunk)
+                            getProfiler().count("bytes_downloaded", len(chunk))
+            return validators
+        except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError, requests.exceptions.Timeout):
+            if attempt == retries:
+                raise
+    return validators
+
+def downloadFile(url: str, targetPath: str, checksum: str = None, size: int = None, pathToCache: str = None, chunkSize: int = CHUNK_SIZE, session: "requests.Session" = None) -> str:
+    '''
+    Downloads url to targetPath unless a verified copy exists already. The
+    download is written to a partial file first, which is resumed on the next
+    call if the transfer gets interrupted. With pathToCache the file is stored
+    in the content-addressed cache and targetPath links to it. Existing files
+    are only reused without asking the server if a checksum or size is given,
+    otherwise the cached file is revalidated with a conditional request.
+    '''
+    pinned = checksum is not None or size is not None
+    with getProfiler().stage("download " + os.path.basename(targetPath), "download", bytes_downloaded=0) as record:
+        if pinned and os.path.isfile(targetPath) and verifyFile(targetPath, checksum, size):
+            record["counters"]["source"] = "target"
+            return targetPath
+        os.makedirs(os.path.dirname(os.path.abspath(targetPath)), exist_ok=True)
+        if pathToCache is None:
+            return fetchAndVerify(url, targetPath, targetPath + PARTIAL_SUFFIX, checksum, size, None, chunkSize, session)
+        pathToCache = os.path.expanduser(pathToCache)
+        partialPath = pathToCache + os.sep + "partial" + os.sep + hashlib.sha256(url.encode("utf-8")).hexdigest() + PARTIAL_SUFFIX
+        os.makedirs(os.path.dirname(partialPath), exist_ok=True)
+        # several checkouts or CI jobs can share the cache, only one of them downloads a url
+        with open(partialPath + ".lock", "w") as lockFile:
+            if fcntl is not None:
+                fcntl.flock(lockFile, fcntl.LOCK_EX)
+            pathToBlob = lookupCache(pathToCache, url, checksum)
+            try:
+                if pathToBlob is not None and verifyFile(pathToBlob, checksum, size):
+                    if pinned or withSession(session, lambda session: isCacheCurrent(url, loadValidators(pathToCache, url), session)):
+                        record["counters"]["source"] = "cache"
+                        if not (os.path.isfile(targetPath) and os.path.samefile(pathToBlob, targetPath)):
+                            linkFile(pathToBlob, targetPath)
+                        # mark the file as recently used for the eviction
+                        if os.path.isfile(getIndexPath(pathToCache, url)):
+                            os.utime(getIndexPath(pathToCache, url))
+                        return targetPath
+            except FileNotFoundError:
+                # evicted by another checkout sharing the cache, download it again
+                pass
+            return fetchAndVerify(url, targetPath, partialPath, checksum, size, pathToCache, chunkSize, session)
+
+def withSession(session: "requests.Session", function):
+    '''
+    Calls function with the session, or with an own session which is closed
+    afterwards if none is given.
+    '''
+    if session is not None:
+        return function(session)
+    # requests is only imported if the server has to be contacted
+    import requests
+    with requests.Session() as ownSession:
+        return function(ownSession)
+
+def fetchAndVerify(url: str, targetPath: str, partialPath: str, checksum: str, size: int, pathToCache: str, chunkSize: int, session: "requests.Session") -> str:
+    import requests
+    try:
+        validators = withSession(session, lambda session: fetchToFile(url, partialPath, session, chunkSize))
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+        # without checksum or size an existing file can only be checked by the server
+        if checksum is not None or size is not None or not os.path.isfile(targetPath):
+            raise
+        print("Could not download " + url + ", using the existing " + os.path.basename(targetPath) + ".\n")
+        return targetPath
+    # the transfer is complete, the partial file is not resumed anymore
+    if os.path.isfile(partialPath + VALIDATORS_SUFFIX):
+        os.remove(partialPath + VALIDATORS_SUFFIX)
+    if not verifyFile(partialPath, checksum, size):
+        os.remove(partialPath)
+        raise ValueError("Download of " + url + " does not match the expected checksum or size")
+    if pathToCache is not None:
+        linkFile(storeInCache(pathToCache, url, partialPath, validators), targetPath)
+    else:
+        os.replace(partialPath, targetPath)
+    return targetPath
+
+def downloadFiles(downloads: list, pathToCache: str = None, maxWorkers: int = 4, chunkSize: int = CHUNK_SIZE, cacheSizeLimit: int = None) -> list:
+    '''
+    Downloads several files concurrently with at most maxWorkers transfers at the
+    same time. Every entry of downloads is a dictionary with the keys "URL" and
+    "target" and optionally "checksum" and "size". With cacheSizeLimit (in
+    bytes) the cache is reduced to this size afterwards, the downloaded files
+    are kept. Returns the target paths in the order of downloads.
+    '''
+    with ThreadPoolExecutor(max_workers=max(1, maxWorkers)) as executor:
+        futures = [executor.submit(downloadFile, download["URL"], download["target"], download.get("checksum"), download.get("size"), pathToCache, chunkSize) for download in downloads]
+        targetPaths = [future.result() for future in futures]
+    if pathToCache is not None and cacheSizeLimit is not None:
+        evictDownloadCache(pathToCache, cacheSizeLimit, keep=targetPaths)
+    return targetPaths
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+#
+#   Date:   18.10.2026
+#
+#   Compact index of the subClassOf hierarchy of an
+#   ontology, used to extract all terms descending
+#   from the roots of the controlled vocabularies.
+#
+##################################################
+import numpy as np
+
+# number of roots which can be answered by one traversal (bits of the mask)
+ROOTS_PER_TRAVERSAL = 64
+
+
+def buildCSR(sources: np.ndarray, targets: np.ndarray, numberOfNodes: int):
+    '''
+    Returns the compressed sparse row arrays (indptr, indices) of the edges
+    sources -> targets. The targets of every source keep their input order.
+    '''
+    order = np.argsort(sources, kind="stable")
+    indices = targets[order].astype(np.int32)
+    counts = np.bincount(sources, minlength=numberOfNodes)
+    indptr = np.zeros(numberOfNodes + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+    return indptr, indices
+
+def gatherNeighbours(indptr: np.ndarray, indices: np.ndarray, nodes: np.ndarray):
+    '''
+    Returns the neighbours of all nodes as one array together with the node
+    each neighbour belongs to.
+    '''
+    starts = indptr[nodes]
+    counts = indptr[nodes + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int32), np.empty(0, dtype=nodes.dtype)
+    owners = np.repeat(nodes, counts)
+    offsets = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(total)
+    return indices[offsets], owners
+
+
+class HierarchyIndex:
+    '''
+    Terms are interned to integer ids, the subClassOf edges are kept as CSR
+    arrays in both directions and the labels in a separate array.
+    '''
+
+    def __init__(self, terms: list, labels: list, childEdges: np.ndarray, parentEdges: np.ndarray, iriToId: dict = None):
+        self.terms = terms
+        self.iriToId = iriToId if iriToId is not None else {iri: termId for termId, iri in enumerate(terms)}
+        self.labels = np.array(labels, dtype=object)
+        numberOfTerms = len(terms)
+        self.childIndptr, self.childIndices = buildCSR(parentEdges, childEdges, numberOfTerms)
+        self.parentIndptr, self.parentIndices = buildCSR(childEdges, parentEdges, numberOfTerms)
+
+    @classmethod
+    def fromTriples(cls, triples):
+        '''
+        Builds the index from the id, label and subClassOf statements of an
+        ontology. If a term has several labels, the last one is used.
+        '''
+        iriToId = {}
+        terms = []
+        labels = []
+        children = []
+        parents = []
+
+        def intern(iri: str) -> int:
+            termId = iriToId.get(iri)
+            if termId is None:
+                termId = len(terms)
+                iriToId[iri] = termId
+                terms.append(iri)
+                labels.append(None)
+            return termId
+
+        for subj, pred, obj in triples:
+            subjectId = intern(subj)
+            if "#label" in pred:
+                labels[subjectId] = obj
+            elif "subClassOf" in pred:
+                children.append(subjectId)
+                parents.append(intern(obj))
+        return cls(terms, labels, np.array(children, dtype=np.int64), np.array(parents, dtype=np.int64), iriToId)
+
+    def getTermId(self, iri: str) -> int:
+        termId = self.iriToId.get(iri)
+        if termId is None:
+            raise KeyError(iri + " is not part of the ontology")
+        return termId
+
+    def descendantsOf(self, rootIds: list) -> list:
+        '''
+        Returns for every root the ids of all terms descending from it (without
+        the root itself). Up to 64 roots are answered by a single traversal,
+        every term carries a bit mask of the roots it descends from.
+        '''
+        descendants = []
+        for start in range(0, len(rootIds), ROOTS_PER_TRAVERSAL):
+            batch = rootIds[start:start + ROOTS_PER_TRAVERSAL]
+            mask = np.zeros(len(self.terms), dtype=np.uint64)
+            for bit, rootId in enumerate(batch):
+                mask[rootId] |= np.uint64(1) << np.uint64(bit)
+            frontier = np.unique(np.array(batch, dtype=np.int64))
+            while frontier.size:
+                children, owners = gatherNeighbours(self.childIndptr, self.childIndices, frontier)
+                if children.size == 0:
+                    break
+                candidates = np.unique(children)
+                before = mask[candidates]
+                np.bitwise_or.at(mask, children, mask[owners])
+                frontier = candidates[mask[candidates] != before].astype(np.int64)
+            for bit, rootId in enumerate(batch):
+                termIds = np.flatnonzero(mask & (np.uint64(1) << np.uint64(bit)))
+                descendants.append(termIds[termIds != rootId])
+        return descendants
+
+    def getEnumTerms(self, rootId: int, descendantIds: np.ndarray) -> dict:
+        '''
+        Returns the descendants of a root together with their direct parents as
+        dictionary of IRI to id and label, sorted by label and IRI. The root
+        itself and terms without any label are left out.
+        '''
+        parentIds, _ = gatherNeighbours(self.parentIndptr, self.parentIndices, descendantIds)
+        termIds = np.union1d(descendantIds, parentIds)
+        termIds = termIds[termIds != rootId]
+        enumTerms = []
+        for termId in termIds:
+            label = self.labels[termId]
+            if label is None:
+                continue
+            iri = self.terms[termId]
+            enumTerms.append((label, iri))
+        enumTerms.sort()
+        return {iri: {"id": iri.split("/")[-1].replace("_",":"), "label": label} for label, iri in enumTerms}
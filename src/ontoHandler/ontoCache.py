@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+#
+#   Date:   18.10.2026
+#
+#   On-disk cache for the statements extracted from
+#   the ontologies, so unchanged ontology files do
+#   not have to be parsed again on every build.
+#
+##################################################
+import array
+import hashlib
+import os
+import shutil
+import struct
+import sys
+import zlib
+
+CACHE_FORMAT_VERSION = 1
+CACHE_MAGIC = b"DZIFONTO"
+CACHE_SUFFIX = ".cache"
+
+
+def getFileHash(filePath: str) -> str:
+    with open(filePath, "rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+def getCacheKey(filePath: str, extractionSettings: dict) -> str:
+    '''
+    The key of a cache entry is made up of the content hash of the ontology
+    file and the settings used to extract the statements from it.
+    '''
+    settings = ";".join(key + "=" + str(extractionSettings[key]) for key in sorted(extractionSettings.keys()))
+    keySource = getFileHash(filePath) + ";" + settings + ";version=" + str(CACHE_FORMAT_VERSION)
+    return hashlib.sha256(keySource.encode("utf-8")).hexdigest()
+
+def encodeTriples(triples: list) -> bytes:
+    stringIndex = {}
+    strings = []
+    predicateIndex = {}
+    subjects = array.array("I")
+    objects = array.array("I")
+    predicateCodes = array.array("B")
+    for subj, pred, obj in triples:
+        for node, column in ((subj, subjects), (obj, objects)):
+            index = stringIndex.get(node)
+            if index is None:
+                index = len(strings)
+                stringIndex[node] = index
+                strings.append(node)
+            column.append(index)
+        predicateCodes.append(predicateIndex.setdefault(pred, len(predicateIndex)))
+    if sys.byteorder == "big":
+        subjects.byteswap()
+        objects.byteswap()
+    stringBlock = "\0".join(strings).encode("utf-8")
+    predicateBlock = "\0".join(predicateIndex.keys()).encode("utf-8")
+    payload = struct.pack("<IIII", len(predicateBlock), len(stringBlock), len(strings), len(predicateCodes))
+    payload += predicateBlock + stringBlock + subjects.tobytes() + objects.tobytes() + predicateCodes.tobytes()
+    return CACHE_MAGIC + zlib.compress(payload, 1)
+
+def decodeTriples(data: bytes) -> list:
+    if not data.startswith(CACHE_MAGIC):
+        raise ValueError("not an ontology cache entry")
+    payload = zlib.decompress(data[len(CACHE_MAGIC):])
+    predicateLength, stringLength, numberOfStrings, numberOfTriples = struct.unpack_from("<IIII", payload)
+    offset = struct.calcsize("<IIII")
+    predicates = payload[offset:offset + predicateLength].decode("utf-8").split("\0")
+    offset += predicateLength
+    strings = payload[offset:offset + stringLength].decode("utf-8").split("\0") if numberOfStrings else []
+    offset += stringLength
+    subjects = array.array("I")
+    subjects.frombytes(payload[offset:offset + 4 * numberOfTriples])
+    offset += 4 * numberOfTriples
+    objects = array.array("I")
+    objects.frombytes(payload[offset:offset + 4 * numberOfTriples])
+    offset += 4 * numberOfTriples
+    predicateCodes = payload[offset:offset + numberOfTriples]
+    if sys.byteorder == "big":
+        subjects.byteswap()
+        objects.byteswap()
+    return [(strings[subj], predicates[pred], strings[obj]) for subj, pred, obj in zip(subjects, predicateCodes, objects)]
+
+def loadCachedTriples(pathToCache: str, cacheKey: str):
+    '''
+    Returns the cached statements for the key or None if there is no entry.
+    '''
+    pathToEntry = pathToCache + os.sep + cacheKey + CACHE_SUFFIX
+    if not os.path.isfile(pathToEntry):
+        return None
+    try:
+        with open(pathToEntry, "rb") as file:
+            triples = decodeTriples(file.read())
+    except (ValueError, zlib.error, struct.error, UnicodeDecodeError, IndexError):
+        # broken entries are treated like missing ones and rebuilt
+        os.remove(pathToEntry)
+        return None
+    # mark the entry as recently used for the eviction
+    os.utime(pathToEntry)
+    return triples
+
+def storeCachedTriples(pathToCache: str, cacheKey: str, triples: list, cacheSizeLimit: int):
+    # the processes of a parallel run can create the folder at the same time
+    os.makedirs(pathToCache, exist_ok=True)
+    pathToEntry = pathToCache + os.sep + cacheKey + CACHE_SUFFIX
+    pathToTemporaryEntry = pathToEntry + ".tmp"
+    with open(pathToTemporaryEntry, "wb") as file:
+        file.write(encodeTriples(triples))
+    os.replace(pathToTemporaryEntry, pathToEntry)
+    evictCache(pathToCache, cacheSizeLimit, keep=pathToEntry)
+
+def evictCache(pathToCache: str, cacheSizeLimit: int, keep: str = None):
+    '''
+    Removes the least recently used entries until the cache is smaller than
+    cacheSizeLimit (in bytes). The entry given by keep is never removed.
+    '''
+    entries = []
+    for fileName in os.listdir(pathToCache):
+        if fileName.endswith(CACHE_SUFFIX):
+            try:
+                stat = os.stat(pathToCache + os.sep + fileName)
+            except FileNotFoundError:
+                # removed by another process in the meantime
+                continue
+            entries.append((stat.st_mtime, stat.st_size, pathToCache + os.sep + fileName))
+    cacheSize = sum(entry[1] for entry in entries)
+    for mtime, size, pathToEntry in sorted(entries):
+        if cacheSize <= cacheSizeLimit:
+            break
+        if pathToEntry == keep:
+            continue
+        try:
+            os.remove(pathToEntry)
+        except FileNotFoundError:
+            pass
+        cacheSize -= size
+
+def clearCache(pathToCache: str):
+    if os.path.exists(pathToCache):
+        shutil.rmtree(pathToCache)
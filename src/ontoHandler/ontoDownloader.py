@@ -10,30 +10,26 @@
 #
 ##################################################
 import yaml
-import requests
 import os
 import errno
-import zipfile
 import sys
 import argparse as arg
+# the shared download engine is located next to this package in src/
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fileHandler.downloadEngine import downloadFile, downloadFiles
+from fileHandler.archiveExtractor import extractArchive
+from profiler.profiler import getProfiler, addProfilingArguments, startProfiling, finishProfiling
 
 
 def createFolder(pathToOntologiesFolder: str):
     if not os.path.exists(pathToOntologiesFolder):
         os.makedirs(pathToOntologiesFolder)
 
-def downloadOntology(pathToOntologiesFolder: str, ontologyURL: str) -> str:
+def downloadOntology(pathToOntologiesFolder: str, ontologyURL: str, checksum: str = None, size: int = None, pathToCache: str = None) -> str:
     fileName = ontologyURL.split("/")[-1]
     filePath = pathToOntologiesFolder + os.sep + fileName
     createFolder(pathToOntologiesFolder)
-    if not os.path.isfile(filePath):
-        with requests.get(ontologyURL,stream=True) as streamOfOntology:
-            streamOfOntology.raise_for_status()
-            with open(filePath, "wb") as file:
-                for chunk in streamOfOntology.iter_content():
-                    if chunk:
-                        file.write(chunk)
-    return filePath
+    return downloadFile(ontologyURL, filePath, checksum, size, pathToCache)
 
 def loadConfigYAML(pathToYAML: str) -> dict:
     with open(pathToYAML, "r") as file:
@@ -53,14 +49,28 @@ def main(nameOfRepository: str):
     configYAML = loadConfigYAML(pathToConfig)
     pathToOntologies = configYAML["config"]["environment"]["path_for_ontologies"]
     ontologies = configYAML["config"]["ontologies"]
+    pathToDownloadCache = configYAML["config"]["environment"]["path_for_download_cache"]
+    maxParallelDownloads = configYAML["config"]["environment"]["max_parallel_downloads"]
+    maxParallelExtractions = configYAML["config"]["environment"]["max_parallel_extractions"]
+    downloadCacheSizeLimit = configYAML["config"]["environment"]["download_cache_size_limit_MB"] * 1024 * 1024
     print("Started to download ontologies.\n\n")
+    createFolder(pathToOntologies)
+    downloads = []
     for key in ontologies.keys():
-        print(f"Started to download {key} ontology.\n")
-        ontologyPath = downloadOntology(pathToOntologies,ontologies[key]["URL"])
+        downloads.append({
+            "URL": ontologies[key]["URL"],
+            "target": pathToOntologies + os.sep + ontologies[key]["URL"].split("/")[-1],
+            "checksum": ontologies[key].get("checksum"),
+            "size": ontologies[key].get("size")
+        })
+    with getProfiler().stage("download ontologies", "download"):
+        ontologyPaths = downloadFiles(downloads, pathToDownloadCache, maxParallelDownloads, cacheSizeLimit=downloadCacheSizeLimit)
+    for key, ontologyPath in zip(ontologies.keys(), ontologyPaths):
         if ontologies[key]["format"]["zipped"]:
-            with zipfile.ZipFile(ontologyPath, "r") as zippedOntology:
-                zippedOntology.extractall(pathToOntologies)
-        print(f"Finished to download {key} ontology.\n\n")
+            # only the files read by ontoHandler, by default all files of the format of the ontology
+            with getProfiler().stage("unzip " + key, "extraction"):
+                extractArchive(ontologyPath, pathToOntologies, ontologies[key]["format"].get("members", ["*." + ontologies[key]["format"]["file_suffix"]]), maxWorkers=maxParallelExtractions)
+        print(f"Finished to download {key} ontology.\n")
     print("Finished to download ontologies.\n\n")
     return configYAML
 
@@ -70,5 +80,8 @@ if __name__ == '__main__':
         description='This piece of software downloads the ontologies used by the DZIF microbial OMICs database metadata schemes.',
         epilog='Written by Jannik Seidel (jannik.seidel@qbic.uni-tuebingen.de) and released under MIT License.')
     parser.add_argument("--repo", required=True, help="name of the top-level folder of this software (in which the README.md is located)",type=str)
+    addProfilingArguments(parser)
     args = parser.parse_args()
-    sys.exit(main(nameOfRepository=args.repo))
\ No newline at end of file
+    startProfiling(args, parser)
+    main(nameOfRepository=args.repo)
+    finishProfiling(args, "ontoDownloader")
\ No newline at end of file
@@ -10,55 +10,158 @@
 #   this script.
 #
 ##################################################
-from .ontoDownloader import main as ontoDownloader
+import os
 import sys
+# the profiler and the other shared packages are located next to this package in src/
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from .ontoDownloader import main as ontoDownloader
+from .owlStreamer import streamOwlTriples, PREDICATES_TO_KEEP, OBO_NAMESPACE
+from .ontoCache import getCacheKey, loadCachedTriples, storeCachedTriples, clearCache, getFileHash
+from .ontoReaders import READERS, readTriples
+from .schemeAssembler import getTermsToReplace, loadSchemeTemplate, indexPlaceholders, assembleScheme, writeScheme, getBlockPositions, getEnumNames
+from .vocabularyDiff import loadSnapshot, saveSnapshot, diffTerms, patchScheme, formatChangeReport
+from .schemeVariants import loadVariants, getEnumKey, mergeVariantEnums, getVariantIndexName
+from profiler.profiler import getProfiler, enableProfiler, runWithCProfile, addProfilingArguments, startProfiling, finishProfiling
+from vocabularyIndex.vocabularyIndex import VocabularyIndex
+from buildManifest.buildManifest import getFingerprint
+import json
 import glob
-import os
-import pandas as pd
-import rdflib
-import networkx as nx
 import re
 import argparse as arg
 import errno
 import shutil
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    # pandas is imported when the ROR csv is read
+    import pandas as pd
 
 
-def handlePandasDfRor(dataFrame: pd.DataFrame, termsToKeep: list) -> list:
-    DataFrameToKeep = dataFrame[termsToKeep].sort_values("name")
-    pandasToYAMLList = []
-    for ind,row in DataFrameToKeep.iterrows():
-        if "\'" in row["name"] and "\"" in row["name"]:
-            newKey = row["name"].replace("\"","")
-            pandasToYAMLList.append("      \"" + newKey + ", " + row["id"] + "\" :\n")
-            pandasToYAMLList.append("        text: \"" + newKey + ", " + row["id"] + "\"\n")
-            pandasToYAMLList.append("        meaning: \"" + row["id"] + "\"\n")
-        elif "\"" in row["name"]:
-
-            pandasToYAMLList.append("      \'" + row["name"] + ", " + row["id"] + "\' :\n")
-            pandasToYAMLList.append("        text: \'" + row["name"]  +  ", " + row["id"] + "\'\n")
-            pandasToYAMLList.append("        meaning: \"" + row["id"] + "\"\n")
-        elif "\'" in row["name"]:
-            pandasToYAMLList.append("      \"" + row["name"] + ", " + row["id"] + "\" :\n")
-            pandasToYAMLList.append("        text: \"" + row["name"]  + ", " + row["id"] + "\"\n")
-            pandasToYAMLList.append("        meaning: \"" + row["id"] + "\"\n")
-        else:
-            newKey = row["name"].replace("\\","/")
-            pandasToYAMLList.append("      \"" + newKey + ", " + row["id"] + "\" :\n")
-            pandasToYAMLList.append("        text: \"" + newKey  + ", " + row["id"] + "\"\n")
-            pandasToYAMLList.append("        meaning: \"" + row["id"] + "\"\n")
+def readFilteredCsv(filePath: str, columns: list, filteringColumn: str, filteringTerm: str, chunkSize: int = 200000) -> "pd.DataFrame":
+    '''
+    Reads only the given columns of a csv file and keeps the rows in which
+    filteringColumn equals filteringTerm. The file is read and filtered chunk by
+    chunk, so the memory usage is proportional to the filtered rows. The csv
+    reader of pyarrow is used if it is installed.
+    '''
+    # pandas, rdflib and numpy are imported when they are needed, which keeps the start of runs without changes fast
+    import pandas as pd
+    columnsToRead = list(dict.fromkeys(columns + [filteringColumn]))
+    filteredChunks = []
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+        import pyarrow.compute as pc
+    except ImportError:
+        pa = None
+    if pa is not None:
+        reader = pacsv.open_csv(
+            filePath,
+            read_options=pacsv.ReadOptions(block_size=16 * 1024 * 1024),
+            parse_options=pacsv.ParseOptions(newlines_in_values=True),
+            convert_options=pacsv.ConvertOptions(include_columns=columnsToRead, column_types={column: pa.string() for column in columnsToRead})
+        )
+        for batch in reader:
+            filteredBatch = batch.filter(pc.equal(batch.column(filteringColumn), str(filteringTerm)))
+            if filteredBatch.num_rows:
+                filteredChunks.append(filteredBatch.to_pandas())
+    else:
+        for chunk in pd.read_csv(filePath, usecols=columnsToRead, dtype=str, chunksize=chunkSize):
+            filteredChunk = chunk[chunk[filteringColumn] == str(filteringTerm)]
+            if len(filteredChunk):
+                filteredChunks.append(filteredChunk)
+    if not filteredChunks:
+        return pd.DataFrame(columns=columnsToRead, dtype=str)
+    return pd.concat(filteredChunks, ignore_index=True)
 
+def handlePandasDfRor(dataFrame: "pd.DataFrame", termsToKeep: list) -> list:
+    '''
+    Generates the YAML lines of the organizations, the quoting of every name
+    is chosen depending on the quotes it contains itself.
+    '''
+    import pandas as pd
+    DataFrameToKeep = dataFrame[termsToKeep].sort_values(["name", "id"], kind="stable")
+    names = DataFrameToKeep["name"]
+    ids = DataFrameToKeep["id"]
+    hasSingleQuote = names.str.contains("\'", regex=False)
+    hasDoubleQuote = names.str.contains("\"", regex=False)
+    # names with both kinds of quotes lose their double quotes, names without quotes their backslashes
+    keys = names.where(~(hasSingleQuote & hasDoubleQuote), names.str.replace("\"", "", regex=False))
+    keys = keys.where(hasSingleQuote | hasDoubleQuote, names.str.replace("\\", "/", regex=False))
+    # names with double quotes only are quoted with single quotes
+    quotes = pd.Series("\"", index=names.index).where(~(hasDoubleQuote & ~hasSingleQuote), "\'")
+    texts = quotes + keys + ", " + ids + quotes
+    keyLines = ("      " + texts + " :\n").tolist()
+    textLines = ("        text: " + texts + "\n").tolist()
+    meaningLines = ("        meaning: \"" + ids + "\"\n").tolist()
+    pandasToYAMLList = []
+    for lines in zip(keyLines, textLines, meaningLines):
+        pandasToYAMLList.extend(lines)
     return pandasToYAMLList
 
 def handleOntologyDictToYAMLList(dictionary: dict) -> list:
     dictionaryToYAMLList = []
+    # permissible values already written, a lookup in the list itself is quadratic
+    writtenValues = set()
     for key in dictionary.keys():
-        if "      \"" + dictionary[key]["label"] + " [" + dictionary[key]["id"] + "]\" :\n" in dictionaryToYAMLList:
+        permissibleValue = "      \"" + dictionary[key]["label"] + " [" + dictionary[key]["id"] + "]\" :\n"
+        if permissibleValue in writtenValues:
             continue
-        dictionaryToYAMLList.append("      \"" + dictionary[key]["label"] + " [" + dictionary[key]["id"] + "]\" :\n")
+        writtenValues.add(permissibleValue)
+        dictionaryToYAMLList.append(permissibleValue)
         dictionaryToYAMLList.append("        text: \"" + dictionary[key]["label"] + " [" + dictionary[key]["id"] + "]\"\n")
         dictionaryToYAMLList.append("        meaning: \"" + dictionary[key]["id"] + "\"\n")
     return dictionaryToYAMLList
 
+def getIndexEntries(enumName: str, terms: dict, organizations: bool = False) -> list:
+    '''
+    Returns the entries of the vocabulary index for the terms (id to label) of
+    an enum, with the permissible values written by handleOntologyDictToYAMLList
+    or, for organizations, by handlePandasDfRor.
+    '''
+    entries = []
+    if not organizations:
+        for termId, label in terms.items():
+            entries.append({"enum": enumName, "text": label + " [" + termId + "]", "id": termId, "label": label})
+        return entries
+    for label, termId in sorted((label, termId) for termId, label in terms.items()):
+        # the names are changed like in handlePandasDfRor
+        if "\'" in label and "\"" in label:
+            label = label.replace("\"", "")
+        elif "\'" not in label and "\"" not in label:
+            label = label.replace("\\", "/")
+        entries.append({"enum": enumName, "text": label + ", " + termId, "id": termId, "label": label})
+    return entries
+
+def buildVocabularyIndex(configYAML: dict, schemeLines: list, blocks: dict) -> VocabularyIndex:
+    '''
+    Builds the vocabulary index from the permissible values of the scheme
+    template and the terms of the inserted blocks, named like the enums their
+    placeholders are located in. The final scheme does not have to be parsed
+    for it, only the much smaller template.
+    '''
+    import yaml
+    ontologies = configYAML["config"]["ontologies"]
+    template = yaml.load("".join(schemeLines), Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+    enumEntries = {}
+    for entry in VocabularyIndex.fromScheme(template).entries:
+        enumEntries.setdefault(entry["enum"], []).append(entry)
+    for termToReplace, enumName in getEnumNames(schemeLines, list(blocks.keys())).items():
+        block = blocks[termToReplace]
+        if block["ontology"] is None:
+            continue
+        organizations = ontologies[block["ontology"]]["format"]["file_suffix"] == "csv"
+        enumEntries.setdefault(enumName, []).extend(getIndexEntries(enumName, block["terms"], organizations))
+    entries = []
+    for enumName, values in enumEntries.items():
+        # several placeholders of an enum can insert the same permissible value
+        writtenTexts = set()
+        for entry in values:
+            if entry["text"] not in writtenTexts:
+                writtenTexts.add(entry["text"])
+                entries.append(entry)
+    return VocabularyIndex(entries)
+
 def getPrefixesOwl(dictionary: dict) -> dict:
     prefixes = set()
     prefixDictionary = dict()
@@ -74,38 +177,53 @@ def getPrefixesOwl(dictionary: dict) -> dict:
             continue
     return prefixDictionary
 
-def getNodeByName(graph,name):
-    for node in graph.nodes():
-        if name == str(node):
-            return node
-    return None
+def extractOwlTriples(filePath: str, streaming: bool = False) -> list:
+    '''
+    Returns the id, label and subClassOf statements of an owl file.
+    With streaming the file is read incrementally and only the needed statements
+    are kept, otherwise the whole file is parsed into an rdflib graph first.
+    '''
+    if streaming:
+        return list(streamOwlTriples(filePath))
+    import rdflib
+    ontology = rdflib.Graph().parse(filePath, format="xml")
+    triples = []
+    for subj, pred, obj in ontology:    
+        if ('oboInOwl#id' in pred or 'rdf-schema#label' in pred or "rdf-schema#subClassOf" in pred) and ("http://purl.obolibrary.org/obo/" in subj or "http://purl.obolibrary.org/obo/" in obj):
+            triples.append((str(subj), str(pred), str(obj)))
+    # removing unnecessary nodes
+    pattern = re.compile(r"^N.{32}$")
+    return [triple for triple in triples if not (pattern.match(triple[0]) or pattern.match(triple[2]))]
 
-def insertYamlListByTerm(yamlList: list, termToReplace: str, pathToSchemes: str, pathToFinalSchemes: str, nameOfSchemesFile: str):
-    if os.path.exists(pathToFinalSchemes) == False:
-        os.mkdir(pathToFinalSchemes)
-        
-    pathOld = pathToSchemes + os.sep + nameOfSchemesFile
-    pathNew = pathToFinalSchemes + os.sep + nameOfSchemesFile
-    if os.path.isfile(pathNew) == False:
-        file = open(pathOld, "r")
-        fileRead = file.readlines()
-        file.close()
-        if termToReplace in fileRead:
-            index = fileRead.index(termToReplace)
-            listOut = fileRead[:index] + yamlList + fileRead[index+1:]
-            with open(pathNew,"w") as outfile:
-                for entry in listOut:
-                    outfile.write(entry)
-    else:
-        file = open(pathNew, "r")
-        fileRead = file.readlines()
-        file.close()
-        if termToReplace in fileRead:
-            index = fileRead.index(termToReplace)
-            listOut = fileRead[:index] + yamlList + fileRead[index+1:]
-            with open(pathNew,"w") as outfile:
-                for entry in listOut:
-                    outfile.write(entry)
+def extractTriples(filePath: str, fileSuffix: str, streaming: bool = False) -> list:
+    '''
+    Returns the label and subClassOf statements of an ontology file with the
+    reader of its format (owl, obo, OBO Graphs json or a term table).
+    '''
+    if fileSuffix == "owl":
+        return extractOwlTriples(filePath, streaming)
+    return readTriples(filePath, fileSuffix)
+
+def loadOntologyTriples(filePath: str, fileSuffix: str = "owl", streaming: bool = False, pathToCache: str = None, cacheSizeLimit: int = 0) -> list:
+    '''
+    Returns the label and subClassOf statements of an ontology file. If
+    pathToCache is given, the statements are looked up in the cache by the
+    content hash of the file first and stored there after parsing.
+    '''
+    triples = None
+    if pathToCache is not None:
+        extractionSettings = {"predicates": ",".join(PREDICATES_TO_KEEP), "namespace": OBO_NAMESPACE}
+        if fileSuffix == "owl":
+            extractionSettings["streaming"] = streaming
+        else:
+            extractionSettings["reader"] = fileSuffix
+        cacheKey = getCacheKey(filePath, extractionSettings)
+        triples = loadCachedTriples(pathToCache, cacheKey)
+    if triples is None:
+        triples = extractTriples(filePath, fileSuffix, streaming)
+        if pathToCache is not None:
+            storeCachedTriples(pathToCache, cacheKey, triples, cacheSizeLimit)
+    return triples
 
 def prefixDictToYamlList(prefixDict: dict) -> list:
     yamlList = []
@@ -115,14 +233,257 @@ def prefixDictToYamlList(prefixDict: dict) -> list:
     yamlList.sort()
     return yamlList
 
-def main(nameOfRepository: str):
+def getOntologyFiles(key: str, ontology: dict, pathToOntologies: str) -> list:
+    '''
+    Returns the files the controlled vocabularies of an ontology are extracted from.
+    '''
+    lowerKey = key.lower()
+    if ontology["format"]["file_suffix"] == "csv":
+        return [filePath for filePath in sorted(glob.glob(pathToOntologies + os.sep + "*.csv")) if lowerKey in os.path.basename(filePath)]
+    return [pathToOntologies + os.sep + lowerKey + "." + ontology["format"]["file_suffix"]]
+
+def getOntologyFingerprint(key: str, ontology: dict, pathToOntologies: str) -> str:
+    '''
+    Fingerprint of the config entry and the content of the files of an ontology,
+    changes with every new version of the ontology.
+    '''
+    return getFingerprint({"config": ontology, "files": {os.path.basename(filePath): getFileHash(filePath) for filePath in getOntologyFiles(key, ontology, pathToOntologies)}})
+
+def loadHierarchy(key: str, ontology: dict, pathToOntologies: str, streaming: bool = False, pathToCache: str = None, cacheSizeLimit: int = 0):
+    '''
+    Parses an ontology (any format but csv) and returns the index of its
+    subClassOf hierarchy.
+    '''
+    from .hierarchyIndex import HierarchyIndex
+    profiler = getProfiler()
+    fileSuffix = ontology["format"]["file_suffix"]
+    filePath = pathToOntologies + os.sep + key.lower() + "." + fileSuffix
+    with profiler.stage("parse " + key, "ontology") as record:
+        triples = loadOntologyTriples(filePath, fileSuffix, streaming, pathToCache, cacheSizeLimit)
+        record["counters"]["triples"] = len(triples)
+    # indexing the subClassOf hierarchy
+    with profiler.stage("hierarchy " + key, "ontology") as record:
+        hierarchy = HierarchyIndex.fromTriples(triples)
+        record["counters"]["terms"] = len(hierarchy.terms)
+    return hierarchy
+
+def extractEnums(key: str, enums: dict, hierarchy) -> list:
+    '''
+    Extracts the enums (name to config entry) of an ontology from the index of
+    its hierarchy. Returns the results in the layout of processOntology.
+    '''
+    profiler = getProfiler()
+    enumResults = []
+    # extracting the terms descending from the roots of all enums in one traversal
+    with profiler.stage("descendants " + key, "ontology") as record:
+        rootIds = [hierarchy.getTermId(enums[entry]["descending_from"]) for entry in enums]
+        descendants = hierarchy.descendantsOf(rootIds)
+        record["counters"]["roots"] = len(rootIds)
+    for entry, rootId, descendantIds in zip(enums, rootIds, descendants):
+        with profiler.stage("enum " + key + "/" + entry, "enum") as record:
+            sortedInsertionDictionary = hierarchy.getEnumTerms(rootId, descendantIds)
+            yamlList = handleOntologyDictToYAMLList(sortedInsertionDictionary)
+            prefixesLocal = getPrefixesOwl(sortedInsertionDictionary)
+            record["counters"]["terms"] = len(sortedInsertionDictionary)
+        terms = {term["id"]: term["label"] for term in sortedInsertionDictionary.values()}
+        enumResults.append((entry, enums[entry]["term_to_replace"], yamlList, prefixesLocal, terms))
+    return enumResults
+
+def extractCsvEnums(key: str, ontology: dict, pathToOntologies: str) -> list:
+    '''
+    Extracts the organizations of the ROR csv for every enum of the ontology,
+    each with its own filter. Returns the results in the layout of
+    processOntology.
+    '''
+    profiler = getProfiler()
+    enumResults = []
+    for filePath in getOntologyFiles(key, ontology, pathToOntologies):
+        for entry, enum in ontology["enum"].items():
+            if not all(setting in enum for setting in ["filtering_column", "filtering_term", "terms_to_include"]):
+                raise KeyError(key + "/" + entry + " needs filtering_column, filtering_term and terms_to_include to be covered by ontoHandler.py")
+            with profiler.stage("enum " + key + "/" + entry, "enum") as record:
+                dfFiltered = readFilteredCsv(filePath, enum["terms_to_include"], enum["filtering_column"], enum["filtering_term"])
+                yamlList = handlePandasDfRor(dfFiltered, enum["terms_to_include"])
+                record["counters"]["terms"] = len(dfFiltered)
+            terms = dict(zip(dfFiltered["id"].tolist(), dfFiltered["name"].tolist()))
+            enumResults.append((entry, enum["term_to_replace"], yamlList, {}, terms))
+    return enumResults
+
+def processOntology(key: str, ontology: dict, pathToOntologies: str, streaming: bool = False, pathToCache: str = None, cacheSizeLimit: int = 0) -> list:
+    '''
+    Extracts the controlled vocabularies of a single ontology from the config.
+    Returns a list with the name of the enum, the term to replace, the YAML
+    lines, the prefixes and the terms (id to label) of every enum of the
+    ontology. Does not change the working directory, so it can be run in a
+    separate process.
+    '''
+    fileSuffix = ontology["format"]["file_suffix"]
+    if fileSuffix == "owl" or fileSuffix in READERS:
+        # processing of the subClassOf hierarchy, all formats give the same statements
+        hierarchy = loadHierarchy(key, ontology, pathToOntologies, streaming, pathToCache, cacheSizeLimit)
+        return extractEnums(key, ontology["enum"], hierarchy)
+    if fileSuffix == "csv":
+        return extractCsvEnums(key, ontology, pathToOntologies)
+    raise KeyError(key + " has the file suffix " + fileSuffix + ", use one of owl, csv, " + ", ".join(READERS.keys()))
+
+def profileOntology(key: str, *args, **kwargs) -> list:
+    '''
+    Runs processOntology within a stage of the profiler and, if requested, under
+    cProfile. Returns the results of processOntology.
+    '''
+    profiler = getProfiler()
+    with profiler.stage("ontology " + key, "ontology"):
+        if profiler.pathToCProfile is not None:
+            return runWithCProfile(profiler.pathToCProfile + os.sep + key + ".prof", processOntology, key, *args, **kwargs)
+        return processOntology(key, *args, **kwargs)
+
+def profileOntologyInWorker(pathToCProfile: str, key: str, *args, **kwargs) -> tuple:
+    '''
+    Profiles processOntology in a worker process and returns its results together
+    with the records of the worker, which are merged by the main process.
+    '''
+    profiler = enableProfiler(pathToCProfile)
+    return profileOntology(key, *args, **kwargs), profiler.records
+
+def processOntologies(keysToProcess: list, ontologies: dict, pathToOntologies: str, streaming: bool = False, pathToCache: str = None, cacheSizeLimit: int = 0, jobs: int = 1) -> list:
+    '''
+    Runs processOntology for the ontologies in keysToProcess, with jobs > 1 in
+    that many processes. Returns the results in the order of keysToProcess.
+    '''
+    profiler = getProfiler()
+    if jobs > 1 and profiler.enabled:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(profileOntologyInWorker, profiler.pathToCProfile, key, ontologies[key], pathToOntologies, streaming, pathToCache, cacheSizeLimit) for key in keysToProcess]
+            results = []
+            for future in futures:
+                enumResults, records = future.result()
+                results.append(enumResults)
+                profiler.merge(records)
+        return results
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(processOntology, key, ontologies[key], pathToOntologies, streaming, pathToCache, cacheSizeLimit) for key in keysToProcess]
+            return [future.result() for future in futures]
+    if profiler.enabled:
+        return [profileOntology(key, ontologies[key], pathToOntologies, streaming, pathToCache, cacheSizeLimit) for key in keysToProcess]
+    return [processOntology(key, ontologies[key], pathToOntologies, streaming, pathToCache, cacheSizeLimit) for key in keysToProcess]
+
+def collectPrefixes(configYAML: dict, blocks: dict) -> dict:
+    '''
+    Returns the prefixes of the enums in blocks in the order of the config,
+    the first ontology defining a prefix wins.
+    '''
+    prefixDictionary = dict()
+    for termToReplace in getTermsToReplace(configYAML):
+        if termToReplace in blocks:
+            prefixesLocal = blocks[termToReplace]["prefixes"]
+            for prefixKey in prefixesLocal.keys():
+                if prefixKey not in prefixDictionary.keys():
+                    prefixDictionary[prefixKey] = prefixesLocal[prefixKey]
+    return prefixDictionary
+
+def buildVariants(nameOfRepository: str, variants: list, streaming: bool = False, useCache: bool = True, resetCache: bool = False, jobs: int = 1, configYAML: dict = None) -> list:
+    '''
+    Builds several variants of the final scheme (scheme templates in the
+    schemes folder or config profiles) in one run. Every ontology is parsed
+    once and every enum is extracted once per root, even if several variants
+    (or placeholders) use it. Returns the names of the final schemes. Pass
+    configYAML if the ontologies of the config are downloaded already.
+    '''
+    if configYAML is None:
+        configYAML = ontoDownloader(nameOfRepository)
+    environment = configYAML["config"]["environment"]
+    pathToOntologies = environment["path_for_ontologies"]
+    getCurrentWorkingDirectory = os.getcwd()
+    print(f"Started to enter the controlled vocabularies into {len(variants)} metadata schemes.\n")
+    if not nameOfRepository in getCurrentWorkingDirectory:
+        raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), nameOfRepository)
+    else:
+        pathToParent = getCurrentWorkingDirectory.split(nameOfRepository)[0]
+        pathToWorkingDirectory = pathToParent + nameOfRepository + os.sep
+    variantConfigs = loadVariants(configYAML, variants, pathToWorkingDirectory)
+    pathToCache = pathToWorkingDirectory + environment["path_for_cache"]
+    if resetCache:
+        clearCache(pathToCache)
+    if not useCache:
+        pathToCache = None
+    pathToFinalSchemes = pathToWorkingDirectory + environment["path_for_final_schemes"]
+    if os.path.exists(pathToFinalSchemes):
+        shutil.rmtree(pathToFinalSchemes)
+
+    # extract the distinct enums of all variants
+    mergedOntologies = mergeVariantEnums(variantConfigs)
+    keysToProcess = list(mergedOntologies.keys())
+    results = processOntologies(keysToProcess, mergedOntologies, pathToWorkingDirectory + pathToOntologies, streaming, pathToCache, environment["cache_size_limit_MB"] * 1024 * 1024, jobs)
+    enumBlocks = {}
+    for key, enumResults in zip(keysToProcess, results):
+        for entry, termToReplace, yamlList, prefixesLocal, terms in enumResults:
+            enumBlocks.setdefault(mergedOntologies[key]["enumKeys"][entry], {"ontology": key, "yaml": yamlList, "prefixes": prefixesLocal, "terms": terms})
+    print(f"Extracted {len(enumBlocks)} distinct enums for the placeholders of all variants.\n")
+
+    # render every variant from the extracted enums
+    os.chdir(pathToWorkingDirectory)
+    profiler = getProfiler()
+    namesOfSchemesFiles = []
+    for variantConfig in variantConfigs:
+        nameOfSchemesFile = variantConfig["config"]["environment"]["name_of_schemes_file"]
+        with profiler.stage("assemble scheme " + nameOfSchemesFile, "scheme") as record:
+            yamlBlocks = {}
+            blocks = {}
+            for key, ontology in variantConfig["config"]["ontologies"].items():
+                for entry, enum in ontology["enum"].items():
+                    enumBlock = enumBlocks.get(getEnumKey(key, enum))
+                    if enumBlock is None:
+                        raise KeyError(key + "/" + entry + " of the variant " + nameOfSchemesFile + " was not extracted")
+                    if enum["term_to_replace"] not in blocks:
+                        yamlBlocks[enum["term_to_replace"]] = enumBlock["yaml"]
+                        blocks[enum["term_to_replace"]] = enumBlock
+            prefixTerm = variantConfig["config"]["prefixes_controlled_vocabularies"]["term_to_replace"]
+            yamlBlocks[prefixTerm] = prefixDictToYamlList(collectPrefixes(variantConfig, blocks))
+            schemeLines = loadSchemeTemplate(pathToWorkingDirectory + environment["path_for_schemes"] + os.sep + nameOfSchemesFile)
+            placeholderIndex = indexPlaceholders(schemeLines, getTermsToReplace(variantConfig), nameOfSchemesFile)
+            writeScheme(pathToFinalSchemes, nameOfSchemesFile, assembleScheme(schemeLines, placeholderIndex, yamlBlocks))
+            record["counters"]["lines"] = len(schemeLines) + sum(len(block) for block in yamlBlocks.values())
+        with profiler.stage("vocabulary index " + nameOfSchemesFile, "scheme") as record:
+            vocabularyIndex = buildVocabularyIndex(variantConfig, schemeLines, blocks)
+            vocabularyIndex.save(pathToFinalSchemes + os.sep + getVariantIndexName(configYAML, nameOfSchemesFile))
+            record["counters"]["terms"] = len(vocabularyIndex.entries)
+        namesOfSchemesFiles.append(nameOfSchemesFile)
+        print(f"Finished {environment['path_for_final_schemes'] + os.sep + nameOfSchemesFile}.\n")
+    print("Finished to enter the controlled vocabularies into schemes.\n\n")
+    return namesOfSchemesFiles
+
+def checkSnapshot(snapshot: dict, pathToFinalScheme: str, termsToReplace: list) -> str:
+    '''
+    Returns the reason why the final scheme can not be patched with the changes
+    of the ontologies or None if it can be patched.
+    '''
+    if snapshot is None or not os.path.isfile(pathToFinalScheme):
+        return "no final scheme with a vocabulary snapshot exists"
+    if snapshot["scheme"] != getFileHash(pathToFinalScheme):
+        return "the final scheme was changed after it was built"
+    if set(snapshot["blocks"].keys()) != set(termsToReplace):
+        return "the placeholders of the config changed"
+    return None
+
+def main(nameOfRepository: str, streaming: bool = False, useCache: bool = True, resetCache: bool = False, jobs: int = 1, diff: bool = False, configYAML: dict = None):
     '''
     Provide the name of the parent folder of src/ to this function to run the 
     download of the ontologies used for the controlled vocabularies in the 
-    metadata schemes and insert them into the schemes. 
+    metadata schemes and insert them into the schemes. Set streaming to read
+    the owl files incrementally instead of parsing them with rdflib. The
+    statements extracted from the owl files are kept in the cache folder unless
+    useCache is disabled, resetCache empties the cache before the run. With
+    jobs > 1 the ontologies are processed in parallel by that many processes.
+    With diff only the ontologies which changed since the last run are
+    extracted again, their changes are reported and only the changed enums
+    are replaced in the existing final scheme. The download is skipped if the
+    configYAML of the already downloaded ontologies is passed.
     '''
-    configYAML = ontoDownloader(nameOfRepository)
-    pathToOntologies = configYAML["config"]["environment"]["path_for_ontologies"]
+    if configYAML is None:
+        configYAML = ontoDownloader(nameOfRepository)
+    environment = configYAML["config"]["environment"]
+    pathToOntologies = environment["path_for_ontologies"]
     getCurrentWorkingDirectory = os.getcwd()
     print("Started to enter the controlled vocabularies into metadata scheme.\n")
     if not nameOfRepository in getCurrentWorkingDirectory:
@@ -130,101 +491,140 @@ def main(nameOfRepository: str):
     else:
         pathToParent = getCurrentWorkingDirectory.split(nameOfRepository)[0]
         pathToWorkingDirectory = pathToParent + nameOfRepository + os.sep
-    os.chdir(pathToWorkingDirectory + pathToOntologies)
     ontologies = configYAML["config"]["ontologies"]
-    prefixDictionary = dict()
+    pathToCache = pathToWorkingDirectory + environment["path_for_cache"]
+    cacheSizeLimit = environment["cache_size_limit_MB"] * 1024 * 1024
+    if resetCache:
+        clearCache(pathToCache)
+    if not useCache:
+        pathToCache = None
 
-    # clean environment if script was already executed before
-    pathToFinalSchemes = configYAML["config"]["environment"]["path_for_final_schemes"]
-    if os.path.exists(pathToFinalSchemes):
-        shutil.rmtree(pathToFinalSchemes)
+    nameOfSchemesFile = environment["name_of_schemes_file"]
+    pathToTemplate = pathToWorkingDirectory + environment["path_for_schemes"] + os.sep + nameOfSchemesFile
+    pathToFinalSchemes = pathToWorkingDirectory + environment["path_for_final_schemes"]
+    pathToFinalScheme = pathToFinalSchemes + os.sep + nameOfSchemesFile
+    pathToSnapshot = pathToFinalSchemes + os.sep + environment["name_of_vocabulary_snapshot"]
+    termsToReplace = getTermsToReplace(configYAML)
+    prefixTerm = configYAML["config"]["prefixes_controlled_vocabularies"]["term_to_replace"]
+    templateHash = getFileHash(pathToTemplate)
+    fingerprints = {key: getOntologyFingerprint(key, ontologies[key], pathToWorkingDirectory + pathToOntologies) for key in ontologies.keys()}
+    snapshot = None
+    if diff:
+        snapshot = loadSnapshot(pathToSnapshot)
+        reason = checkSnapshot(snapshot, pathToFinalScheme, termsToReplace)
+        if reason is not None:
+            print(f"Building the complete scheme, as {reason}.\n")
+            diff = False
+    if diff:
+        keysToProcess = [key for key in ontologies.keys() if snapshot["ontologies"].get(key) != fingerprints[key]]
+    else:
+        keysToProcess = list(ontologies.keys())
+        # clean environment if script was already executed before
+        if os.path.exists(pathToFinalSchemes):
+            shutil.rmtree(pathToFinalSchemes)
+
+    # extract the controlled vocabularies, each ontology can be handled by its own process
+    profiler = getProfiler()
+    results = processOntologies(keysToProcess, ontologies, pathToWorkingDirectory + pathToOntologies, streaming, pathToCache, cacheSizeLimit, jobs)
 
-    # run the insertion of controlled vocabularies into the schemes
-    for key in ontologies.keys():
-        lowerKey = key.lower()
-        if ontologies[key]["format"]["file_suffix"] == "owl":
-            # processing of the owl graph
-            filePath = lowerKey + "." + ontologies[key]["format"]["file_suffix"]
-            # parsing to networkx graph
-            ontology = rdflib.Graph().parse(filePath, format="xml")
-            G = nx.DiGraph()
-            for subj, pred, obj in ontology:    
-                if ('oboInOwl#id' in pred or 'rdf-schema#label' in pred or "rdf-schema#subClassOf" in pred) and ("http://purl.obolibrary.org/obo/" in subj or "http://purl.obolibrary.org/obo/" in obj):
-                    G.add_edge(subj, obj, predicate=pred)
-            # removing unnecessary nodes
-            nodesToRemove = []
-            for node in G.nodes():
-                pattern = r"^N.{32}$"
-                if bool(re.match(pattern,node)):
-                    nodesToRemove.append(node)
-            for node in nodesToRemove:
-                G.remove_node(node)
-
-            # extracting subgraphs for a specific controlled vocabulary and inserting it into the schemes
-            for entry in ontologies[key]["enum"]:
-                descendingFromNode = getNodeByName(G,ontologies[key]["enum"][entry]["descending_from"])
-                graphNodesPointingTowardsDescendingFromNode = nx.ancestors(G,descendingFromNode)
-                finalGraphNodes = set()
-                for node in graphNodesPointingTowardsDescendingFromNode:
-                    finalGraphNodes.update([node])
-                    finalGraphNodes.update(G.predecessors(node))
-                    finalGraphNodes.update(G.successors(node))
-                insertionDictionary = {}
-                for node in finalGraphNodes:
-                    allConnectedNodesOfNode = nx.all_neighbors(G,node)
-                    for connectedNode in allConnectedNodesOfNode:
-                        edgeData = G.get_edge_data(node,connectedNode)
-                        if edgeData != None:
-                            if str(node) not in insertionDictionary.keys():
-                                insertionDictionary[str(node)] = {}
-                                insertionDictionary[str(node)].update({"id":str(node).split("/")[-1].replace("_",":")})
-                            if "#label" in edgeData["predicate"]:
-                                insertionDictionary[str(node)].update({"label":str(connectedNode)})
-                sortedInsertionDictionary = dict(sorted(insertionDictionary.items(), key=lambda item: item[1]["label"]))
-                del sortedInsertionDictionary[str(descendingFromNode)]
-                yamlList = handleOntologyDictToYAMLList(sortedInsertionDictionary)
-
-                # generation of prefix list for prefixes at the top of the linkML schemes
-                prefixesLocal = getPrefixesOwl(sortedInsertionDictionary)
-                for prefixKey in prefixesLocal.keys():
-                    if prefixKey not in prefixDictionary.keys():
-                        prefixDictionary[prefixKey] = prefixesLocal[prefixKey]
-                os.chdir(pathToWorkingDirectory)
-                insertYamlListByTerm(yamlList,ontologies[key]["enum"][entry]["term_to_replace"],configYAML["config"]["environment"]["path_for_schemes"],configYAML["config"]["environment"]["path_for_final_schemes"],configYAML["config"]["environment"]["name_of_schemes_file"])
-                os.chdir(pathToWorkingDirectory + pathToOntologies)
-
-        elif ontologies[key]["format"]["file_suffix"] == "csv":
-            fileList = glob.glob("*.csv")
-            for entry in fileList:
-                if lowerKey in entry:
-                    df = pd.read_csv(entry)
-                    if "coll_by_enum" in ontologies[key]["enum"]:
-                        filteringColumn = ontologies[key]["enum"]["coll_by_enum"]["filtering_column"]
-                        filteringTerm = ontologies[key]["enum"]["coll_by_enum"]["filtering_term"]
-                        termsToInclude = ontologies[key]["enum"]["coll_by_enum"]["terms_to_include"]
-                    else:
-                        raise KeyError(key + " is not yet covered by ontoHandler.py")
-                    dfFiltered = df[ 
-                        df[
-                            filteringColumn
-                        ] 
-                        == 
-                        filteringTerm
-                    ]
-                    yamlList = handlePandasDfRor(dfFiltered, termsToInclude)
-                    os.chdir(pathToWorkingDirectory)
-                    insertYamlListByTerm(yamlList,ontologies[key]["enum"]["coll_by_enum"]["term_to_replace"],configYAML["config"]["environment"]["path_for_schemes"],configYAML["config"]["environment"]["path_for_final_schemes"],configYAML["config"]["environment"]["name_of_schemes_file"])
-                    os.chdir(pathToWorkingDirectory + pathToOntologies)
-    yamlList = prefixDictToYamlList(prefixDictionary)
+    # collect the controlled vocabularies, the blocks of unchanged ontologies are taken from the snapshot
     os.chdir(pathToWorkingDirectory)
-    insertYamlListByTerm(yamlList,configYAML["config"]["prefixes_controlled_vocabularies"]["term_to_replace"],configYAML["config"]["environment"]["path_for_schemes"],configYAML["config"]["environment"]["path_for_final_schemes"],configYAML["config"]["environment"]["name_of_schemes_file"])
-    os.chdir(pathToWorkingDirectory + pathToOntologies)
+    yamlBlocks = {}
+    blocks = {}
+    for key, enumResults in zip(keysToProcess, results):
+        for entry, termToReplace, yamlList, prefixesLocal, terms in enumResults:
+            if termToReplace not in blocks:
+                yamlBlocks[termToReplace] = yamlList
+                blocks[termToReplace] = {"ontology": key, "enum": entry, "prefixes": prefixesLocal, "terms": terms}
+    if diff:
+        for termToReplace, block in snapshot["blocks"].items():
+            if termToReplace != prefixTerm and block["ontology"] not in keysToProcess:
+                blocks[termToReplace] = block
+    # generation of prefix list for prefixes at the top of the linkML schemes, in the order of the config
+    yamlBlocks[prefixTerm] = prefixDictToYamlList(collectPrefixes(configYAML, blocks))
+    blocks[prefixTerm] = {"ontology": None, "enum": None, "prefixes": {}, "terms": {}}
+
+    if diff:
+        # replace only the changed blocks of the existing final scheme
+        with profiler.stage("patch scheme", "scheme") as record:
+            finalLines = loadSchemeTemplate(pathToFinalScheme)
+            blockPositions = {termToReplace: tuple(block["position"]) for termToReplace, block in snapshot["blocks"].items()}
+            changes = []
+            replacements = {}
+            for termToReplace, yamlList in yamlBlocks.items():
+                start, length = blockPositions[termToReplace]
+                if finalLines[start:start + length] != yamlList:
+                    replacements[termToReplace] = yamlList
+                block = blocks[termToReplace]
+                if termToReplace != prefixTerm:
+                    change = diffTerms(snapshot["blocks"][termToReplace]["terms"], block["terms"])
+                    changes.append(dict({"ontology": block["ontology"], "enum": block["enum"]}, **change))
+            if snapshot["template"] == templateHash:
+                schemeLines, positions = patchScheme(finalLines, blockPositions, replacements)
+                writeScheme(pathToFinalSchemes, nameOfSchemesFile, schemeLines)
+            else:
+                # the template changed (e.g. the version of the scheme), the unchanged blocks are taken from the final scheme
+                for termToReplace, (start, length) in blockPositions.items():
+                    yamlBlocks.setdefault(termToReplace, finalLines[start:start + length])
+                schemeLines = loadSchemeTemplate(pathToTemplate)
+                placeholderIndex = indexPlaceholders(schemeLines, termsToReplace, nameOfSchemesFile)
+                writeScheme(pathToFinalSchemes, nameOfSchemesFile, assembleScheme(schemeLines, placeholderIndex, yamlBlocks))
+                positions = getBlockPositions(placeholderIndex, yamlBlocks)
+            record["counters"]["replaced_blocks"] = len(replacements)
+        with open(pathToFinalSchemes + os.sep + environment["name_of_change_report"], "w") as file:
+            json.dump({"ontologies": keysToProcess, "versions": {key: ontologies[key].get("version") for key in keysToProcess}, "changes": changes}, file, indent=2)
+        print("Changes of the controlled vocabularies:\n  " + "\n  ".join(formatChangeReport(changes) or ["none"]) + "\n")
+        print(f"Replaced {len(replacements)} blocks of the final scheme, the complete change report is located at {environment['path_for_final_schemes'] + os.sep + environment['name_of_change_report']}.\n")
+    else:
+        # insert all controlled vocabularies into the scheme and write it at once
+        with profiler.stage("assemble scheme", "scheme") as record:
+            schemeLines = loadSchemeTemplate(pathToTemplate)
+            placeholderIndex = indexPlaceholders(schemeLines, termsToReplace, nameOfSchemesFile)
+            writeScheme(pathToFinalSchemes, nameOfSchemesFile, assembleScheme(schemeLines, placeholderIndex, yamlBlocks))
+            positions = getBlockPositions(placeholderIndex, yamlBlocks)
+            record["counters"]["lines"] = len(schemeLines) + sum(len(block) for block in yamlBlocks.values())
+
+    # record the inserted blocks, so the next run with diff can patch the final scheme
+    if set(positions.keys()) == set(termsToReplace):
+        for termToReplace, position in positions.items():
+            blocks[termToReplace]["position"] = position
+        saveSnapshot(pathToSnapshot, {"scheme": getFileHash(pathToFinalScheme), "template": templateHash, "ontologies": fingerprints, "blocks": {termToReplace: blocks[termToReplace] for termToReplace in positions.keys()}})
+    elif os.path.exists(pathToSnapshot):
+        os.remove(pathToSnapshot)
+
+    # index the terms of the controlled vocabularies for lookups without parsing the scheme
+    with profiler.stage("vocabulary index", "scheme") as record:
+        vocabularyIndex = buildVocabularyIndex(configYAML, loadSchemeTemplate(pathToTemplate), blocks)
+        vocabularyIndex.save(pathToFinalSchemes + os.sep + environment["name_of_vocabulary_index"])
+        record["counters"]["terms"] = len(vocabularyIndex.entries)
     print("Finished to enter the controlled vocabularies into scheme.\n\n")
+
 if __name__ == '__main__':
     parser = arg.ArgumentParser(
         prog='DZIF microbial OMICs Database Ontology Handler',
         description='This piece of software creates the final metadata scheme in LinkML which can be used by the DZIFDataHarmonizer to collect and validate Metadata.',
         epilog='Written by Jannik Seidel (jannik.seidel@qbic.uni-tuebingen.de) and released under MIT License.')
     parser.add_argument("--repo", required=True, help="name of the top-level folder of this software (in which the README.md is located)",type=str)
+    parser.add_argument("--streaming", action="store_true", help="read the owl files incrementally and only keep the statements needed for the controlled vocabularies instead of parsing them with rdflib")
+    parser.add_argument("--no-cache", action="store_true", help="do not use the cache of already parsed ontologies")
+    parser.add_argument("--clear-cache", action="store_true", help="empty the cache of already parsed ontologies before the run")
+    parser.add_argument("--jobs", default=1, help="number of processes used to handle the ontologies in parallel", type=int)
+    parser.add_argument("--diff", action="store_true", help="only extract the ontologies which changed since the last run, report the changed terms and patch them into the existing final scheme")
+    parser.add_argument("--watch", action="store_true", help="keep running, keep the parsed ontologies in memory and render the final scheme again whenever the scheme template, the config or an ontology file changes")
+    parser.add_argument("--interval", default=0.1, help="seconds between the checks for changes in the watch mode (without watchdog)", type=float)
+    parser.add_argument("--variants", nargs="+", metavar="VARIANT", help="build these variants of the scheme (scheme templates in the schemes folder or config profiles) from one extraction of the ontologies")
+    addProfilingArguments(parser)
     args = parser.parse_args()
-    sys.exit(main(nameOfRepository=args.repo))
\ No newline at end of file
+    if args.watch and (args.variants or args.diff or args.jobs != 1 or args.clear_cache):
+        parser.error("--watch can not be combined with --variants, --diff, --jobs or --clear-cache")
+    if args.variants and args.diff:
+        parser.error("--variants can not be combined with --diff")
+    startProfiling(args, parser)
+    if args.watch:
+        from .schemeWatcher import watch
+        watch(nameOfRepository=args.repo, streaming=args.streaming, useCache=not args.no_cache, interval=args.interval)
+    elif args.variants:
+        buildVariants(nameOfRepository=args.repo, variants=args.variants, streaming=args.streaming, useCache=not args.no_cache, resetCache=args.clear_cache, jobs=args.jobs)
+    else:
+        main(nameOfRepository=args.repo, streaming=args.streaming, useCache=not args.no_cache, resetCache=args.clear_cache, jobs=args.jobs, diff=args.diff)
+    finishProfiling(args, "ontoHandler")
\ No newline at end of file
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+#
+#   Date:   18.10.2026
+#
+#   Readers for the OBO flat file format, OBO Graphs
+#   JSON and pre-extracted term tables, which return
+#   the same label and subClassOf statements as the
+#   owl readers at a fraction of the parsing time.
+#
+##################################################
+import argparse as arg
+import csv
+import json
+import re
+from .owlStreamer import streamOwlTriples, keepStatement, OBO_NAMESPACE, PREDICATE_LABEL, PREDICATE_SUBCLASS_OF
+
+OBO_ESCAPES = {"n": "\n", "t": "\t", "W": " "}
+OBO_ESCAPE_PATTERN = re.compile(r"\\(.)")
+# an unescaped "!" starts a comment
+OBO_COMMENT_PATTERN = re.compile(r"(?<!\\)\s!(?:\s.*)?$")
+# unescaped trailing modifiers in braces (e.g. {source="..."}) are no part of the value either
+OBO_MODIFIER_PATTERN = re.compile(r"(?<!\\)\{(?:[^\\{}]|\\.)*\}$")
+TERM_TABLE_COLUMNS = ["id", "label", "parents"]
+TERM_TABLE_SEPARATOR = "|"
+
+
+def curieToIRI(curie: str) -> str:
+    '''
+    Expands an OBO id (e.g. DOID:4) to its IRI, ids which already are IRIs
+    are kept.
+    '''
+    if curie.startswith("http://") or curie.startswith("https://"):
+        return curie
+    prefix, _, localId = curie.partition(":")
+    return OBO_NAMESPACE + prefix + "_" + localId
+
+def unescapeOboValue(value: str) -> str:
+    value = OBO_COMMENT_PATTERN.sub("", value).strip()
+    value = OBO_MODIFIER_PATTERN.sub("", value).strip()
+    return OBO_ESCAPE_PATTERN.sub(lambda match: OBO_ESCAPES.get(match.group(1), match.group(1)), value)
+
+def readOboTriples(filePath: str):
+    '''
+    Yields the label and subClassOf statements of the [Term] stanzas of an OBO
+    flat file. Only the is_a tags are read as subClassOf, the relationships
+    and intersections are restrictions and equivalences in the owl files.
+    '''
+    inTerm = False
+    with open(filePath, "r", encoding="utf-8") as file:
+        for line in file:
+            if line.startswith("["):
+                subject = None
+                inTerm = line.startswith("[Term]")
+                continue
+            if not inTerm:
+                continue
+            tag, separator, value = line.partition(": ")
+            if not separator:
+                continue
+            if tag == "id":
+                subject = curieToIRI(value.split()[0])
+            elif subject is None:
+                continue
+            elif tag == "name":
+                label = unescapeOboValue(value.rstrip("\n"))
+                if keepStatement(subject, PREDICATE_LABEL, label):
+                    yield (subject, PREDICATE_LABEL, label)
+            elif tag == "is_a":
+                parent = curieToIRI(value.split()[0])
+                if keepStatement(subject, PREDICATE_SUBCLASS_OF, parent):
+                    yield (subject, PREDICATE_SUBCLASS_OF, parent)
+
+def readOboGraphTriples(filePath: str):
+    '''
+    Yields the label and subClassOf statements of the nodes and is_a edges of
+    all graphs of an OBO Graphs JSON file.
+    '''
+    with open(filePath, "r", encoding="utf-8") as file:
+        graphs = json.load(file).get("graphs") or []
+    for graph in graphs:
+        for node in graph.get("nodes") or []:
+            label = node.get("lbl")
+            if label is not None and keepStatement(node["id"], PREDICATE_LABEL, label):
+                yield (node["id"], PREDICATE_LABEL, label)
+        for edge in graph.get("edges") or []:
+            if edge.get("pred") == "is_a" and keepStatement(edge["sub"], PREDICATE_SUBCLASS_OF, edge["obj"]):
+                yield (edge["sub"], PREDICATE_SUBCLASS_OF, edge["obj"])
+
+def readTermTableTriples(filePath: str):
+    '''
+    Yields the label and subClassOf statements of a pre-extracted term table,
+    a tab separated file with the columns id (IRI or OBO id), label and parents
+    (separated by "|").
+    '''
+    with open(filePath, "r", encoding="utf-8", newline="") as file:
+        reader = csv.reader(file, delimiter="\t")
+        header = next(reader, None)
+        if header is None:
+            return
+        try:
+            idColumn, labelColumn, parentsColumn = (header.index(column) for column in TERM_TABLE_COLUMNS)
+        except ValueError:
+            raise KeyError(filePath + " is missing one of the columns " + ", ".join(TERM_TABLE_COLUMNS))
+        for row in reader:
+            if not row:
+                continue
+            subject = curieToIRI(row[idColumn])
+            if row[labelColumn]:
+                yield (subject, PREDICATE_LABEL, row[labelColumn])
+            for parent in row[parentsColumn].split(TERM_TABLE_SEPARATOR) if row[parentsColumn] else []:
+                yield (subject, PREDICATE_SUBCLASS_OF, curieToIRI(parent))
+
+def writeTermTable(triples, filePath: str) -> int:
+    '''
+    Writes the label and subClassOf statements as term table readable by
+    readTermTableTriples. Returns the number of terms.
+    '''
+    labels = {}
+    parents = {}
+    for subj, pred, obj in triples:
+        if pred == PREDICATE_LABEL:
+            labels[subj] = obj
+            parents.setdefault(subj, [])
+        elif pred == PREDICATE_SUBCLASS_OF:
+            labels.setdefault(subj, "")
+            parents.setdefault(subj, []).append(obj)
+    with open(filePath, "w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file, delimiter="\t", lineterminator="\n")
+        writer.writerow(TERM_TABLE_COLUMNS)
+        writer.writerows([iri, labels[iri], TERM_TABLE_SEPARATOR.join(parents[iri])] for iri in labels.keys())
+    return len(labels)
+
+# file suffixes of the ontologies and the readers of their statements
+READERS = {
+    "obo": readOboTriples,
+    "json": readOboGraphTriples,
+    "tsv": readTermTableTriples
+}
+
+def readTriples(filePath: str, fileSuffix: str) -> list:
+    if fileSuffix not in READERS:
+        raise KeyError(fileSuffix + " files are not supported, use one of owl, csv, " + ", ".join(READERS.keys()))
+    return list(READERS[fileSuffix](filePath))
+
+if __name__ == "__main__":
+    parser = arg.ArgumentParser(
+        prog='DZIF microbial OMICs Database Term Table Extractor',
+        description='This piece of software extracts the labels and the subClassOf hierarchy of an ontology (owl, obo or OBO Graphs json) into a term table, which is read considerably faster by ontoHandler.py.',
+        epilog='Released under MIT License.')
+    parser.add_argument("--input", required=True, help="path of the ontology file", type=str)
+    parser.add_argument("--output", required=True, help="path of the term table (.tsv)", type=str)
+    args = parser.parse_args()
+    fileSuffix = args.input.rsplit(".", 1)[-1]
+    triples = streamOwlTriples(args.input) if fileSuffix == "owl" else readTriples(args.input, fileSuffix)
+    numberOfTerms = writeTermTable(triples, args.output)
+    print(f"Extracted {numberOfTerms} terms into {args.output}.\n")
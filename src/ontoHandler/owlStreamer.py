@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+#
+#   Date:   18.10.2026
+#
+#   Incremental reader for RDF/XML (owl) files which
+#   only keeps the statements needed to extract the
+#   controlled vocabularies instead of building the
+#   full rdflib graph in memory.
+#
+##################################################
+import xml.etree.ElementTree as ET
+from urllib.parse import urljoin
+
+RDF_NAMESPACE = "http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+XML_NAMESPACE = "http://www.w3.org/XML/1998/namespace"
+OBO_NAMESPACE = "http://purl.obolibrary.org/obo/"
+
+PREDICATE_ID = "http://www.geneontology.org/formats/oboInOwl#id"
+PREDICATE_LABEL = "http://www.w3.org/2000/01/rdf-schema#label"
+PREDICATE_SUBCLASS_OF = "http://www.w3.org/2000/01/rdf-schema#subClassOf"
+PREDICATES_TO_KEEP = (PREDICATE_ID, PREDICATE_LABEL, PREDICATE_SUBCLASS_OF)
+
+RDF_ROOT = "{" + RDF_NAMESPACE + "}RDF"
+RDF_ABOUT = "{" + RDF_NAMESPACE + "}about"
+RDF_ID = "{" + RDF_NAMESPACE + "}ID"
+RDF_NODE_ID = "{" + RDF_NAMESPACE + "}nodeID"
+RDF_RESOURCE = "{" + RDF_NAMESPACE + "}resource"
+RDF_PARSE_TYPE = "{" + RDF_NAMESPACE + "}parseType"
+XML_BASE = "{" + XML_NAMESPACE + "}base"
+
+# kinds of the open xml elements while walking through the document
+ROOT = 0
+NODE = 1
+PROPERTY = 2
+SKIP = 3
+
+
+def tagToIRI(tag: str) -> str:
+    if tag.startswith("{"):
+        namespace, localName = tag[1:].split("}", 1)
+        return namespace + localName
+    return tag
+
+def keepStatement(subject: str, predicate: str, obj: str) -> bool:
+    return predicate in PREDICATES_TO_KEEP and (OBO_NAMESPACE in subject or OBO_NAMESPACE in obj)
+
+def streamOwlTriples(filePath: str):
+    '''
+    Yields the (subject, predicate, object) statements of an RDF/XML file
+    which are relevant for the controlled vocabularies, i.e. the id, label
+    and subClassOf statements touching http://purl.obolibrary.org/obo/ terms.
+    Statements about or pointing to blank nodes (owl restrictions, axioms,
+    rdf:nodeID) are dropped while reading, the parsed xml elements are
+    released as soon as they are closed.
+    '''
+    # every stack entry: [kind, subject, predicate, base, hasNodeChild]
+    stack = []
+    documentBase = filePath
+    context = ET.iterparse(filePath, events=("start", "end"))
+    for event, element in context:
+        if event == "start":
+            parent = stack[-1] if stack else None
+            base = element.get(XML_BASE)
+            if base is None:
+                base = parent[3] if parent else documentBase
+            if parent is None and element.tag == RDF_ROOT:
+                rootElement = element
+                stack.append([ROOT, None, None, base, False])
+            elif parent is None or parent[0] == ROOT or parent[0] == PROPERTY:
+                # node element, blank nodes are represented by None
+                subject = None
+                if RDF_ABOUT in element.attrib:
+                    subject = urljoin(base, element.get(RDF_ABOUT))
+                elif RDF_ID in element.attrib:
+                    subject = urljoin(base, "#" + element.get(RDF_ID))
+                if parent is not None and parent[0] == PROPERTY:
+                    parent[4] = True
+                    if parent[1] is not None and parent[2] is not None and subject is not None:
+                        if keepStatement(parent[1], parent[2], subject):
+                            yield (parent[1], parent[2], subject)
+                if subject is not None:
+                    for attribute, value in element.attrib.items():
+                        if attribute.startswith("{" + RDF_NAMESPACE) or attribute.startswith("{" + XML_NAMESPACE):
+                            continue
+                        predicate = tagToIRI(attribute)
+                        if keepStatement(subject, predicate, value):
+                            yield (subject, predicate, value)
+                stack.append([NODE, subject, None, base, False])
+            elif parent[0] == NODE:
+                # property element
+                subject = parent[1]
+                predicate = tagToIRI(element.tag)
+                parseType = element.get(RDF_PARSE_TYPE)
+                if parseType == "Resource":
+                    # the object is a blank node, its properties follow directly
+                    stack.append([NODE, None, None, base, False])
+                elif parseType is not None:
+                    # rdf:parseType="Literal" or "Collection"
+                    stack.append([SKIP if parseType != "Collection" else PROPERTY, None, None, base, False])
+                elif RDF_RESOURCE in element.attrib:
+                    obj = urljoin(base, element.get(RDF_RESOURCE))
+                    if subject is not None and keepStatement(subject, predicate, obj):
+                        yield (subject, predicate, obj)
+                    stack.append([SKIP, None, None, base, False])
+                elif RDF_NODE_ID in element.attrib:
+                    stack.append([SKIP, None, None, base, False])
+                else:
+                    stack.append([PROPERTY, subject, predicate, base, False])
+            else:
+                stack.append([SKIP, None, None, base, False])
+        else:
+            kind, subject, predicate, base, hasNodeChild = stack.pop()
+            if kind == PROPERTY and subject is not None and not hasNodeChild:
+                obj = element.text if element.text is not None else ""
+                if keepStatement(subject, predicate, obj):
+                    yield (subject, predicate, obj)
+            element.clear()
+            if stack and stack[-1][0] == ROOT:
+                # drop the references of rdf:RDF to the processed top-level elements
+                rootElement.clear()
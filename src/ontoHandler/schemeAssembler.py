@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+#
+#   Date:   18.10.2026
+#
+#   Assembles the final metadata scheme from the
+#   scheme template and the generated controlled
+#   vocabularies in a single pass.
+#
+##################################################
+import os
+
+
+def getTermsToReplace(configYAML: dict) -> list:
+    '''
+    Returns all placeholder lines of the config in the order of the config,
+    the enums of every ontology first and the prefixes last.
+    '''
+    termsToReplace = []
+    ontologies = configYAML["config"]["ontologies"]
+    for key in ontologies.keys():
+        for entry in ontologies[key]["enum"]:
+            termsToReplace.append(ontologies[key]["enum"][entry]["term_to_replace"])
+    termsToReplace.append(configYAML["config"]["prefixes_controlled_vocabularies"]["term_to_replace"])
+    return termsToReplace
+
+def loadSchemeTemplate(pathToTemplate: str) -> list:
+    with open(pathToTemplate, "r") as file:
+        return file.readlines()
+
+def indexPlaceholders(schemeLines: list, termsToReplace: list, nameOfSchemesFile: str = "scheme") -> dict:
+    '''
+    Scans the scheme once and returns the line number of every placeholder.
+    Placeholders missing in the scheme are reported, placeholders occurring
+    more than once raise a ValueError as the insertion would be ambiguous.
+    '''
+    wantedTerms = set(termsToReplace)
+    placeholderIndex = {}
+    duplicates = set()
+    for index, line in enumerate(schemeLines):
+        if line in wantedTerms:
+            if line in placeholderIndex:
+                duplicates.add(line)
+            else:
+                placeholderIndex[line] = index
+    if duplicates:
+        raise ValueError("Placeholders occurring more than once in " + nameOfSchemesFile + ": " + ", ".join(sorted(term.strip() for term in duplicates)))
+    for term in termsToReplace:
+        if term not in placeholderIndex:
+            print(f"Warning: placeholder {term.strip()} not found in {nameOfSchemesFile}, its controlled vocabulary is not inserted.\n")
+    return placeholderIndex
+
+def assembleScheme(schemeLines: list, placeholderIndex: dict, yamlBlocks: dict):
+    '''
+    Yields the lines of the final scheme, every placeholder with a generated
+    block in yamlBlocks is replaced by the lines of that block.
+    '''
+    replacements = {}
+    for term, index in placeholderIndex.items():
+        if term in yamlBlocks:
+            replacements[index] = yamlBlocks[term]
+    start = 0
+    for index in sorted(replacements.keys()):
+        yield from schemeLines[start:index]
+        yield from replacements[index]
+        start = index + 1
+    yield from schemeLines[start:]
+
+def getBlockPositions(placeholderIndex: dict, yamlBlocks: dict) -> dict:
+    '''
+    Returns the first line and the number of lines of every inserted block in
+    the scheme assembled by assembleScheme.
+    '''
+    positions = {}
+    shift = 0
+    for term, index in sorted(placeholderIndex.items(), key=lambda item: item[1]):
+        if term in yamlBlocks:
+            positions[term] = (index + shift, len(yamlBlocks[term]))
+            shift += len(yamlBlocks[term]) - 1
+    return positions
+
+def getEnumNames(schemeLines: list, termsToReplace: list) -> dict:
+    '''
+    Returns the name of the enum every placeholder in the enums of the scheme
+    is located in, in the order of the scheme. Placeholders outside of the
+    enums (e.g. of the prefixes) are left out.
+    '''
+    wantedTerms = set(termsToReplace)
+    enumNames = {}
+    inEnums = False
+    enumName = None
+    for line in schemeLines:
+        if line in wantedTerms:
+            if inEnums and enumName is not None:
+                enumNames.setdefault(line, enumName)
+        elif line[:1].isalpha():
+            inEnums = line.rstrip() == "enums:"
+            enumName = None
+        elif inEnums and line.startswith("  ") and line[2:3] not in (" ", "#", "") and line.rstrip().endswith(":"):
+            enumName = line.strip()[:-1].strip("\"'")
+    return enumNames
+
+def writeScheme(pathToFinalSchemes: str, nameOfSchemesFile: str, lines):
+    if os.path.exists(pathToFinalSchemes) == False:
+        os.makedirs(pathToFinalSchemes)
+    with open(pathToFinalSchemes + os.sep + nameOfSchemesFile, "w") as outfile:
+        outfile.writelines(lines)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+#
+#   Date:   18.10.2026
+#
+#   Variants of the metadata scheme (further scheme
+#   templates or config profiles), which are built
+#   together from one extraction of the ontologies.
+#
+##################################################
+import copy
+import json
+import os
+import yaml
+
+
+def loadVariant(configYAML: dict, variant: str, pathToWorkingDirectory: str) -> dict:
+    '''
+    Returns the config of a variant. A variant is either the name of a scheme
+    template in path_for_schemes, which uses the enums of the config, or the
+    path of a config profile. A profile has the layout of config.yaml, it
+    names its own name_of_schemes_file and selects the enums of the ontologies
+    of config.yaml, whose files and formats are taken over.
+    '''
+    environment = configYAML["config"]["environment"]
+    variantConfig = copy.deepcopy(configYAML)
+    if os.path.isfile(pathToWorkingDirectory + environment["path_for_schemes"] + os.sep + variant):
+        variantConfig["config"]["environment"]["name_of_schemes_file"] = variant
+        return variantConfig
+    pathToProfile = variant if os.path.isabs(variant) else pathToWorkingDirectory + variant
+    if not os.path.isfile(pathToProfile):
+        raise FileNotFoundError(variant + " is neither a scheme template in " + environment["path_for_schemes"] + " nor a config profile")
+    with open(pathToProfile, "r") as file:
+        profile = yaml.safe_load(file)["config"]
+    if "name_of_schemes_file" not in (profile.get("environment") or {}):
+        raise KeyError("the config profile " + variant + " has to define environment/name_of_schemes_file")
+    variantConfig["config"]["environment"]["name_of_schemes_file"] = profile["environment"]["name_of_schemes_file"]
+    ontologies = {}
+    for key, ontology in (profile.get("ontologies") or {}).items():
+        if key not in configYAML["config"]["ontologies"]:
+            raise KeyError(key + " of the config profile " + variant + " is not part of config.yaml, so it is not downloaded")
+        ontologies[key] = dict(configYAML["config"]["ontologies"][key], enum=ontology["enum"])
+    variantConfig["config"]["ontologies"] = ontologies
+    if "prefixes_controlled_vocabularies" in profile:
+        variantConfig["config"]["prefixes_controlled_vocabularies"] = profile["prefixes_controlled_vocabularies"]
+    return variantConfig
+
+def loadVariants(configYAML: dict, variants: list, pathToWorkingDirectory: str) -> list:
+    '''
+    Returns the configs of all variants, variants writing the same final
+    scheme raise a ValueError.
+    '''
+    variantConfigs = [loadVariant(configYAML, variant, pathToWorkingDirectory) for variant in variants]
+    namesOfSchemesFiles = [variantConfig["config"]["environment"]["name_of_schemes_file"] for variantConfig in variantConfigs]
+    duplicates = sorted({name for name in namesOfSchemesFiles if namesOfSchemesFiles.count(name) > 1})
+    if duplicates:
+        raise ValueError("Several variants write the final scheme " + ", ".join(duplicates))
+    return variantConfigs
+
+def getEnumKey(key: str, enum: dict) -> str:
+    '''
+    Enums of an ontology with the same root (or the same filter of a csv) have
+    the same key and are extracted only once, whatever their placeholder is.
+    '''
+    return key + " " + json.dumps({setting: value for setting, value in enum.items() if setting != "term_to_replace"}, sort_keys=True)
+
+def mergeVariantEnums(variantConfigs: list) -> dict:
+    '''
+    Returns per ontology the config entry with the distinct enums of all
+    variants, each under the name it has in the first variant using it. The
+    entries of the enums map their names to their keys.
+    '''
+    mergedOntologies = {}
+    for variantConfig in variantConfigs:
+        for key, ontology in variantConfig["config"]["ontologies"].items():
+            mergedOntology = mergedOntologies.setdefault(key, dict(ontology, enum={}, enumKeys={}))
+            for entry, enum in ontology["enum"].items():
+                enumKey = getEnumKey(key, enum)
+                if enumKey in mergedOntology["enumKeys"].values():
+                    continue
+                name = entry
+                while name in mergedOntology["enum"]:
+                    name += "'"
+                mergedOntology["enum"][name] = enum
+                mergedOntology["enumKeys"][name] = enumKey
+    return mergedOntologies
+
+def getVariantIndexName(configYAML: dict, nameOfSchemesFile: str) -> str:
+    '''
+    The vocabulary index of the scheme of config.yaml keeps its name, the ones
+    of the other variants are prefixed with the name of their scheme.
+    '''
+    environment = configYAML["config"]["environment"]
+    if nameOfSchemesFile == environment["name_of_schemes_file"]:
+        return environment["name_of_vocabulary_index"]
+    return os.path.splitext(nameOfSchemesFile)[0] + "_" + environment["name_of_vocabulary_index"]
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+#
+#   Date:   18.10.2026
+#
+#   Watch mode which keeps the parsed hierarchies
+#   and the extracted enums in memory and renders
+#   the final scheme again whenever the scheme
+#   template, the config or an ontology changes.
+#
+##################################################
+import os
+import threading
+import time
+import traceback
+import yaml
+from .ontoHandler import ontoDownloader, loadHierarchy, extractEnums, extractCsvEnums, getOntologyFiles, collectPrefixes, prefixDictToYamlList
+from .ontoReaders import READERS
+from .schemeAssembler import getTermsToReplace, loadSchemeTemplate, indexPlaceholders, assembleScheme, writeScheme
+from .schemeVariants import getEnumKey
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    # without watchdog the files are polled
+    Observer = None
+
+DEFAULT_INTERVAL = 0.1
+# time to wait for an editor to finish saving before the files are read
+SETTLE_TIME = 0.05
+
+
+def getFileSignature(filePaths: list) -> tuple:
+    '''
+    Modification time and size of the files, a missing file has no signature.
+    '''
+    signature = []
+    for filePath in filePaths:
+        try:
+            status = os.stat(filePath)
+            signature.append((filePath, status.st_mtime_ns, status.st_size))
+        except FileNotFoundError:
+            signature.append((filePath, None, None))
+    return tuple(signature)
+
+
+class SchemeWatcher:
+    '''
+    Renders the final scheme and keeps the index of the hierarchy of every
+    ontology (by the signature of its files and format) and every extracted
+    enum (by ontology signature and root) in memory. A change of the scheme
+    template only assembles the scheme again, a changed enum of the config is
+    extracted from the kept hierarchy and only changed ontology files are
+    parsed again.
+    '''
+
+    def __init__(self, nameOfRepository: str, streaming: bool = False, useCache: bool = True, interval: float = DEFAULT_INTERVAL, onRender: list = None):
+        self.nameOfRepository = nameOfRepository
+        self.streaming = streaming
+        self.useCache = useCache
+        self.interval = interval
+        self.onRender = onRender or []
+        self.hierarchies = {}
+        self.enumResults = {}
+        self.downloads = None
+        self.changed = threading.Event()
+        getCurrentWorkingDirectory = os.getcwd()
+        if not nameOfRepository in getCurrentWorkingDirectory:
+            raise FileNotFoundError(nameOfRepository + " is not part of the working directory " + getCurrentWorkingDirectory)
+        self.pathToWorkingDirectory = getCurrentWorkingDirectory.split(nameOfRepository)[0] + nameOfRepository + os.sep
+        self.pathToConfig = self.pathToWorkingDirectory + "config" + os.sep + "config.yaml"
+        self.watchedFiles = [self.pathToConfig]
+
+    def loadConfig(self) -> dict:
+        with open(self.pathToConfig, "r") as file:
+            configYAML = yaml.safe_load(file)
+        # the ontologies are only downloaded again if their urls changed
+        downloads = {key: (ontology["URL"], ontology.get("checksum"), ontology.get("size"), ontology["format"]) for key, ontology in configYAML["config"]["ontologies"].items()}
+        if downloads != self.downloads:
+            configYAML = ontoDownloader(self.nameOfRepository)
+            self.downloads = downloads
+        return configYAML
+
+    def getWatchedFiles(self, configYAML: dict) -> list:
+        environment = configYAML["config"]["environment"]
+        pathToOntologies = self.pathToWorkingDirectory + environment["path_for_ontologies"]
+        watchedFiles = [self.pathToConfig, self.pathToWorkingDirectory + environment["path_for_schemes"] + os.sep + environment["name_of_schemes_file"]]
+        for key, ontology in configYAML["config"]["ontologies"].items():
+            watchedFiles.extend(getOntologyFiles(key, ontology, pathToOntologies))
+        return watchedFiles
+
+    def extractEnumResults(self, configYAML: dict) -> tuple:
+        '''
+        Returns the results (in the layout of processOntology) of all enums of
+        the config and the names of the enums which had to be extracted, all
+        others are taken from memory.
+        '''
+        environment = configYAML["config"]["environment"]
+        pathToOntologies = self.pathToWorkingDirectory + environment["path_for_ontologies"]
+        pathToCache = self.pathToWorkingDirectory + environment["path_for_cache"] if self.useCache else None
+        cacheSizeLimit = environment["cache_size_limit_MB"] * 1024 * 1024
+        hierarchies = {}
+        enumResults = {}
+        results = []
+        extracted = []
+        for key, ontology in configYAML["config"]["ontologies"].items():
+            fileSuffix = ontology["format"]["file_suffix"]
+            signature = (repr(ontology["format"]), getFileSignature(getOntologyFiles(key, ontology, pathToOntologies)))
+            enumKeys = {entry: (signature, getEnumKey(key, enum)) for entry, enum in ontology["enum"].items()}
+            missingEnums = {entry: ontology["enum"][entry] for entry, enumKey in enumKeys.items() if enumKey not in self.enumResults}
+            if missingEnums and fileSuffix == "csv":
+                for enumResult in extractCsvEnums(key, ontology, pathToOntologies):
+                    self.enumResults.setdefault(enumKeys[enumResult[0]], enumResult)
+                extracted.append(key)
+            elif missingEnums:
+                if fileSuffix != "owl" and fileSuffix not in READERS:
+                    raise KeyError(key + " has the file suffix " + fileSuffix + ", use one of owl, csv, " + ", ".join(READERS.keys()))
+                if self.hierarchies.get(key, (None, None))[0] != signature:
+                    print(f"Parsing {key}.\n")
+                    self.hierarchies[key] = (signature, loadHierarchy(key, ontology, pathToOntologies, self.streaming, pathToCache, cacheSizeLimit))
+                for enumResult in extractEnums(key, missingEnums, self.hierarchies[key][1]):
+                    self.enumResults[enumKeys[enumResult[0]]] = enumResult
+                extracted.extend(key + "/" + entry for entry in missingEnums)
+            if key in self.hierarchies:
+                hierarchies[key] = self.hierarchies[key]
+            for entry, enumKey in enumKeys.items():
+                if enumKey in self.enumResults:
+                    enumResults[enumKey] = self.enumResults[enumKey]
+                    # the result keeps the placeholder of the enum it was extracted for
+                    results.append((entry, ontology["enum"][entry]["term_to_replace"]) + self.enumResults[enumKey][2:])
+        # release the ontologies and enums which are not part of the config anymore
+        self.hierarchies = hierarchies
+        self.enumResults = enumResults
+        return results, extracted
+
+    def render(self) -> str:
+        '''
+        Writes the final scheme from the kept enums and returns its path.
+        '''
+        start = time.perf_counter()
+        configYAML = self.loadConfig()
+        self.watchedFiles = self.getWatchedFiles(configYAML)
+        environment = configYAML["config"]["environment"]
+        results, extracted = self.extractEnumResults(configYAML)
+        yamlBlocks = {}
+        blocks = {}
+        for entry, termToReplace, yamlList, prefixesLocal, terms in results:
+            if termToReplace not in blocks:
+                yamlBlocks[termToReplace] = yamlList
+                blocks[termToReplace] = {"prefixes": prefixesLocal}
+        prefixTerm = configYAML["config"]["prefixes_controlled_vocabularies"]["term_to_replace"]
+        yamlBlocks[prefixTerm] = prefixDictToYamlList(collectPrefixes(configYAML, blocks))
+        nameOfSchemesFile = environment["name_of_schemes_file"]
+        schemeLines = loadSchemeTemplate(self.pathToWorkingDirectory + environment["path_for_schemes"] + os.sep + nameOfSchemesFile)
+        placeholderIndex = indexPlaceholders(schemeLines, getTermsToReplace(configYAML), nameOfSchemesFile)
+        pathToFinalSchemes = self.pathToWorkingDirectory + environment["path_for_final_schemes"]
+        writeScheme(pathToFinalSchemes, nameOfSchemesFile, assembleScheme(schemeLines, placeholderIndex, yamlBlocks))
+        milliseconds = round((time.perf_counter() - start) * 1000)
+        print(f"[{time.strftime('%H:%M:%S')}] Rendered {environment['path_for_final_schemes'] + os.sep + nameOfSchemesFile} in {milliseconds} ms" + (f", extracted {', '.join(extracted)}" if extracted else "") + ".\n")
+        pathToFinalScheme = pathToFinalSchemes + os.sep + nameOfSchemesFile
+        for callback in self.onRender:
+            callback(pathToFinalScheme)
+        return pathToFinalScheme
+
+    def tryRender(self):
+        # a half edited config or scheme must not stop the watch mode
+        try:
+            self.render()
+        except Exception:
+            traceback.print_exc()
+            print(f"[{time.strftime('%H:%M:%S')}] Rendering failed, waiting for the next change.\n")
+
+    def startObserver(self):
+        if Observer is None:
+            return None
+        watcher = self
+
+        class ChangeHandler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                watcher.changed.set()
+
+        observer = Observer()
+        for folder in sorted({os.path.dirname(filePath) for filePath in self.watchedFiles}):
+            if os.path.isdir(folder):
+                observer.schedule(ChangeHandler(), folder, recursive=False)
+        observer.start()
+        return observer
+
+    def waitForChange(self, signature: tuple) -> tuple:
+        '''
+        Waits until the signature of the watched files changed and stays the
+        same for SETTLE_TIME. Returns the new signature.
+        '''
+        while True:
+            # watchdog wakes up at once, without it the files are polled every interval
+            self.changed.wait(self.interval)
+            self.changed.clear()
+            newSignature = getFileSignature(self.watchedFiles)
+            if newSignature == signature:
+                continue
+            while True:
+                time.sleep(SETTLE_TIME)
+                settledSignature = getFileSignature(self.watchedFiles)
+                if settledSignature == newSignature:
+                    return newSignature
+                newSignature = settledSignature
+
+    def watch(self):
+        self.tryRender()
+        observer = self.startObserver()
+        print(f"Watching {len(self.watchedFiles)} files " + ("with watchdog" if observer is not None else f"every {self.interval} s") + " (stop with Ctrl+C).\n")
+        signature = getFileSignature(self.watchedFiles)
+        try:
+            while True:
+                signature = self.waitForChange(signature)
+                self.tryRender()
+                # the config may name other files now
+                signature = getFileSignature(self.watchedFiles)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if observer is not None:
+                observer.stop()
+                observer.join()
+        print("Stopped watching.\n")
+
+def watch(nameOfRepository: str, streaming: bool = False, useCache: bool = True, interval: float = DEFAULT_INTERVAL, onRender: list = None):
+    SchemeWatcher(nameOfRepository, streaming, useCache, interval, onRender).watch()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+#
+#   Date:   18.10.2026
+#
+#   Snapshot of the controlled vocabularies in the
+#   final scheme, used to report the changes of new
+#   ontology versions and to patch only the changed
+#   enums into an existing final scheme.
+#
+##################################################
+import json
+import os
+
+
+def loadSnapshot(pathToSnapshot: str) -> dict:
+    if not os.path.isfile(pathToSnapshot):
+        return None
+    with open(pathToSnapshot, "r") as file:
+        try:
+            return json.load(file)
+        except json.JSONDecodeError:
+            # a broken snapshot only means that the scheme is built completely
+            return None
+
+def saveSnapshot(pathToSnapshot: str, snapshot: dict):
+    with open(pathToSnapshot + ".tmp", "w") as file:
+        json.dump(snapshot, file, separators=(",", ":"))
+    os.replace(pathToSnapshot + ".tmp", pathToSnapshot)
+
+def diffTerms(oldTerms: dict, newTerms: dict) -> dict:
+    '''
+    Compares the terms (id to label) of an enum in the old and the new version
+    of an ontology. Returns the added, removed and relabelled terms.
+    '''
+    added = [{"id": termId, "label": newTerms[termId]} for termId in sorted(newTerms.keys() - oldTerms.keys())]
+    removed = [{"id": termId, "label": oldTerms[termId]} for termId in sorted(oldTerms.keys() - newTerms.keys())]
+    relabelled = [{"id": termId, "old": oldTerms[termId], "new": newTerms[termId]} for termId in sorted(oldTerms.keys() & newTerms.keys()) if oldTerms[termId] != newTerms[termId]]
+    return {"added": added, "removed": removed, "relabelled": relabelled}
+
+def patchScheme(schemeLines: list, blockPositions: dict, replacements: dict) -> tuple:
+    '''
+    Replaces the blocks of the final scheme (first line and number of lines of
+    every block in blockPositions) by the lines in replacements. Returns the
+    patched lines and the new positions of all blocks.
+    '''
+    patchedLines = []
+    newPositions = {}
+    start = 0
+    for term, (blockStart, blockLength) in sorted(blockPositions.items(), key=lambda item: item[1][0]):
+        patchedLines.extend(schemeLines[start:blockStart])
+        block = replacements.get(term, schemeLines[blockStart:blockStart + blockLength])
+        newPositions[term] = (len(patchedLines), len(block))
+        patchedLines.extend(block)
+        start = blockStart + blockLength
+    patchedLines.extend(schemeLines[start:])
+    return patchedLines, newPositions
+
+def formatChangeReport(changes: list) -> list:
+    '''
+    Returns one line per enum with the number of added, removed and relabelled
+    terms.
+    '''
+    lines = []
+    for change in changes:
+        lines.append(f"{change['ontology']}/{change['enum']}: +{len(change['added'])} -{len(change['removed'])} ~{len(change['relabelled'])}")
+    return lines
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+#
+#   Date:   18.10.2026
+#
+#   Stage-level profiling of the build. Records
+#   wall time, CPU time, peak memory and counters
+#   (bytes downloaded, triples, terms) of every
+#   stage and writes them as JSON or Chrome trace.
+#
+##################################################
+import contextlib
+import cProfile
+import datetime
+import json
+import os
+import threading
+import time
+try:
+    import resource
+except ImportError:
+    # no peak memory on systems without the resource module
+    resource = None
+
+
+def getResourceUsage() -> dict:
+    '''
+    Returns the CPU seconds and the peak resident memory in MB of this process
+    and of its finished child processes (e.g. yarn).
+    '''
+    if resource is None:
+        return {"cpu": time.process_time(), "childrenCpu": 0.0, "peakRss": None, "childrenPeakRss": None}
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    # ru_maxrss is given in KB on Linux
+    return {
+        "cpu": own.ru_utime + own.ru_stime,
+        "childrenCpu": children.ru_utime + children.ru_stime,
+        "peakRss": round(own.ru_maxrss / 1024, 1),
+        "childrenPeakRss": round(children.ru_maxrss / 1024, 1)
+    }
+
+
+class Profiler:
+    '''
+    Collects one record per stage. Stages can be nested and opened from several
+    threads, counters are added to the innermost open stage of the thread.
+    A disabled profiler records nothing.
+    '''
+
+    def __init__(self, enabled: bool = False, pathToCProfile: str = None):
+        self.enabled = enabled
+        self.pathToCProfile = pathToCProfile
+        self.records = []
+        self.lock = threading.Lock()
+        self.openStages = threading.local()
+
+    def getOpenStages(self) -> list:
+        if not hasattr(self.openStages, "stages"):
+            self.openStages.stages = []
+        return self.openStages.stages
+
+    @contextlib.contextmanager
+    def stage(self, name: str, category: str = "stage", **counters):
+        '''
+        Records the stage name while the block is running. Yields the record,
+        further counters can be set on it or added with count().
+        '''
+        if not self.enabled:
+            yield {"counters": {}}
+            return
+        openStages = self.getOpenStages()
+        record = {
+            "name": name,
+            "category": category,
+            "parent": openStages[-1]["name"] if openStages else None,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "start": time.time_ns() // 1000,
+            "counters": dict(counters)
+        }
+        usageBefore = getResourceUsage()
+        wallBefore = time.perf_counter()
+        openStages.append(record)
+        try:
+            yield record
+        finally:
+            openStages.pop()
+            usageAfter = getResourceUsage()
+            record["wall_seconds"] = round(time.perf_counter() - wallBefore, 6)
+            record["cpu_seconds"] = round(usageAfter["cpu"] - usageBefore["cpu"], 6)
+            record["children_cpu_seconds"] = round(usageAfter["childrenCpu"] - usageBefore["childrenCpu"], 6)
+            record["peak_rss_MB"] = usageAfter["peakRss"]
+            record["children_peak_rss_MB"] = usageAfter["childrenPeakRss"]
+            with self.lock:
+                self.records.append(record)
+
+    def count(self, name: str, value: int):
+        '''
+        Adds value to the counter name of the innermost open stage of the thread.
+        '''
+        if not self.enabled:
+            return
+        openStages = self.getOpenStages()
+        if openStages:
+            counters = openStages[-1]["counters"]
+            counters[name] = counters.get(name, 0) + value
+
+    def merge(self, records: list):
+        '''
+        Adds the records of a worker process.
+        '''
+        with self.lock:
+            self.records.extend(records)
+
+    def toJSON(self, entryPoint: str) -> dict:
+        records = sorted(self.records, key=lambda record: record["start"])
+        return {
+            "entry_point": entryPoint,
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "stages": records
+        }
+
+    def toChromeTrace(self) -> dict:
+        '''
+        Returns the records in the Chrome trace-event format, which can be opened
+        with chrome://tracing or https://ui.perfetto.dev.
+        '''
+        events = []
+        for record in sorted(self.records, key=lambda record: record["start"]):
+            events.append({
+                "name": record["name"],
+                "cat": record["category"],
+                "ph": "X",
+                "ts": record["start"],
+                "dur": int(record["wall_seconds"] * 1000000),
+                "pid": record["pid"],
+                "tid": record["tid"],
+                "args": dict(record["counters"], cpu_seconds=record["cpu_seconds"], peak_rss_MB=record["peak_rss_MB"])
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, entryPoint: str, pathToTrace: str = None, pathToChromeTrace: str = None):
+        if pathToTrace is not None:
+            with open(pathToTrace, "w") as file:
+                json.dump(self.toJSON(entryPoint), file, indent=2)
+            print(f"Profile of {entryPoint} written to {pathToTrace}.\n")
+        if pathToChromeTrace is not None:
+            with open(pathToChromeTrace, "w") as file:
+                json.dump(self.toChromeTrace(), file)
+            print(f"Chrome trace of {entryPoint} written to {pathToChromeTrace}.\n")
+
+
+profiler = Profiler()
+
+def getProfiler() -> Profiler:
+    return profiler
+
+def enableProfiler(pathToCProfile: str = None) -> Profiler:
+    '''
+    Replaces the profiler of this process by an enabled one, also used by worker
+    processes which must not carry over the records of their parent.
+    '''
+    global profiler
+    profiler = Profiler(enabled=True, pathToCProfile=pathToCProfile)
+    return profiler
+
+def runWithCProfile(pathToDump: str, function, *args, **kwargs):
+    '''
+    Runs function under cProfile and dumps the statistics to pathToDump, which
+    can be inspected with pstats or snakeviz.
+    '''
+    os.makedirs(os.path.dirname(os.path.abspath(pathToDump)), exist_ok=True)
+    cProfiler = cProfile.Profile()
+    try:
+        return cProfiler.runcall(function, *args, **kwargs)
+    finally:
+        cProfiler.dump_stats(pathToDump)
+
+def addProfilingArguments(parser):
+    parser.add_argument("--profile", metavar="TRACE", help="record wall time, CPU time, peak memory and processed items of every stage and write them as JSON to TRACE")
+    parser.add_argument("--chrome-trace", metavar="TRACE", help="additionally write the profile in Chrome trace-event format to TRACE (requires --profile)")
+    parser.add_argument("--cprofile", metavar="FOLDER", help="dump cProfile statistics of the processing of every ontology into FOLDER (requires --profile)")
+
+def startProfiling(args, parser=None) -> Profiler:
+    '''
+    Enables the profiler if the --profile option of addProfilingArguments is set.
+    The options depending on --profile are rejected by the parser without it.
+    '''
+    if args.profile is None:
+        if parser is not None and (args.chrome_trace is not None or args.cprofile is not None):
+            parser.error("--chrome-trace and --cprofile require --profile")
+        return getProfiler()
+    # the entry points change the working directory, so the paths are resolved now
+    args.profile = os.path.abspath(args.profile)
+    if args.chrome_trace is not None:
+        args.chrome_trace = os.path.abspath(args.chrome_trace)
+    return enableProfiler(os.path.abspath(args.cprofile) if args.cprofile else None)
+
+def finishProfiling(args, entryPoint: str):
+    if args.profile is not None:
+        getProfiler().write(entryPoint, args.profile, args.chrome_trace)
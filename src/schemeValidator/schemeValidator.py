@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+#
+#   Date:   18.10.2026
+#
+#   Validates large metadata submissions (TSV/CSV)
+#   against a class of the final metadata scheme
+#   and writes a report with one line per invalid
+#   cell.
+#
+##################################################
+import argparse as arg
+import csv
+import os
+import re
+import sys
+import pandas as pd
+import yaml
+from concurrent.futures import ProcessPoolExecutor
+# the profiler is located next to this package in src/
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from profiler.profiler import getProfiler, addProfilingArguments, startProfiling, finishProfiling
+
+NUMERIC_RANGES = {"integer", "float", "double", "decimal"}
+DATE_RANGES = {"date", "datetime"}
+MULTIVALUE_SEPARATOR = ";"
+REPORT_COLUMNS = ["row", "column", "value", "error"]
+
+# checkers of the worker processes, compiled once per process
+workerCheckers = None
+
+
+def loadScheme(pathToScheme: str) -> dict:
+    with open(pathToScheme, "r") as file:
+        # the C loader is considerably faster for schemes with large enums
+        return yaml.load(file, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+def compileRange(rangeName: str, enums: dict) -> dict:
+    '''
+    Returns the checker of a single range: the permissible values of an enum as
+    hash set or the type of a numeric or date range. String ranges need no check.
+    '''
+    if rangeName in enums:
+        permissibleValues = enums[rangeName].get("permissible_values") or {}
+        return {"range": rangeName, "enum": frozenset(str(value) for value in permissibleValues.keys())}
+    if rangeName in NUMERIC_RANGES or rangeName in DATE_RANGES:
+        return {"range": rangeName, "type": rangeName}
+    return {"range": rangeName}
+
+def compileSlot(slotName: str, slot: dict, enums: dict) -> dict:
+    '''
+    Compiles the definition of a slot into a checker with the enum as hash set,
+    the precompiled pattern and the numeric limits of the slot.
+    '''
+    checker = {
+        "name": slotName,
+        "title": slot.get("title"),
+        "required": bool(slot.get("required")),
+        "multivalued": bool(slot.get("multivalued")),
+        "pattern": re.compile(slot["pattern"]) if slot.get("pattern") else None,
+        "minimum": slot.get("minimum_value"),
+        "maximum": slot.get("maximum_value"),
+        "ranges": []
+    }
+    if slot.get("any_of"):
+        checker["ranges"] = [compileRange(alternative["range"], enums) for alternative in slot["any_of"] if alternative.get("range")]
+    elif slot.get("range"):
+        checker["ranges"] = [compileRange(slot["range"], enums)]
+    return checker
+
+def compileClass(scheme: dict, className: str) -> list:
+    '''
+    Returns the checkers of all slots of a class of the scheme, the slot_usage of
+    the class overrides the definitions of the slots.
+    '''
+    classes = scheme.get("classes") or {}
+    if className not in classes:
+        raise KeyError(className + " is not a class of the scheme, available classes: " + ", ".join(name for name in classes if name != "dh_interface"))
+    slots = scheme.get("slots") or {}
+    enums = scheme.get("enums") or {}
+    slotUsage = classes[className].get("slot_usage") or {}
+    checkers = []
+    for slotName in classes[className].get("slots") or []:
+        slot = dict(slots.get(slotName) or {})
+        slot.update(slotUsage.get(slotName) or {})
+        checkers.append(compileSlot(slotName, slot, enums))
+    return checkers
+
+def checkRange(values: pd.Series, rangeChecker: dict) -> tuple:
+    '''
+    Returns the mask of the values which are valid for the range together with
+    the error message of the invalid ones.
+    '''
+    if "enum" in rangeChecker:
+        return values.isin(rangeChecker["enum"]), "not a permissible value of " + rangeChecker["range"]
+    if rangeChecker.get("type") in NUMERIC_RANGES:
+        numbers = pd.to_numeric(values, errors="coerce")
+        valid = numbers.notna()
+        if rangeChecker["type"] == "integer":
+            valid &= numbers.mod(1).eq(0)
+        return valid, "not a valid " + rangeChecker["type"]
+    if rangeChecker.get("type") == "date":
+        return pd.to_datetime(values, format="%Y-%m-%d", errors="coerce").notna(), "not a date (YYYY-MM-DD)"
+    if rangeChecker.get("type") == "datetime":
+        return pd.to_datetime(values, format="ISO8601", errors="coerce").notna(), "not a datetime (ISO 8601)"
+    return pd.Series(True, index=values.index), None
+
+def checkValues(values: pd.Series, checker: dict) -> list:
+    '''
+    Validates the non-empty values of a column and returns (mask of invalid
+    values, error message) pairs.
+    '''
+    errors = []
+    if checker["ranges"]:
+        rangeResults = [checkRange(values, rangeChecker) for rangeChecker in checker["ranges"]]
+        valid = rangeResults[0][0]
+        for rangeValid, _ in rangeResults[1:]:
+            valid = valid | rangeValid
+        if len(rangeResults) == 1:
+            message = rangeResults[0][1]
+        else:
+            message = "matches none of " + ", ".join(rangeChecker["range"] for rangeChecker in checker["ranges"])
+        errors.append((~valid, message))
+    if checker["pattern"] is not None:
+        # search semantics like the DataHarmonizer, patterns anchor themselves with ^ and $
+        matches = [checker["pattern"].search(value) is not None for value in values]
+        errors.append((~pd.Series(matches, index=values.index, dtype=bool), "does not match the pattern " + checker["pattern"].pattern))
+    if checker["minimum"] is not None or checker["maximum"] is not None:
+        numbers = pd.to_numeric(values, errors="coerce")
+        if checker["minimum"] is not None:
+            errors.append((numbers < checker["minimum"], "below the minimum value " + str(checker["minimum"])))
+        if checker["maximum"] is not None:
+            errors.append((numbers > checker["maximum"], "above the maximum value " + str(checker["maximum"])))
+    return errors
+
+def validateColumn(column: pd.Series, checker: dict) -> pd.DataFrame:
+    '''
+    Validates one column of a chunk vectorized and returns its invalid cells.
+    '''
+    # submissions repeat the same values a lot, so the string operations only run on the distinct values
+    empty = column.isin({value for value in column.unique() if not value.strip()}).to_numpy()
+    reports = []
+    if checker["required"] and empty.any():
+        reports.append(pd.DataFrame({"row": column.index[empty], "value": "", "error": "required value missing"}))
+    values = column[~empty]
+    if checker["multivalued"]:
+        values = values.str.split(MULTIVALUE_SEPARATOR).explode()
+        values = values.map({value: value.strip() for value in values.unique()})
+        values = values[values.ne("").to_numpy()]
+    uniqueValues = pd.Series(values.unique(), dtype=str)
+    for invalid, message in checkValues(uniqueValues, checker):
+        if invalid.any():
+            invalidCells = values.isin(set(uniqueValues[invalid])).to_numpy()
+            reports.append(pd.DataFrame({"row": values.index[invalidCells], "value": values[invalidCells].to_numpy(), "error": message}))
+    if not reports:
+        return pd.DataFrame(columns=REPORT_COLUMNS)
+    report = pd.concat(reports, ignore_index=True)
+    report["column"] = column.name
+    return report
+
+def mapColumns(header: list, checkers: list) -> tuple:
+    '''
+    Assigns the columns of the submission to the checkers by the name or the
+    title of the slot. Returns the assignment and the unknown columns.
+    '''
+    checkersByName = {}
+    for checker in checkers:
+        checkersByName[checker["name"]] = checker
+        if checker["title"]:
+            checkersByName.setdefault(checker["title"], checker)
+    assignment = {}
+    unknownColumns = []
+    for column in header:
+        if column in checkersByName:
+            assignment[column] = checkersByName[column]
+        else:
+            unknownColumns.append(column)
+    return assignment, unknownColumns
+
+def validateChunk(chunk: pd.DataFrame, checkers: list) -> pd.DataFrame:
+    '''
+    Validates all columns of a chunk. The index of the chunk is the row number
+    within the submission, which is used in the report.
+    '''
+    assignment, _ = mapColumns(list(chunk.columns), checkers)
+    reports = [validateColumn(chunk[column], checker) for column, checker in assignment.items()]
+    reports = [report for report in reports if not report.empty]
+    if not reports:
+        return pd.DataFrame(columns=REPORT_COLUMNS)
+    return pd.concat(reports, ignore_index=True).sort_values(["row"], kind="stable")[REPORT_COLUMNS]
+
+def initWorker(pathToScheme: str, className: str):
+    global workerCheckers
+    workerCheckers = compileClass(loadScheme(pathToScheme), className)
+
+def validateChunkInWorker(chunk: pd.DataFrame) -> pd.DataFrame:
+    return validateChunk(chunk, workerCheckers)
+
+def readSubmission(pathToSubmission: str, chunkSize: int):
+    '''
+    Yields the submission chunk by chunk with all values as strings. The index
+    of the chunks is the row number in the submission, starting at 1.
+    '''
+    separator = "," if pathToSubmission.lower().endswith(".csv") else "\t"
+    rowOffset = 1
+    for chunk in pd.read_csv(pathToSubmission, sep=separator, dtype=str, keep_default_na=False, chunksize=chunkSize, quoting=csv.QUOTE_MINIMAL):
+        chunk.index = pd.RangeIndex(rowOffset, rowOffset + len(chunk))
+        rowOffset += len(chunk)
+        yield chunk
+
+def validateSubmission(pathToScheme: str, className: str, pathToSubmission: str, pathToReport: str, jobs: int = 1, chunkSize: int = 50000) -> int:
+    '''
+    Validates a submission against a class of the scheme and writes all invalid
+    cells to the report (TSV). Chunks are validated by jobs processes in
+    parallel, the report keeps the order of the rows. Returns the number of
+    invalid cells.
+    '''
+    checkers = compileClass(loadScheme(pathToScheme), className)
+    separator = "," if pathToSubmission.lower().endswith(".csv") else "\t"
+    with open(pathToSubmission, "r", newline="") as file:
+        header = next(csv.reader(file, delimiter=separator), [])
+    assignment, unknownColumns = mapColumns(header, checkers)
+    for column in unknownColumns:
+        print(f"Warning: column {column} is not a slot of {className} and is not validated.\n")
+    assignedSlots = {checker["name"] for checker in assignment.values()}
+    numberOfErrors = 0
+    numberOfRows = 0
+    with getProfiler().stage("validate " + os.path.basename(pathToSubmission), "validation") as record, open(pathToReport, "w", newline="") as reportFile:
+        reportFile.write("\t".join(REPORT_COLUMNS) + "\n")
+        # row 0 stands for the header of the submission
+        for checker in checkers:
+            if checker["name"] not in assignedSlots and checker["required"]:
+                reportFile.write("\t".join(["0", checker["name"], "", "required column missing"]) + "\n")
+                numberOfErrors += 1
+
+        def writeReport(report: pd.DataFrame):
+            # tabs and line breaks of quoted values would break the lines of the report
+            values = [value.replace("\t", " ").replace("\n", " ") for value in report["value"].tolist()]
+            reportFile.writelines(f"{row}\t{column}\t{value}\t{error}\n" for row, column, value, error in zip(report["row"].tolist(), report["column"].tolist(), values, report["error"].tolist()))
+            return len(report)
+
+        chunks = readSubmission(pathToSubmission, chunkSize)
+        if jobs > 1:
+            with ProcessPoolExecutor(max_workers=jobs, initializer=initWorker, initargs=(pathToScheme, className)) as executor:
+                # only a limited number of chunks is in flight, so the submission is streamed
+                pending = []
+                for chunk in chunks:
+                    numberOfRows += len(chunk)
+                    pending.append(executor.submit(validateChunkInWorker, chunk))
+                    if len(pending) >= 2 * jobs:
+                        numberOfErrors += writeReport(pending.pop(0).result())
+                for future in pending:
+                    numberOfErrors += writeReport(future.result())
+        else:
+            for chunk in chunks:
+                numberOfRows += len(chunk)
+                numberOfErrors += writeReport(validateChunk(chunk, checkers))
+        record["counters"]["rows"] = numberOfRows
+        record["counters"]["errors"] = numberOfErrors
+    print(f"Validated {numberOfRows} rows of {pathToSubmission}, found {numberOfErrors} invalid cells. The report is located at {pathToReport}.\n")
+    return numberOfErrors
+
+if __name__ == "__main__":
+    parser = arg.ArgumentParser(
+        prog='DZIF microbial OMICs Database Submission Validator',
+        description='This piece of software validates metadata submissions (TSV or CSV) against a class of the metadata scheme of the DZIF microbial OMICs Database.',
+        epilog='Released under MIT License.')
+    parser.add_argument("--scheme", default="final" + os.sep + "metaDZIF.yaml", help="path to the final metadata scheme", type=str)
+    parser.add_argument("--class", dest="className", required=True, help="class (template) of the scheme the submission is validated against", type=str)
+    parser.add_argument("--input", required=True, help="submission to validate, a .csv file or a tab separated file", type=str)
+    parser.add_argument("--report", default="validation_report.tsv", help="path of the report with one line per invalid cell", type=str)
+    parser.add_argument("--jobs", default=1, help="number of processes validating chunks in parallel", type=int)
+    parser.add_argument("--chunk-size", default=50000, help="number of rows validated at once", type=int)
+    addProfilingArguments(parser)
+    args = parser.parse_args()
+    startProfiling(args, parser)
+    numberOfErrors = validateSubmission(args.scheme, args.className, args.input, args.report, args.jobs, args.chunk_size)
+    finishProfiling(args, "schemeValidator")
+    sys.exit(1 if numberOfErrors > 0 else 0)
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+#
+#   Date:   18.10.2026
+#
+#   Persisted index of the controlled vocabularies
+#   of the final metadata scheme for the lookup of
+#   terms by id and label, prefix and token search.
+#   Can be served by a small local HTTP endpoint.
+#
+##################################################
+import argparse as arg
+import bisect
+import heapq
+import json
+import os
+import re
+import yaml
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, unquote
+
+INDEX_VERSION = 1
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+DEFAULT_LIMIT = 20
+
+
+def getTokens(text: str) -> list:
+    return TOKEN_PATTERN.findall(text.casefold())
+
+def splitLabel(text: str, termId: str) -> str:
+    '''
+    Returns the label of a permissible value without the id, which is appended
+    as " [ID]" to ontology terms and as ", ID" to organizations.
+    '''
+    if termId:
+        for suffix in [" [" + termId + "]", ", " + termId]:
+            if text.endswith(suffix):
+                return text[:-len(suffix)]
+    return text
+
+
+class VocabularyIndex:
+    '''
+    The entries (enum, text, id, label) of all permissible values together with
+    the lookup tables: ids and labels to entries, the casefolded labels sorted
+    for the prefix search and the postings of every token for the token search.
+    '''
+
+    def __init__(self, entries: list, idIndex: dict = None, labelIndex: dict = None, sortedLabels: list = None, tokenIndex: dict = None):
+        self.entries = entries
+        if idIndex is None:
+            idIndex, labelIndex, sortedLabels, tokenIndex = self.buildTables(entries)
+        self.idIndex = idIndex
+        self.labelIndex = labelIndex
+        self.sortedLabels = sortedLabels
+        self.sortedLabelKeys = [label for label, _ in sortedLabels]
+        # position of every entry in the label order, used to rank the token search
+        self.labelRank = [0] * len(entries)
+        for rank, (_, position) in enumerate(sortedLabels):
+            self.labelRank[position] = rank
+        self.tokenIndex = tokenIndex
+        self.sortedTokens = sorted(tokenIndex.keys())
+
+    @staticmethod
+    def buildTables(entries: list) -> tuple:
+        idIndex = {}
+        labelIndex = {}
+        tokenIndex = {}
+        for position, entry in enumerate(entries):
+            if entry["id"]:
+                idIndex.setdefault(entry["id"], []).append(position)
+            labelIndex.setdefault(entry["label"], []).append(position)
+            if entry["text"] != entry["label"]:
+                labelIndex.setdefault(entry["text"], []).append(position)
+            for token in dict.fromkeys(getTokens(entry["text"])):
+                tokenIndex.setdefault(token, []).append(position)
+        sortedLabels = sorted((entry["label"].casefold(), position) for position, entry in enumerate(entries))
+        return idIndex, labelIndex, sortedLabels, tokenIndex
+
+    @classmethod
+    def fromScheme(cls, scheme: dict):
+        '''
+        Builds the index from the enums of a (final) LinkML scheme.
+        '''
+        entries = []
+        for enumName, enum in (scheme.get("enums") or {}).items():
+            for text, value in ((enum or {}).get("permissible_values") or {}).items():
+                text = str(text)
+                termId = str(value["meaning"]) if isinstance(value, dict) and value.get("meaning") else None
+                entries.append({"enum": enumName, "text": text, "id": termId, "label": splitLabel(text, termId)})
+        return cls(entries)
+
+    @classmethod
+    def fromSchemeFile(cls, pathToScheme: str):
+        with open(pathToScheme, "r") as file:
+            # the C loader is considerably faster for schemes with large enums
+            return cls.fromScheme(yaml.load(file, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader)))
+
+    def save(self, pathToIndex: str):
+        data = {
+            "version": INDEX_VERSION,
+            "entries": self.entries,
+            "ids": self.idIndex,
+            "labels": self.labelIndex,
+            "sorted_labels": self.sortedLabels,
+            "tokens": self.tokenIndex
+        }
+        with open(pathToIndex + ".tmp", "w") as file:
+            json.dump(data, file, separators=(",", ":"))
+        os.replace(pathToIndex + ".tmp", pathToIndex)
+
+    @classmethod
+    def load(cls, pathToIndex: str):
+        with open(pathToIndex, "r") as file:
+            data = json.load(file)
+        if data.get("version") != INDEX_VERSION:
+            raise ValueError(pathToIndex + " was written by another version of the vocabulary index, build it again")
+        return cls(data["entries"], data["ids"], data["labels"], [tuple(item) for item in data["sorted_labels"]], data["tokens"])
+
+    def getEntries(self, positions, enum: str = None, limit: int = None) -> list:
+        results = []
+        for position in positions:
+            entry = self.entries[position]
+            if enum is not None and entry["enum"] != enum:
+                continue
+            results.append(entry)
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+
+    def lookupId(self, termId: str, enum: str = None) -> list:
+        '''
+        Returns the entries with the id (e.g. UBERON:0000948 or a ROR url), one
+        per enum the term is part of.
+        '''
+        return self.getEntries(self.idIndex.get(termId, []), enum)
+
+    def lookupLabel(self, label: str, enum: str = None) -> list:
+        '''
+        Returns the entries with exactly this label or text of the permissible value.
+        '''
+        return self.getEntries(self.labelIndex.get(label, []), enum)
+
+    def prefixSearch(self, prefix: str, enum: str = None, limit: int = DEFAULT_LIMIT) -> list:
+        '''
+        Returns the entries whose label starts with prefix, ignoring the case,
+        ordered by label.
+        '''
+        prefix = prefix.casefold()
+        start = bisect.bisect_left(self.sortedLabelKeys, prefix)
+        stop = bisect.bisect_left(self.sortedLabelKeys, prefix + "\U0010ffff", start)
+        return self.getEntries((position for _, position in self.sortedLabels[start:stop]), enum, limit)
+
+    def tokenSearch(self, query: str, enum: str = None, limit: int = DEFAULT_LIMIT) -> list:
+        '''
+        Returns the entries containing all words of the query, the last word may
+        be incomplete (autocomplete). The entries are ordered by label.
+        '''
+        tokens = getTokens(query)
+        if not tokens:
+            return []
+        postings = [set(self.tokenIndex.get(token, [])) for token in tokens[:-1]]
+        # the last word matches every token it is a prefix of
+        start = bisect.bisect_left(self.sortedTokens, tokens[-1])
+        stop = bisect.bisect_left(self.sortedTokens, tokens[-1] + "\U0010ffff", start)
+        lastPosting = set()
+        for token in self.sortedTokens[start:stop]:
+            lastPosting.update(self.tokenIndex[token])
+        postings.append(lastPosting)
+        postings.sort(key=len)
+        positions = postings[0].intersection(*postings[1:])
+        if enum is not None:
+            positions = [position for position in positions if self.entries[position]["enum"] == enum]
+        return self.getEntries(heapq.nsmallest(limit, positions, key=self.labelRank.__getitem__))
+
+
+def createRequestHandler(index: VocabularyIndex):
+    '''
+    Returns a request handler answering
+        /id/<id>, /label?q=, /prefix?q= and /search?q=
+    with JSON lists of entries, the optional parameters enum and limit restrict
+    the results.
+    '''
+
+    class VocabularyRequestHandler(BaseHTTPRequestHandler):
+
+        def sendJSON(self, status: int, content):
+            body = json.dumps(content).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            parameters = {key: values[0] for key, values in parse_qs(url.query).items()}
+            enum = parameters.get("enum")
+            query = parameters.get("q", "")
+            try:
+                limit = int(parameters.get("limit", DEFAULT_LIMIT))
+            except ValueError:
+                return self.sendJSON(400, {"error": "limit has to be a number"})
+            if url.path.startswith("/id/"):
+                return self.sendJSON(200, index.lookupId(unquote(url.path[len("/id/"):]), enum))
+            if url.path == "/label":
+                return self.sendJSON(200, index.lookupLabel(query, enum))
+            if url.path == "/prefix":
+                return self.sendJSON(200, index.prefixSearch(query, enum, limit))
+            if url.path == "/search":
+                return self.sendJSON(200, index.tokenSearch(query, enum, limit))
+            return self.sendJSON(404, {"error": "unknown endpoint, use /id/<id>, /label, /prefix or /search"})
+
+        def log_message(self, format, *args):
+            # the lookups of curation tools would flood the output
+            return
+
+    return VocabularyRequestHandler
+
+def serve(index: VocabularyIndex, host: str = "127.0.0.1", port: int = 8080):
+    server = ThreadingHTTPServer((host, port), createRequestHandler(index))
+    print(f"Serving {len(index.entries)} terms at http://{host}:{port}/ (stop with Ctrl+C).\n")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    parser = arg.ArgumentParser(
+        prog='DZIF microbial OMICs Database Vocabulary Index',
+        description='This piece of software indexes the controlled vocabularies of the final metadata scheme of the DZIF microbial OMICs Database and looks up or serves their terms.',
+        epilog='Released under MIT License.')
+    parser.add_argument("--index", default="final" + os.sep + "vocabularyIndex.json", help="path of the persisted index", type=str)
+    parser.add_argument("--build", metavar="SCHEME", help="build the index from this final metadata scheme before any lookup", type=str)
+    parser.add_argument("--id", help="print the terms with this id", type=str)
+    parser.add_argument("--label", help="print the terms with exactly this label", type=str)
+    parser.add_argument("--prefix", help="print the terms whose label starts with this prefix", type=str)
+    parser.add_argument("--search", help="print the terms containing all words of this query", type=str)
+    parser.add_argument("--enum", help="restrict the lookups to this enum", type=str)
+    parser.add_argument("--limit", default=DEFAULT_LIMIT, help="maximal number of terms of the prefix and token search", type=int)
+    parser.add_argument("--serve", action="store_true", help="serve the lookups by a local HTTP endpoint")
+    parser.add_argument("--host", default="127.0.0.1", type=str)
+    parser.add_argument("--port", default=8080, type=int)
+    args = parser.parse_args()
+    if args.build is not None:
+        vocabularyIndex = VocabularyIndex.fromSchemeFile(args.build)
+        vocabularyIndex.save(args.index)
+        print(f"Indexed {len(vocabularyIndex.entries)} terms into {args.index}.\n")
+    else:
+        vocabularyIndex = VocabularyIndex.load(args.index)
+    if args.id is not None:
+        print(json.dumps(vocabularyIndex.lookupId(args.id, args.enum), indent=2))
+    if args.label is not None:
+        print(json.dumps(vocabularyIndex.lookupLabel(args.label, args.enum), indent=2))
+    if args.prefix is not None:
+        print(json.dumps(vocabularyIndex.prefixSearch(args.prefix, args.enum, args.limit), indent=2))
+    if args.search is not None:
+        print(json.dumps(vocabularyIndex.tokenSearch(args.search, args.enum, args.limit), indent=2))
+    if args.serve:
+        serve(vocabularyIndex, args.host, args.port)
@@ -0,0 +1,74 @@
+import os
+import zipfile
+
+import pytest
+
+from fileHandler.archiveExtractor import extractArchive, selectMembers
+
+
+def writeArchive(pathToArchive, members):
+    with zipfile.ZipFile(pathToArchive, "w") as archive:
+        for name, content in members.items():
+            archive.writestr(name, content)
+    return pathToArchive
+
+@pytest.fixture
+def archivePath(tmp_path):
+    return writeArchive(str(tmp_path / "release.zip"), {
+        "v1.0/": "",
+        "v1.0/ror-data.json": '[{"id": "https://ror.org/1"}]',
+        "v1.0/ror-data.csv": "id,name\nhttps://ror.org/1,Uni\n",
+        "v1.0/docs/README.md": "readme",
+    })
+
+def test_patterns_select_the_matching_files(archivePath, tmp_path):
+    target = tmp_path / "out"
+    counters = extractArchive(archivePath, str(target), patterns=["*.json"])
+    assert counters["extracted_files"] == 1
+    assert sorted(os.listdir(target / "v1.0")) == ["ror-data.json"]
+
+def test_patterns_match_the_path_or_the_file_name(archivePath, tmp_path):
+    with zipfile.ZipFile(archivePath) as archive:
+        byPath = [member.filename for member, _ in selectMembers(archive, str(tmp_path), ["v1.0/docs/*"])]
+        byName = [member.filename for member, _ in selectMembers(archive, str(tmp_path), ["README.md"])]
+    assert byPath == byName == ["v1.0/docs/README.md"]
+
+def test_strip_top_level(archivePath, tmp_path):
+    target = tmp_path / "out"
+    extractArchive(archivePath, str(target), stripTopLevel=True)
+    assert (target / "ror-data.json").read_text() == '[{"id": "https://ror.org/1"}]'
+    assert (target / "docs" / "README.md").read_text() == "readme"
+    assert not (target / "v1.0").exists()
+
+def test_unchanged_files_are_skipped(archivePath, tmp_path):
+    target = tmp_path / "out"
+    first = extractArchive(archivePath, str(target), stripTopLevel=True)
+    second = extractArchive(archivePath, str(target), stripTopLevel=True)
+    assert first == {"extracted_files": 3, "skipped_files": 0, "bytes_extracted": first["bytes_extracted"]}
+    assert second == {"extracted_files": 0, "skipped_files": 3, "bytes_extracted": 0}
+
+def test_changed_file_of_the_same_size_is_extracted_again(archivePath, tmp_path):
+    target = tmp_path / "out"
+    extractArchive(archivePath, str(target), stripTopLevel=True)
+    (target / "docs" / "README.md").write_text("READme")
+    counters = extractArchive(archivePath, str(target), stripTopLevel=True)
+    assert (counters["extracted_files"], counters["skipped_files"]) == (1, 2)
+    assert (target / "docs" / "README.md").read_text() == "readme"
+
+def test_no_matching_member(archivePath, tmp_path):
+    with pytest.raises(FileNotFoundError):
+        extractArchive(archivePath, str(tmp_path / "out"), patterns=["*.owl"])
+
+@pytest.mark.parametrize("name", ["../evil.txt", "v1.0/../../evil.txt"])
+def test_zip_slip_is_rejected(tmp_path, name):
+    pathToArchive = writeArchive(str(tmp_path / "evil.zip"), {name: "evil"})
+    target = tmp_path / "out"
+    with pytest.raises(ValueError):
+        extractArchive(pathToArchive, str(target))
+    assert not (tmp_path / "evil.txt").exists()
+    assert not target.exists()
+
+def test_dot_dot_inside_the_target_is_allowed(tmp_path):
+    pathToArchive = writeArchive(str(tmp_path / "fine.zip"), {"v1.0/../fine.txt": "fine"})
+    extractArchive(pathToArchive, str(tmp_path / "out"))
+    assert (tmp_path / "out" / "fine.txt").read_text() == "fine"
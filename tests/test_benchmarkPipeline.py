@@ -0,0 +1,13 @@
+import json
+
+from benchmark.benchmarkPipeline import main
+
+
+def test_benchmark_runs_all_stages(tmp_path):
+    pathToReport = str(tmp_path / "benchmark_report.json")
+    main(sizes=[500], rorRows=200, pathToReport=pathToReport)
+    with open(pathToReport, "r") as file:
+        report = json.load(file)
+    stages = report["results"][0]["stages"]
+    assert set(stages.keys()) >= {"parse", "graph_build", "descendant_extraction", "csv_filtering", "yaml_generation", "end_to_end"}
+    assert stages["descendant_extraction"]["terms"] > 0
@@ -0,0 +1,230 @@
+import hashlib
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from fileHandler.downloadEngine import downloadFile, downloadFiles, evictDownloadCache, getIndexPath, linkFile, lookupCache, storeInCache, writeValidators, PARTIAL_SUFFIX, VALIDATORS_SUFFIX
+
+CONTENT = bytes(range(256)) * 64
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    '''
+    Serves server.content with an ETag, answers Range requests with 206 (or
+    416 beyond the end) unless server.ignoreRange is set or If-Range does not
+    match and conditional requests with 304.
+    '''
+
+    def log_message(self, format, *args):
+        pass
+
+    def getETag(self) -> str:
+        return getETag(self.server.content)
+
+    def do_HEAD(self):
+        self.server.requests.append(("HEAD", dict(self.headers)))
+        if self.headers.get("If-None-Match") == self.getETag():
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", self.getETag())
+        self.send_header("Content-Length", str(len(self.server.content)))
+        self.end_headers()
+
+    def do_GET(self):
+        self.server.requests.append(("GET", dict(self.headers)))
+        content = self.server.content
+        rangeHeader = self.headers.get("Range")
+        ifRange = self.headers.get("If-Range")
+        if rangeHeader and not self.server.ignoreRange and (self.server.ignoreIfRange or ifRange is None or ifRange == self.getETag()):
+            startByte = int(rangeHeader.split("=")[1].rstrip("-"))
+            if startByte >= len(content):
+                self.send_response(416)
+                self.send_header("Content-Range", "bytes */" + str(len(content)))
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", "bytes " + str(startByte) + "-" + str(len(content) - 1) + "/" + str(len(content)))
+            content = content[startByte:]
+        else:
+            self.send_response(200)
+        self.send_header("ETag", self.getETag())
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+@pytest.fixture
+def server():
+    httpServer = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    httpServer.content = CONTENT
+    httpServer.ignoreRange = False
+    httpServer.ignoreIfRange = False
+    httpServer.requests = []
+    httpServer.url = "http://127.0.0.1:" + str(httpServer.server_address[1]) + "/ontology.owl"
+    thread = threading.Thread(target=httpServer.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield httpServer
+    httpServer.shutdown()
+    httpServer.server_close()
+
+
+def getChecksum(content: bytes) -> str:
+    return "sha256:" + hashlib.sha256(content).hexdigest()
+
+def readFile(filePath: str) -> bytes:
+    with open(filePath, "rb") as file:
+        return file.read()
+
+
+def getETag(content: bytes) -> str:
+    return '"' + hashlib.sha256(content).hexdigest()[:16] + '"'
+
+def writePartialFile(partialPath: str, content: bytes, validators: dict = None):
+    '''
+    Leaves a partial file behind like an interrupted transfer of a file with
+    the given validators.
+    '''
+    with open(partialPath, "wb") as file:
+        file.write(content)
+    if validators is not None:
+        writeValidators(partialPath + VALIDATORS_SUFFIX, validators)
+
+
+def test_resume_of_partial_file(server, tmp_path):
+    targetPath = str(tmp_path / "ontology.owl")
+    writePartialFile(targetPath + PARTIAL_SUFFIX, CONTENT[:1000], {"ETag": getETag(CONTENT)})
+    downloadFile(server.url, targetPath, checksum=getChecksum(CONTENT))
+    assert readFile(targetPath) == CONTENT
+    assert server.requests[-1][1]["Range"] == "bytes=1000-"
+    assert server.requests[-1][1]["If-Range"] == getETag(CONTENT)
+    assert not os.path.exists(targetPath + PARTIAL_SUFFIX)
+    assert not os.path.exists(targetPath + PARTIAL_SUFFIX + VALIDATORS_SUFFIX)
+
+def test_partial_file_of_changed_file_is_not_resumed(server, tmp_path):
+    targetPath = str(tmp_path / "ontology.owl")
+    oldContent = b"old version " * 200
+    writePartialFile(targetPath + PARTIAL_SUFFIX, oldContent[:1000], {"ETag": getETag(oldContent)})
+    downloadFile(server.url, targetPath)
+    assert readFile(targetPath) == CONTENT
+
+def test_partial_file_of_changed_file_is_not_resumed_if_server_ignores_if_range(server, tmp_path):
+    server.ignoreIfRange = True
+    targetPath = str(tmp_path / "ontology.owl")
+    oldContent = b"old version " * 200
+    writePartialFile(targetPath + PARTIAL_SUFFIX, oldContent[:1000], {"ETag": getETag(oldContent)})
+    downloadFile(server.url, targetPath)
+    assert readFile(targetPath) == CONTENT
+
+def test_partial_file_of_unknown_version_is_not_resumed(server, tmp_path):
+    targetPath = str(tmp_path / "ontology.owl")
+    writePartialFile(targetPath + PARTIAL_SUFFIX, b"stale content of an older version")
+    downloadFile(server.url, targetPath)
+    assert readFile(targetPath) == CONTENT
+    assert "Range" not in server.requests[-1][1]
+
+def test_complete_partial_file_answered_with_416(server, tmp_path):
+    targetPath = str(tmp_path / "ontology.owl")
+    writePartialFile(targetPath + PARTIAL_SUFFIX, CONTENT, {"ETag": getETag(CONTENT)})
+    downloadFile(server.url, targetPath, size=len(CONTENT))
+    assert readFile(targetPath) == CONTENT
+    assert server.requests[-1][1]["Range"] == "bytes=" + str(len(CONTENT)) + "-"
+
+def test_range_request_answered_with_200_overwrites_partial_file(server, tmp_path):
+    server.ignoreRange = True
+    targetPath = str(tmp_path / "ontology.owl")
+    writePartialFile(targetPath + PARTIAL_SUFFIX, b"stale content of an older version", {"ETag": getETag(CONTENT)})
+    downloadFile(server.url, targetPath, checksum=getChecksum(CONTENT))
+    assert readFile(targetPath) == CONTENT
+
+@pytest.mark.parametrize("expected", [{"checksum": getChecksum(b"other content")}, {"size": len(CONTENT) + 1}])
+def test_mismatch_is_rejected(server, tmp_path, expected):
+    targetPath = str(tmp_path / "ontology.owl")
+    with pytest.raises(ValueError):
+        downloadFile(server.url, targetPath, **expected)
+    assert not os.path.exists(targetPath)
+    assert not os.path.exists(targetPath + PARTIAL_SUFFIX)
+
+def test_cache_hit_from_second_target(server, tmp_path):
+    pathToCache = str(tmp_path / "cache")
+    firstTarget = str(tmp_path / "first" / "ontology.owl")
+    secondTarget = str(tmp_path / "second" / "ontology.owl")
+    downloadFile(server.url, firstTarget, checksum=getChecksum(CONTENT), pathToCache=pathToCache)
+    downloadFile(server.url, secondTarget, checksum=getChecksum(CONTENT), pathToCache=pathToCache)
+    assert readFile(secondTarget) == CONTENT
+    assert [method for method, _ in server.requests] == ["GET"]
+
+def test_unpinned_url_is_revalidated(server, tmp_path):
+    pathToCache = str(tmp_path / "cache")
+    targetPath = str(tmp_path / "ontology.owl")
+    downloadFile(server.url, targetPath, pathToCache=pathToCache)
+    downloadFile(server.url, str(tmp_path / "second.owl"), pathToCache=pathToCache)
+    assert [method for method, _ in server.requests] == ["GET", "HEAD"]
+    server.content = CONTENT[::-1]
+    downloadFile(server.url, targetPath, pathToCache=pathToCache)
+    assert readFile(targetPath) == CONTENT[::-1]
+    assert [method for method, _ in server.requests] == ["GET", "HEAD", "HEAD", "GET"]
+
+def test_existing_file_is_used_if_server_is_unreachable(server, tmp_path):
+    targetPath = str(tmp_path / "ontology.owl")
+    with open(targetPath, "wb") as file:
+        file.write(CONTENT)
+    url = server.url
+    server.shutdown()
+    server.server_close()
+    assert downloadFile(url, targetPath) == targetPath
+    with pytest.raises(Exception):
+        downloadFile(url, str(tmp_path / "missing.owl"))
+
+def fillCache(pathToCache: str, folder, names: list) -> list:
+    '''
+    Stores a file of 1000 bytes per name in the cache, the first one is the
+    least recently used. Returns the urls of the files.
+    '''
+    urls = []
+    for position, name in enumerate(names):
+        filePath = str(folder / name)
+        with open(filePath, "wb") as file:
+            file.write(name.encode("utf-8") * (1000 // len(name)))
+        url = "http://example.org/" + name
+        storeInCache(pathToCache, url, filePath, {"ETag": getETag(name.encode("utf-8"))})
+        os.utime(getIndexPath(pathToCache, url), (1000 + position, 1000 + position))
+        urls.append(url)
+    return urls
+
+def test_least_recently_used_files_are_evicted(tmp_path):
+    pathToCache = str(tmp_path / "cache")
+    oldest, middle, newest = fillCache(pathToCache, tmp_path, ["a", "b", "c"])
+    evictDownloadCache(pathToCache, 2000)
+    assert lookupCache(pathToCache, oldest) is None
+    assert not os.path.exists(getIndexPath(pathToCache, oldest))
+    assert not os.path.exists(getIndexPath(pathToCache, oldest) + VALIDATORS_SUFFIX)
+    assert lookupCache(pathToCache, middle) is not None and lookupCache(pathToCache, newest) is not None
+
+def test_linked_files_are_kept(tmp_path):
+    pathToCache = str(tmp_path / "cache")
+    oldest, middle, newest = fillCache(pathToCache, tmp_path, ["a", "b", "c"])
+    targetPath = str(tmp_path / "target")
+    linkFile(lookupCache(pathToCache, oldest), targetPath)
+    evictDownloadCache(pathToCache, 0, keep=[targetPath])
+    assert lookupCache(pathToCache, oldest) is not None
+    assert lookupCache(pathToCache, middle) is None and lookupCache(pathToCache, newest) is None
+    assert readFile(targetPath) == b"a" * 1000
+
+def test_cache_hit_marks_url_as_used(server, tmp_path):
+    pathToCache = str(tmp_path / "cache")
+    downloadFile(server.url, str(tmp_path / "first.owl"), checksum=getChecksum(CONTENT), pathToCache=pathToCache)
+    os.utime(getIndexPath(pathToCache, server.url), (1000, 1000))
+    downloadFile(server.url, str(tmp_path / "second.owl"), checksum=getChecksum(CONTENT), pathToCache=pathToCache)
+    assert os.path.getmtime(getIndexPath(pathToCache, server.url)) > 1000
+
+def test_downloads_are_kept_by_the_size_limit(server, tmp_path):
+    pathToCache = str(tmp_path / "cache")
+    oldest, = fillCache(pathToCache, tmp_path, ["a"])
+    targetPath = str(tmp_path / "ontology.owl")
+    assert downloadFiles([{"URL": server.url, "target": targetPath}], pathToCache, cacheSizeLimit=0) == [targetPath]
+    assert lookupCache(pathToCache, oldest) is None
+    assert lookupCache(pathToCache, server.url) is not None
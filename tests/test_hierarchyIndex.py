@@ -0,0 +1,44 @@
+import pytest
+
+from ontoHandler.hierarchyIndex import HierarchyIndex
+
+OBO = "http://purl.obolibrary.org/obo/"
+LABEL = "http://www.w3.org/2000/01/rdf-schema#label"
+SUBCLASS = "http://www.w3.org/2000/01/rdf-schema#subClassOf"
+
+
+def buildIndex(edges: list, labels: dict = None) -> HierarchyIndex:
+    triples = [(OBO + child, SUBCLASS, OBO + parent) for child, parent in edges]
+    triples += [(OBO + term, LABEL, label) for term, label in (labels or {}).items()]
+    return HierarchyIndex.fromTriples(triples)
+
+def getDescendants(index: HierarchyIndex, roots: list) -> list:
+    return [sorted(index.terms[termId].split("/")[-1] for termId in termIds) for termIds in index.descendantsOf([index.getTermId(OBO + root) for root in roots])]
+
+
+def test_descendants_of_diamond():
+    index = buildIndex([("B", "A"), ("C", "A"), ("D", "B"), ("D", "C"), ("E", "D"), ("F", "X")])
+    assert getDescendants(index, ["A", "B", "E", "X"]) == [["B", "C", "D", "E"], ["D", "E"], [], ["F"]]
+
+def test_descendants_of_cycle_exclude_root():
+    index = buildIndex([("B", "A"), ("C", "B"), ("A", "C")])
+    assert getDescendants(index, ["A"]) == [["B", "C"]]
+
+def test_more_roots_than_one_traversal():
+    edges = [("T" + str(number), "T" + str(number - 1)) for number in range(1, 100)]
+    index = buildIndex(edges)
+    roots = ["T" + str(number) for number in range(100)]
+    descendants = getDescendants(index, roots)
+    assert [len(termIds) for termIds in descendants] == list(range(99, -1, -1))
+    assert descendants[97] == ["T98", "T99"]
+
+def test_enum_terms_sorted_by_label_with_parents():
+    index = buildIndex([("UBERON_2", "UBERON_1"), ("UBERON_3", "UBERON_1"), ("UBERON_3", "UBERON_9")], {"UBERON_1": "root", "UBERON_2": "heart", "UBERON_3": "brain", "UBERON_9": "organ"})
+    rootId = index.getTermId(OBO + "UBERON_1")
+    enumTerms = index.getEnumTerms(rootId, index.descendantsOf([rootId])[0])
+    assert list(enumTerms.values()) == [{"id": "UBERON:3", "label": "brain"}, {"id": "UBERON:2", "label": "heart"}, {"id": "UBERON:9", "label": "organ"}]
+
+def test_unknown_root_raises():
+    index = buildIndex([("B", "A")])
+    with pytest.raises(KeyError):
+        index.getTermId(OBO + "Z")
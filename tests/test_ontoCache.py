@@ -0,0 +1,33 @@
+import pytest
+
+from ontoHandler.ontoCache import encodeTriples, decodeTriples, loadCachedTriples, storeCachedTriples
+
+
+def test_round_trip():
+    triples = [
+        ("http://purl.obolibrary.org/obo/DOID_4", "http://www.w3.org/2000/01/rdf-schema#label", "disease"),
+        ("http://purl.obolibrary.org/obo/DOID_7", "http://www.w3.org/2000/01/rdf-schema#subClassOf", "http://purl.obolibrary.org/obo/DOID_4"),
+        ("http://purl.obolibrary.org/obo/DOID_7", "http://www.w3.org/2000/01/rdf-schema#label", "Krankheit äöü – \U0001F9A0"),
+        ("http://purl.obolibrary.org/obo/DOID_7", "http://www.w3.org/2000/01/rdf-schema#label", ""),
+    ]
+    assert decodeTriples(encodeTriples(triples)) == triples
+
+def test_round_trip_of_no_triples():
+    assert decodeTriples(encodeTriples([])) == []
+
+def test_foreign_data_is_rejected():
+    with pytest.raises(ValueError):
+        decodeTriples(b"not a cache entry")
+
+def test_store_and_load(tmp_path):
+    triples = [("a", "b", "c")]
+    storeCachedTriples(str(tmp_path), "key", triples, 1024 * 1024)
+    assert loadCachedTriples(str(tmp_path), "key") == triples
+    assert loadCachedTriples(str(tmp_path), "other key") is None
+
+def test_broken_entry_is_removed(tmp_path):
+    storeCachedTriples(str(tmp_path), "key", [("a", "b", "c")], 1024 * 1024)
+    pathToEntry = next(tmp_path.iterdir())
+    pathToEntry.write_bytes(pathToEntry.read_bytes()[:-4])
+    assert loadCachedTriples(str(tmp_path), "key") is None
+    assert not pathToEntry.exists()
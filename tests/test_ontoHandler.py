@@ -0,0 +1,45 @@
+import pytest
+
+from ontoHandler.ontoHandler import handlePandasDfRor
+
+pd = pytest.importorskip("pandas")
+yaml = pytest.importorskip("yaml")
+
+
+def test_quoting_of_organization_names():
+    dataFrame = pd.DataFrame({
+        "id": ["https://ror.org/04", "https://ror.org/03", "https://ror.org/02", "https://ror.org/01", "https://ror.org/05"],
+        "name": ["King's College", "The \"Best\" Institute", "O'Neill \"Center\"", "Research\\Institute", "Research\\Institute"],
+        "country.country_code": ["GB", "US", "IE", "DE", "DE"],
+    })
+    assert handlePandasDfRor(dataFrame, ["name", "id"]) == [
+        "      \"King's College, https://ror.org/04\" :\n",
+        "        text: \"King's College, https://ror.org/04\"\n",
+        "        meaning: \"https://ror.org/04\"\n",
+        "      \"O'Neill Center, https://ror.org/02\" :\n",
+        "        text: \"O'Neill Center, https://ror.org/02\"\n",
+        "        meaning: \"https://ror.org/02\"\n",
+        "      \"Research/Institute, https://ror.org/01\" :\n",
+        "        text: \"Research/Institute, https://ror.org/01\"\n",
+        "        meaning: \"https://ror.org/01\"\n",
+        "      \"Research/Institute, https://ror.org/05\" :\n",
+        "        text: \"Research/Institute, https://ror.org/05\"\n",
+        "        meaning: \"https://ror.org/05\"\n",
+        "      'The \"Best\" Institute, https://ror.org/03' :\n",
+        "        text: 'The \"Best\" Institute, https://ror.org/03'\n",
+        "        meaning: \"https://ror.org/03\"\n",
+    ]
+
+def test_generated_lines_are_valid_yaml():
+    dataFrame = pd.DataFrame({
+        "id": ["https://ror.org/01", "https://ror.org/02", "https://ror.org/03", "https://ror.org/04"],
+        "name": ["King's College", "The \"Best\" Institute", "O'Neill \"Center\"", "Research\\Institute"],
+    })
+    lines = handlePandasDfRor(dataFrame, ["name", "id"])
+    permissibleValues = yaml.safe_load("    permissible_values:\n" + "".join(lines))["permissible_values"]
+    assert permissibleValues == {
+        "King's College, https://ror.org/01": {"text": "King's College, https://ror.org/01", "meaning": "https://ror.org/01"},
+        "The \"Best\" Institute, https://ror.org/02": {"text": "The \"Best\" Institute, https://ror.org/02", "meaning": "https://ror.org/02"},
+        "O'Neill Center, https://ror.org/03": {"text": "O'Neill Center, https://ror.org/03", "meaning": "https://ror.org/03"},
+        "Research/Institute, https://ror.org/04": {"text": "Research/Institute, https://ror.org/04", "meaning": "https://ror.org/04"},
+    }
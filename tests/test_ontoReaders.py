@@ -0,0 +1,108 @@
+import json
+
+import pytest
+
+from ontoHandler.ontoReaders import readTriples, unescapeOboValue, writeTermTable
+
+OBO = "http://purl.obolibrary.org/obo/"
+LABEL = "http://www.w3.org/2000/01/rdf-schema#label"
+SUBCLASS_OF = "http://www.w3.org/2000/01/rdf-schema#subClassOf"
+
+EXPECTED_TRIPLES = {
+    (OBO + "DOID_4", LABEL, "disease"),
+    (OBO + "DOID_7", LABEL, "disease of anatomical entity"),
+    (OBO + "DOID_7", SUBCLASS_OF, OBO + "DOID_4"),
+    (OBO + "DOID_8", LABEL, "disease {with braces} ! and a bang"),
+    (OBO + "DOID_8", SUBCLASS_OF, OBO + "DOID_7"),
+    (OBO + "DOID_8", SUBCLASS_OF, OBO + "DOID_4"),
+}
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("disease", "disease"),
+    ("disease ! a comment", "disease"),
+    ('disease {source="DOID"}', "disease"),
+    ('disease {source="DOID", comment="a \\} in a modifier"} ! a comment', "disease"),
+    ("disease \\{not a modifier\\}", "disease {not a modifier}"),
+    ("disease \\! not a comment", "disease ! not a comment"),
+    ("disease{x}y", "disease{x}y"),
+    ("line\\nbreak\\Wand\\ttab", "line\nbreak and\ttab"),
+])
+def test_unescape_obo_value(value, expected):
+    assert unescapeOboValue(value) == expected
+
+def test_obo(tmp_path):
+    path = tmp_path / "doid.obo"
+    path.write_text(
+        "format-version: 1.2\n"
+        "ontology: doid\n"
+        "\n"
+        "[Term]\n"
+        "id: DOID:4\n"
+        'name: disease {source="DOID"}\n'
+        "\n"
+        "[Term]\n"
+        "id: DOID:7 ! disease of anatomical entity\n"
+        "name: disease of anatomical entity ! a comment\n"
+        "is_a: DOID:4 ! disease\n"
+        "relationship: part_of DOID:4\n"
+        "\n"
+        "[Term]\n"
+        "id: DOID:8\n"
+        "name: disease \\{with braces\\} \\! and a bang {comment=\"modifier\"} ! comment\n"
+        'is_a: DOID:7 {source="DOID"} ! disease of anatomical entity\n'
+        "is_a: DOID:4\n"
+        "\n"
+        "[Typedef]\n"
+        "id: part_of\n"
+        "name: part of\n"
+        "is_a: overlaps\n",
+        encoding="utf-8")
+    assert set(readTriples(str(path), "obo")) == EXPECTED_TRIPLES
+
+def test_obo_graphs_json(tmp_path):
+    path = tmp_path / "doid.json"
+    path.write_text(json.dumps({"graphs": [
+        {"nodes": [
+            {"id": OBO + "DOID_4", "lbl": "disease", "type": "CLASS"},
+            {"id": OBO + "DOID_7", "lbl": "disease of anatomical entity", "type": "CLASS"},
+            {"id": OBO + "part_of", "type": "PROPERTY"},
+        ], "edges": [
+            {"sub": OBO + "DOID_7", "pred": "is_a", "obj": OBO + "DOID_4"},
+            {"sub": OBO + "DOID_7", "pred": OBO + "BFO_0000050", "obj": OBO + "DOID_4"},
+        ]},
+        {"nodes": [
+            {"id": OBO + "DOID_8", "lbl": "disease {with braces} ! and a bang"},
+            {"id": "http://example.org/other", "lbl": "not an obo term"},
+        ], "edges": [
+            {"sub": OBO + "DOID_8", "pred": "is_a", "obj": OBO + "DOID_7"},
+            {"sub": OBO + "DOID_8", "pred": "is_a", "obj": OBO + "DOID_4"},
+        ]},
+    ]}), encoding="utf-8")
+    assert set(readTriples(str(path), "json")) == EXPECTED_TRIPLES
+
+def test_term_table(tmp_path):
+    path = tmp_path / "doid.tsv"
+    path.write_text(
+        "label\tid\tparents\n"
+        "disease\tDOID:4\t\n"
+        "disease of anatomical entity\t" + OBO + "DOID_7\tDOID:4\n"
+        "disease {with braces} ! and a bang\tDOID:8\tDOID:7|" + OBO + "DOID_4\n"
+        "\n",
+        encoding="utf-8")
+    assert set(readTriples(str(path), "tsv")) == EXPECTED_TRIPLES
+
+def test_term_table_round_trip(tmp_path):
+    path = tmp_path / "doid.tsv"
+    assert writeTermTable(sorted(EXPECTED_TRIPLES), str(path)) == 3
+    assert set(readTriples(str(path), "tsv")) == EXPECTED_TRIPLES
+
+def test_term_table_without_column(tmp_path):
+    path = tmp_path / "doid.tsv"
+    path.write_text("id\tlabel\nDOID:4\tdisease\n", encoding="utf-8")
+    with pytest.raises(KeyError):
+        readTriples(str(path), "tsv")
+
+def test_unsupported_format(tmp_path):
+    with pytest.raises(KeyError):
+        readTriples(str(tmp_path / "doid.ttl"), "ttl")
@@ -0,0 +1,98 @@
+import pytest
+
+from ontoHandler.ontoHandler import extractOwlTriples
+
+pytest.importorskip("rdflib")
+
+OBO = "http://purl.obolibrary.org/obo/"
+LABEL = "http://www.w3.org/2000/01/rdf-schema#label"
+SUBCLASS_OF = "http://www.w3.org/2000/01/rdf-schema#subClassOf"
+ID = "http://www.geneontology.org/formats/oboInOwl#id"
+
+ONTOLOGY = '''<?xml version="1.0"?>
+<rdf:RDF xmlns="http://purl.obolibrary.org/obo/doid.owl#"
+     xml:base="http://purl.obolibrary.org/obo/doid.owl"
+     xmlns:owl="http://www.w3.org/2002/07/owl#"
+     xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+     xmlns:rdfs="http://www.w3.org/2000/01/rdf-schema#"
+     xmlns:oboInOwl="http://www.geneontology.org/formats/oboInOwl#">
+    <owl:Ontology rdf:about="http://purl.obolibrary.org/obo/doid.owl"/>
+    <owl:Class rdf:about="http://purl.obolibrary.org/obo/DOID_4">
+        <oboInOwl:id rdf:datatype="http://www.w3.org/2001/XMLSchema#string">DOID:4</oboInOwl:id>
+        <rdfs:label xml:lang="en">disease</rdfs:label>
+    </owl:Class>
+    <owl:Class rdf:about="http://purl.obolibrary.org/obo/DOID_7">
+        <rdfs:subClassOf rdf:resource="http://purl.obolibrary.org/obo/DOID_4"/>
+        <rdfs:label xml:lang="de">Krankheit der Anatomie</rdfs:label>
+        <rdfs:subClassOf>
+            <owl:Class rdf:about="http://purl.obolibrary.org/obo/DOID_8">
+                <rdfs:label>nested disease</rdfs:label>
+                <rdfs:subClassOf>
+                    <owl:Class rdf:about="http://purl.obolibrary.org/obo/DOID_4"/>
+                </rdfs:subClassOf>
+            </owl:Class>
+        </rdfs:subClassOf>
+        <rdfs:subClassOf>
+            <owl:Restriction>
+                <owl:onProperty rdf:resource="http://purl.obolibrary.org/obo/RO_0002452"/>
+                <owl:someValuesFrom rdf:resource="http://purl.obolibrary.org/obo/DOID_4"/>
+            </owl:Restriction>
+        </rdfs:subClassOf>
+        <rdfs:subClassOf rdf:nodeID="restriction1"/>
+    </owl:Class>
+    <rdf:Description rdf:nodeID="restriction1">
+        <rdfs:label>blank node label</rdfs:label>
+        <rdfs:subClassOf rdf:resource="http://purl.obolibrary.org/obo/DOID_4"/>
+    </rdf:Description>
+    <owl:Class rdf:about="http://purl.obolibrary.org/obo/DOID_9" rdfs:label="label as attribute" oboInOwl:id="DOID:9">
+        <owl:equivalentClass>
+            <owl:Class>
+                <owl:intersectionOf rdf:parseType="Collection">
+                    <rdf:Description rdf:about="http://purl.obolibrary.org/obo/DOID_4"/>
+                    <owl:Class rdf:about="http://purl.obolibrary.org/obo/DOID_10">
+                        <rdfs:label xml:lang="en">member of a collection</rdfs:label>
+                        <rdfs:subClassOf rdf:resource="http://purl.obolibrary.org/obo/DOID_4"/>
+                    </owl:Class>
+                </owl:intersectionOf>
+            </owl:Class>
+        </owl:equivalentClass>
+        <rdfs:subClassOf rdf:parseType="Resource">
+            <rdfs:label>label of a blank node</rdfs:label>
+        </rdfs:subClassOf>
+    </owl:Class>
+    <owl:Axiom>
+        <owl:annotatedSource rdf:resource="http://purl.obolibrary.org/obo/DOID_4"/>
+        <owl:annotatedProperty rdf:resource="http://www.w3.org/2000/01/rdf-schema#label"/>
+        <rdfs:label>axiom label</rdfs:label>
+    </owl:Axiom>
+    <owl:Class rdf:ID="DOID_11">
+        <rdfs:label>relative to xml:base</rdfs:label>
+    </owl:Class>
+</rdf:RDF>
+'''
+
+
+@pytest.fixture
+def ontologyPath(tmp_path):
+    path = tmp_path / "doid.owl"
+    path.write_text(ONTOLOGY, encoding="utf-8")
+    return str(path)
+
+def test_streaming_matches_rdflib(ontologyPath):
+    assert set(extractOwlTriples(ontologyPath, streaming=True)) == set(extractOwlTriples(ontologyPath, streaming=False))
+
+def test_streaming_statements(ontologyPath):
+    assert set(extractOwlTriples(ontologyPath, streaming=True)) == {
+        (OBO + "DOID_4", ID, "DOID:4"),
+        (OBO + "DOID_4", LABEL, "disease"),
+        (OBO + "DOID_7", SUBCLASS_OF, OBO + "DOID_4"),
+        (OBO + "DOID_7", LABEL, "Krankheit der Anatomie"),
+        (OBO + "DOID_7", SUBCLASS_OF, OBO + "DOID_8"),
+        (OBO + "DOID_8", LABEL, "nested disease"),
+        (OBO + "DOID_8", SUBCLASS_OF, OBO + "DOID_4"),
+        (OBO + "DOID_9", LABEL, "label as attribute"),
+        (OBO + "DOID_9", ID, "DOID:9"),
+        (OBO + "DOID_10", LABEL, "member of a collection"),
+        (OBO + "DOID_10", SUBCLASS_OF, OBO + "DOID_4"),
+        ("http://purl.obolibrary.org/obo/doid.owl#DOID_11", LABEL, "relative to xml:base"),
+    }
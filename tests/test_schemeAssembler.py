@@ -0,0 +1,42 @@
+import pytest
+
+from ontoHandler.schemeAssembler import getTermsToReplace, indexPlaceholders, assembleScheme, getBlockPositions, getEnumNames
+
+SCHEME = ["id: scheme\n", "enums:\n", "#<disorder enum>\n", "  site:\n", "#<sample site enum>\n", "prefixes:\n", "#<prefixes>\n"]
+TERMS = ["#<disorder enum>\n", "#<sample site enum>\n", "#<prefixes>\n"]
+
+
+def test_terms_to_replace_in_config_order():
+    configYAML = {"config": {
+        "ontologies": {"DOID": {"enum": {"disorder_enum": {"term_to_replace": TERMS[0]}}}, "UBERON": {"enum": {"sample_site_enum": {"term_to_replace": TERMS[1]}}}},
+        "prefixes_controlled_vocabularies": {"term_to_replace": TERMS[2]},
+    }}
+    assert getTermsToReplace(configYAML) == TERMS
+
+def test_assemble_replaces_placeholders_with_blocks():
+    placeholderIndex = indexPlaceholders(SCHEME, TERMS)
+    yamlBlocks = {TERMS[0]: ["  a\n", "  b\n"], TERMS[2]: []}
+    assert list(assembleScheme(SCHEME, placeholderIndex, yamlBlocks)) == ["id: scheme\n", "enums:\n", "  a\n", "  b\n", "  site:\n", "#<sample site enum>\n", "prefixes:\n"]
+
+def test_block_positions_match_assembled_scheme():
+    placeholderIndex = indexPlaceholders(SCHEME, TERMS)
+    yamlBlocks = {TERMS[0]: ["  a\n", "  b\n", "  c\n"], TERMS[1]: ["  d\n"], TERMS[2]: ["  p\n", "  q\n"]}
+    lines = list(assembleScheme(SCHEME, placeholderIndex, yamlBlocks))
+    for term, (start, length) in getBlockPositions(placeholderIndex, yamlBlocks).items():
+        assert lines[start:start + length] == yamlBlocks[term]
+
+def test_missing_placeholder_is_reported(capsys):
+    assert indexPlaceholders(SCHEME, TERMS + ["#<missing enum>\n"]) == {TERMS[0]: 2, TERMS[1]: 4, TERMS[2]: 6}
+    assert "#<missing enum>" in capsys.readouterr().out
+
+def test_duplicated_placeholder_raises():
+    with pytest.raises(ValueError):
+        indexPlaceholders(SCHEME + [TERMS[1]], TERMS)
+
+def test_enum_names_of_placeholders():
+    schemeLines = ["prefixes:\n", "#<prefixes>\n", "enums:\n", "  disorder enum:\n", "    permissible_values:\n", "      not provided:\n", "#<disorder enum>\n", "\n", "  \"sample site enum\":\n", "    permissible_values:\n", "#<sample site enum uberon>\n", "#<sample site enum envo>\n", "slots:\n", "#<unused>\n"]
+    assert getEnumNames(schemeLines, ["#<prefixes>\n", "#<disorder enum>\n", "#<sample site enum uberon>\n", "#<sample site enum envo>\n", "#<unused>\n"]) == {
+        "#<disorder enum>\n": "disorder enum",
+        "#<sample site enum uberon>\n": "sample site enum",
+        "#<sample site enum envo>\n": "sample site enum",
+    }
@@ -0,0 +1,134 @@
+import pytest
+
+pytest.importorskip("pandas")
+
+from schemeValidator.schemeValidator import compileClass, loadScheme, validateSubmission
+
+SCHEME = '''id: https://example.org/metaDZIF
+name: metaDZIF
+classes:
+  dh_interface:
+    name: dh_interface
+  Sample:
+    name: Sample
+    slots:
+      - sample_id
+      - host
+      - isolate_id
+      - collection_date
+      - body_sites
+      - read_count
+      - library_kit
+    slot_usage:
+      read_count:
+        required: true
+slots:
+  sample_id:
+    name: sample_id
+    title: sample ID
+    range: WhitespaceMinimizedString
+    required: true
+  host:
+    name: host
+    range: HostMenu
+  isolate_id:
+    name: isolate_id
+    pattern: ^ISO-[0-9]{4}$
+  collection_date:
+    name: collection_date
+    any_of:
+      - range: date
+      - range: NullValueMenu
+  body_sites:
+    name: body_sites
+    range: BodySiteMenu
+    multivalued: true
+  read_count:
+    name: read_count
+    range: integer
+    minimum_value: 0
+  library_kit:
+    name: library_kit
+    range: WhitespaceMinimizedString
+    required: true
+enums:
+  HostMenu:
+    permissible_values:
+      Homo sapiens [NCBITaxon:9606] :
+        text: Homo sapiens [NCBITaxon:9606]
+      Mus musculus [NCBITaxon:10090] :
+        text: Mus musculus [NCBITaxon:10090]
+  NullValueMenu:
+    permissible_values:
+      Not Applicable:
+        text: Not Applicable
+      Missing:
+        text: Missing
+  BodySiteMenu:
+    permissible_values:
+      gut [UBERON:0001555] :
+        text: gut [UBERON:0001555]
+      skin [UBERON:0002097] :
+        text: skin [UBERON:0002097]
+'''
+
+SUBMISSION = [
+    ["sample ID", "host", "isolate_id", "collection_date", "body_sites", "read_count", "comment"],
+    ["S1", "Homo sapiens [NCBITaxon:9606]", "ISO-0001", "2024-02-29", "gut [UBERON:0001555]; skin [UBERON:0002097]", "10", "fine"],
+    ["S2", "Homo sapiens", "ISO-1", "2023-02-29", "gut [UBERON:0001555];liver", "1.5", ""],
+    ["", "", "", "Missing", "", "-3", ""],
+    ["S4", "Mus musculus [NCBITaxon:10090]", "xISO-0004", "yesterday", "skin [UBERON:0002097];", "", ""],
+    ["S5", "Homo sapiens", "ISO-0005", "Not Applicable", "nose", "abc", ""],
+]
+
+EXPECTED_REPORT = [
+    ["row", "column", "value", "error"],
+    ["0", "library_kit", "", "required column missing"],
+    ["2", "host", "Homo sapiens", "not a permissible value of HostMenu"],
+    ["2", "isolate_id", "ISO-1", "does not match the pattern ^ISO-[0-9]{4}$"],
+    ["2", "collection_date", "2023-02-29", "matches none of date, NullValueMenu"],
+    ["2", "body_sites", "liver", "not a permissible value of BodySiteMenu"],
+    ["2", "read_count", "1.5", "not a valid integer"],
+    ["3", "sample ID", "", "required value missing"],
+    ["3", "read_count", "-3", "below the minimum value 0"],
+    ["4", "isolate_id", "xISO-0004", "does not match the pattern ^ISO-[0-9]{4}$"],
+    ["4", "collection_date", "yesterday", "matches none of date, NullValueMenu"],
+    ["4", "read_count", "", "required value missing"],
+    ["5", "host", "Homo sapiens", "not a permissible value of HostMenu"],
+    ["5", "body_sites", "nose", "not a permissible value of BodySiteMenu"],
+    ["5", "read_count", "abc", "not a valid integer"],
+]
+
+
+@pytest.fixture
+def files(tmp_path):
+    pathToScheme = tmp_path / "metaDZIF.yaml"
+    pathToScheme.write_text(SCHEME)
+    pathToSubmission = tmp_path / "submission.tsv"
+    pathToSubmission.write_text("".join("\t".join(row) + "\n" for row in SUBMISSION))
+    return str(pathToScheme), str(pathToSubmission)
+
+def readReport(pathToReport):
+    with open(pathToReport) as file:
+        return [line.rstrip("\n").split("\t") for line in file]
+
+def test_slot_usage_overrides_the_slot(files):
+    checkers = {checker["name"]: checker for checker in compileClass(loadScheme(files[0]), "Sample")}
+    assert checkers["read_count"]["required"]
+    assert checkers["host"]["ranges"][0]["enum"] == {"Homo sapiens [NCBITaxon:9606]", "Mus musculus [NCBITaxon:10090]"}
+
+def test_unknown_class(files):
+    with pytest.raises(KeyError):
+        compileClass(loadScheme(files[0]), "Assay")
+
+def test_report(files, tmp_path):
+    pathToReport = str(tmp_path / "report.tsv")
+    assert validateSubmission(files[0], "Sample", files[1], pathToReport) == len(EXPECTED_REPORT) - 1
+    assert readReport(pathToReport) == EXPECTED_REPORT
+
+def test_parallel_report_equals_serial_report(files, tmp_path):
+    serialReport = str(tmp_path / "serial.tsv")
+    parallelReport = str(tmp_path / "parallel.tsv")
+    validateSubmission(files[0], "Sample", files[1], serialReport, jobs=1, chunkSize=2)
+    validateSubmission(files[0], "Sample", files[1], parallelReport, jobs=2, chunkSize=2)
+    assert readReport(serialReport) == readReport(parallelReport) == EXPECTED_REPORT
@@ -0,0 +1,35 @@
+from ontoHandler.schemeAssembler import indexPlaceholders, assembleScheme, getBlockPositions
+from ontoHandler.vocabularyDiff import diffTerms, patchScheme
+
+SCHEME = ["id: scheme\n", "#<first>\n", "between\n", "#<second>\n", "#<third>\n", "end\n"]
+TERMS = ["#<first>\n", "#<second>\n", "#<third>\n"]
+
+
+def assemble(yamlBlocks: dict) -> tuple:
+    placeholderIndex = indexPlaceholders(SCHEME, TERMS)
+    return list(assembleScheme(SCHEME, placeholderIndex, yamlBlocks)), getBlockPositions(placeholderIndex, yamlBlocks)
+
+
+def test_patch_equals_full_build():
+    oldBlocks = {TERMS[0]: ["a\n", "b\n"], TERMS[1]: ["c\n"], TERMS[2]: ["d\n", "e\n"]}
+    newBlocks = {TERMS[0]: ["a\n"], TERMS[1]: ["c\n", "c2\n", "c3\n"], TERMS[2]: ["d\n", "e\n"]}
+    oldLines, oldPositions = assemble(oldBlocks)
+    patchedLines, newPositions = patchScheme(oldLines, oldPositions, {TERMS[0]: newBlocks[TERMS[0]], TERMS[1]: newBlocks[TERMS[1]]})
+    assert (patchedLines, newPositions) == assemble(newBlocks)
+
+def test_patch_without_replacements_keeps_scheme():
+    lines, positions = assemble({TERMS[0]: ["a\n"], TERMS[1]: [], TERMS[2]: ["d\n"]})
+    assert patchScheme(lines, positions, {}) == (lines, positions)
+
+def test_patch_of_empty_block():
+    lines, positions = assemble({TERMS[0]: ["a\n"], TERMS[1]: [], TERMS[2]: ["d\n"]})
+    patchedLines, _ = patchScheme(lines, positions, {TERMS[1]: ["new\n"]})
+    assert patchedLines == assemble({TERMS[0]: ["a\n"], TERMS[1]: ["new\n"], TERMS[2]: ["d\n"]})[0]
+
+def test_diff_terms():
+    changes = diffTerms({"X:1": "one", "X:2": "two", "X:3": "three"}, {"X:2": "two", "X:3": "drei", "X:4": "four"})
+    assert changes == {
+        "added": [{"id": "X:4", "label": "four"}],
+        "removed": [{"id": "X:1", "label": "one"}],
+        "relabelled": [{"id": "X:3", "old": "three", "new": "drei"}],
+    }
@@ -0,0 +1,84 @@
+import pytest
+
+from vocabularyIndex.vocabularyIndex import VocabularyIndex
+
+SCHEME = {
+    "enums": {
+        "BodySiteMenu": {"permissible_values": {
+            "heart [UBERON:0000948]": {"text": "heart [UBERON:0000948]", "meaning": "UBERON:0000948"},
+            "Heart valve [UBERON:0000946]": {"text": "Heart valve [UBERON:0000946]", "meaning": "UBERON:0000946"},
+            "skin of body [UBERON:0002097]": {"text": "skin of body [UBERON:0002097]", "meaning": "UBERON:0002097"},
+            "valve of the heart wall [UBERON:0000000]": {"text": "valve of the heart wall [UBERON:0000000]", "meaning": "UBERON:0000000"},
+        }},
+        "SampleSiteMenu": {"permissible_values": {
+            "heart [UBERON:0000948]": {"text": "heart [UBERON:0000948]", "meaning": "UBERON:0000948"},
+            "Not Applicable": {"text": "Not Applicable"},
+        }},
+        "OrganizationMenu": {"permissible_values": {
+            "Heart Center Leipzig, https://ror.org/03mstc592": {"text": "Heart Center Leipzig, https://ror.org/03mstc592", "meaning": "https://ror.org/03mstc592"},
+        }},
+        "EmptyMenu": None,
+    }
+}
+
+
+@pytest.fixture
+def index():
+    return VocabularyIndex.fromScheme(SCHEME)
+
+def getTexts(entries):
+    return [entry["text"] for entry in entries]
+
+def test_entries(index):
+    assert len(index.entries) == 7
+    assert {"enum": "OrganizationMenu", "text": "Heart Center Leipzig, https://ror.org/03mstc592", "id": "https://ror.org/03mstc592", "label": "Heart Center Leipzig"} in index.entries
+    assert {"enum": "SampleSiteMenu", "text": "Not Applicable", "id": None, "label": "Not Applicable"} in index.entries
+
+def test_lookup_id(index):
+    assert [entry["enum"] for entry in index.lookupId("UBERON:0000948")] == ["BodySiteMenu", "SampleSiteMenu"]
+    assert [entry["enum"] for entry in index.lookupId("UBERON:0000948", enum="SampleSiteMenu")] == ["SampleSiteMenu"]
+    assert getTexts(index.lookupId("https://ror.org/03mstc592")) == ["Heart Center Leipzig, https://ror.org/03mstc592"]
+    assert index.lookupId("UBERON:9999999") == []
+
+def test_lookup_label(index):
+    assert getTexts(index.lookupLabel("heart", enum="BodySiteMenu")) == ["heart [UBERON:0000948]"]
+    assert getTexts(index.lookupLabel("heart [UBERON:0000948]", enum="BodySiteMenu")) == ["heart [UBERON:0000948]"]
+    assert index.lookupLabel("Heart") == []
+
+def test_prefix_search(index):
+    assert getTexts(index.prefixSearch("HEART", enum="BodySiteMenu")) == ["heart [UBERON:0000948]", "Heart valve [UBERON:0000946]"]
+    assert getTexts(index.prefixSearch("heart")) == [
+        "heart [UBERON:0000948]",
+        "heart [UBERON:0000948]",
+        "Heart Center Leipzig, https://ror.org/03mstc592",
+        "Heart valve [UBERON:0000946]",
+    ]
+    assert len(index.prefixSearch("heart", limit=2)) == 2
+    assert index.prefixSearch("valves") == []
+
+def test_token_search(index):
+    assert getTexts(index.tokenSearch("valve heart")) == ["Heart valve [UBERON:0000946]", "valve of the heart wall [UBERON:0000000]"]
+    # the last word is completed
+    assert getTexts(index.tokenSearch("heart va")) == ["Heart valve [UBERON:0000946]", "valve of the heart wall [UBERON:0000000]"]
+    assert getTexts(index.tokenSearch("UBERON 0000948", enum="SampleSiteMenu")) == ["heart [UBERON:0000948]"]
+    assert getTexts(index.tokenSearch("heart", limit=1)) == ["heart [UBERON:0000948]"]
+    assert index.tokenSearch("liver") == []
+    assert index.tokenSearch("  ") == []
+
+def test_save_and_load(index, tmp_path):
+    pathToIndex = str(tmp_path / "vocabularyIndex.json")
+    index.save(pathToIndex)
+    loadedIndex = VocabularyIndex.load(pathToIndex)
+    assert loadedIndex.entries == index.entries
+    for query in ["heart", "Heart valve", "valve of the heart wall"]:
+        assert loadedIndex.lookupLabel(query) == index.lookupLabel(query)
+        assert loadedIndex.prefixSearch(query) == index.prefixSearch(query)
+        assert loadedIndex.tokenSearch(query) == index.tokenSearch(query)
+    assert loadedIndex.lookupId("UBERON:0000948") == index.lookupId("UBERON:0000948")
+
+def test_index_of_another_version(index, tmp_path):
+    pathToIndex = tmp_path / "vocabularyIndex.json"
+    index.save(str(pathToIndex))
+    pathToIndex.write_text(pathToIndex.read_text().replace('"version":1', '"version":0'))
+    with pytest.raises(ValueError):
+        VocabularyIndex.load(str(pathToIndex))